@@ -113,6 +113,7 @@ Results show:
 - 🔀 = Found by both methods (most relevant!)
 
 Match percentages indicate relevance (higher = better match).
+When more results exist, the response ends with a cursor; pass it back as `cursor` (same tool) for the next page instead of searching again.
 
 ## GUIDELINES
 1. **OPTIMIZE LATENCY**: Prefer `keyword_search` or `semantic_search` if the intent is clear.
@@ -11,7 +11,8 @@ from services.hybrid_search_service import (
     SearchMethod,
     SearchResult
 )
-from typing import Optional, List
+from services.search_metrics import stage_timer
+from typing import Any, Dict, Iterator, Optional, Sequence
 import os
 
 # Singleton service
@@ -25,88 +26,151 @@ def _get_service() -> HybridSearchService:
         _service = HybridSearchService(
             project_id=os.getenv('PROJECT_ID'),
             instance_id=os.getenv('INSTANCE_ID'),
-            database_id=os.getenv('DATABASE_ID')
+            database_id=os.getenv('DATABASE_ID'),
+            embedding_cache_path=os.getenv('EMBEDDING_CACHE_PATH'),
+            max_staleness_seconds=float(os.getenv('SEARCH_MAX_STALENESS_SECONDS', '10'))
         )
     return _service
 
 
+# Results rendered per tool response; the rest are offered via a cursor
+RESULTS_PAGE_SIZE = 10
+
+_METHOD_EMOJI = {
+    SearchMethod.KEYWORD: "🔤",
+    SearchMethod.RAG: "🧬",
+    SearchMethod.HYBRID: "🔀"
+}
+
+
 def _format_results(
-    results: List[SearchResult],
+    results: Sequence[SearchResult],
     analysis: dict,
-    show_analysis: bool = True
+    show_analysis: bool = True,
+    offset: int = 0,
+    total: Optional[int] = None,
+    next_cursor: Optional[str] = None,
+    total_complete: bool = True,
+    timings: Optional[Dict[str, Any]] = None
 ) -> str:
-    """Format search results for display."""
+    """
+    Format one page of search results for display.
     
-    lines = []
+    `offset` is the page's position in the full ranking (for numbering)
+    and `total` its size (a lower bound unless `total_complete`); lines
+    are generated lazily and joined once. The formatting time is recorded
+    as `timings["format_ms"]` when a timings dict is given.
+    """
+    with stage_timer("format", timings):
+        return "\n".join(_result_lines(
+            results, analysis, show_analysis, offset,
+            len(results) if total is None else total, next_cursor, total_complete
+        ))
+
+
+def _result_lines(
+    results: Sequence[SearchResult],
+    analysis: dict,
+    show_analysis: bool,
+    offset: int,
+    total: int,
+    next_cursor: Optional[str],
+    total_complete: bool = True
+) -> Iterator[str]:
+    """Yield the markdown lines for one page of results."""
     
     if show_analysis:
-        lines.extend([
-            "## 🧠 Search Strategy",
-            f"**Query Analysis:**",
-            f"- Recommended Method: `{analysis['recommended_method']}`",
-            f"- Actually Used: `{analysis['actual_method']}`",
-            f"- Confidence: {analysis['confidence']:.0%}",
-        ])
+        yield "## 🧠 Search Strategy"
+        yield "**Query Analysis:**"
+        yield f"- Recommended Method: `{analysis['recommended_method']}`"
+        yield f"- Actually Used: `{analysis['actual_method']}`"
+        yield f"- Confidence: {analysis['confidence']:.0%}"
         
         if analysis['keywords_extracted']:
-            lines.append(f"- Keywords: {', '.join(analysis['keywords_extracted'][:5])}")
+            yield f"- Keywords: {', '.join(analysis['keywords_extracted'][:5])}"
         
         if analysis['categories']:
-            lines.append(f"- Categories: {', '.join(analysis['categories'])}")
+            yield f"- Categories: {', '.join(analysis['categories'])}"
             
         if analysis['biome_filter']:
-            lines.append(f"- Location Filter: {analysis['biome_filter']}")
+            yield f"- Location Filter: {analysis['biome_filter']}"
         
         if analysis['reasoning']:
-            lines.append(f"- Reasoning: _{analysis['reasoning']}_")
+            yield f"- Reasoning: _{analysis['reasoning']}_"
         
-        lines.extend(["", "---", ""])
+        yield from ("", "---", "")
     
-    lines.append("## 📋 Results")
-    lines.append("")
+    yield "## 📋 Results"
+    yield ""
     
     if not results:
-        lines.append("No results found. Try rephrasing your query.")
-        return "\n".join(lines)
+        yield "No results found. Try rephrasing your query."
+        return
     
-    for i, r in enumerate(results, 1):
-        # Score as percentage
-        score_pct = r.score * 100
-        
-        # Method indicator
-        method_emoji = {
-            SearchMethod.KEYWORD: "🔤",
-            SearchMethod.RAG: "🧬",
-            SearchMethod.HYBRID: "🔀"
-        }.get(r.method, "•")
+    for i, r in enumerate(results, offset + 1):
+        # Score as percentage, method indicator
+        yield f"{i}. **{r.name}** ({r.score * 100:.0f}% match) {_METHOD_EMOJI.get(r.method, '•')}"
         
-        lines.append(f"{i}. **{r.name}** ({score_pct:.0f}% match) {method_emoji}")
+        if r.biome:
+            yield f"   📍 Location: {r.biome}"
         
-        if r.details.get("biome"):
-            lines.append(f"   📍 Location: {r.details['biome']}")
-        
-        # Show matching skills
-        skills = r.details.get("matching_skills", [])
-        if skills:
-            skill_names = [s["name"] if isinstance(s, dict) else s for s in skills[:5]]
-            lines.append(f"   🛠️ Skills: {', '.join(skill_names)}")
+        # Show matching skills (read straight from the result columns)
+        skill_names = r.skill_names(5)
+        if skill_names:
+            yield f"   🛠️ Skills: {', '.join(skill_names)}"
         
         # Show which method found this
-        if r.details.get("found_by"):
-            lines.append(f"   _Found by: {r.details['found_by']}_")
+        if r.found_by:
+            yield f"   _Found by: {r.found_by}_"
         
-        lines.append("")
+        yield ""
+    
+    if total > len(results) or next_cursor:
+        of = f"{total}" if total_complete else f"{total}+"
+        shown = f"_Showing {offset + 1}-{offset + len(results)} of {of} results"
+        yield f"{shown} - call again with cursor=\"{next_cursor}\" for more_" \
+            if next_cursor else f"{shown}_"
+        yield ""
     
     # Legend
-    lines.extend([
-        "---",
-        "_Legend: 🔤 Keyword | 🧬 Semantic (RAG) | 🔀 Hybrid (Both)_"
-    ])
+    yield "---"
+    yield "_Legend: 🔤 Keyword | 🧬 Semantic (RAG) | 🔀 Hybrid (Both)_"
+
+
+def _search_page(
+    query: str,
+    method: Optional[SearchMethod],
+    limit: int,
+    cursor: str
+) -> str:
+    """
+    Run (or continue, with a cursor) a paginated search and format it.
+    
+    Continuation pages come from the service's cached result window (grown
+    on demand when a page reaches its end) and skip the strategy block,
+    which was shown with the first page.
+    """
+    service = _get_service()
+    result = service.search_page(
+        query,
+        force_method=method,
+        page_size=max(1, limit),
+        cursor=cursor or None
+    )
     
-    return "\n".join(lines)
+    return _format_results(
+        result["results"],
+        result["analysis"],
+        show_analysis=not cursor,
+        offset=result["offset"],
+        total=result["total_results"],
+        next_cursor=result["next_cursor"],
+        total_complete=result["total_complete"],
+        timings=result["timings"]
+    )
 
 
-async def hybrid_search(query: str, limit: int = 10) -> str:
+async def hybrid_search(query: str, limit: int = RESULTS_PAGE_SIZE, cursor: str = "") -> str:
     """
     Smart search that automatically chooses the best method.
     
@@ -124,27 +188,21 @@ async def hybrid_search(query: str, limit: int = 10) -> str:
     
     Args:
         query: Your search query in natural language
-        limit: Maximum number of results (default: 10)
+        limit: Results per page (default: 10)
+        cursor: Cursor from a previous response to get its next page
         
     Returns:
         Formatted results with search strategy explanation
     """
     try:
-        service = _get_service()
-        result = service.smart_search(query, limit=limit)
-        
-        return _format_results(
-            result["results"],
-            result["analysis"],
-            show_analysis=True
-        )
+        return _search_page(query, None, limit, cursor)
         
     except Exception as e:
         return f"Error in hybrid search: {str(e)}"
 
 
 # TODO: REPLACE_SEMANTIC_SEARCH_TOOL
-async def semantic_search(query: str, limit: int = 10) -> str:
+async def semantic_search(query: str, limit: int = RESULTS_PAGE_SIZE, cursor: str = "") -> str:
     """
     Force semantic (RAG) search using embeddings.
     
@@ -159,30 +217,20 @@ async def semantic_search(query: str, limit: int = 10) -> str:
     
     Args:
         query: What you're looking for (describe the concept)
-        limit: Maximum results
+        limit: Results per page
+        cursor: Cursor from a previous response to get its next page
         
     Returns:
         Semantically similar results ranked by relevance
     """
     try:
-        service = _get_service()
-        result = service.smart_search(
-            query, 
-            force_method=SearchMethod.RAG,
-            limit=limit
-        )
-        
-        return _format_results(
-            result["results"],
-            result["analysis"],
-            show_analysis=True
-        )
+        return _search_page(query, SearchMethod.RAG, limit, cursor)
         
     except Exception as e:
         return f"Error in semantic search: {str(e)}"
 
 
-async def keyword_search(query: str, limit: int = 10) -> str:
+async def keyword_search(query: str, limit: int = RESULTS_PAGE_SIZE, cursor: str = "") -> str:
     """
     Force keyword-based search using AI interpretation.
     
@@ -197,24 +245,14 @@ async def keyword_search(query: str, limit: int = 10) -> str:
     
     Args:
         query: Your search query
-        limit: Maximum results
+        limit: Results per page
+        cursor: Cursor from a previous response to get its next page
         
     Returns:
         Results matching extracted keywords
     """
     try:
-        service = _get_service()
-        result = service.smart_search(
-            query,
-            force_method=SearchMethod.KEYWORD,
-            limit=limit
-        )
-        
-        return _format_results(
-            result["results"],
-            result["analysis"],
-            show_analysis=True
-        )
+        return _search_page(query, SearchMethod.KEYWORD, limit, cursor)
         
     except Exception as e:
         return f"Error in keyword search: {str(e)}"
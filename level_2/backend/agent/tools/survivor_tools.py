@@ -1,7 +1,87 @@
-from services.graph_service import GraphService
-from services.spanner_service import SpannerService
+from google.cloud.spanner_v1 import param_types
 from models.graph import EdgeType, NodeType
-import asyncio
+from services.graph_service import GraphService
+from services.spanner_service import get_spanner_service
+
+# HAS_NEED edge statuses / need urgencies that count as urgent
+URGENT_STATUSES = ("critical", "high", "urgent", "active")
+URGENT_LEVELS = ("high", "critical", "extreme")
+
+# Each tool answers from the GraphIndex over the cached full graph when
+# that graph holds the whole network (no round-trip, cost linear in the
+# answer). Once any table outgrows the overview's LIMIT, the index would
+# be truncated, so the tool runs one narrow query instead (join + filter
+# pushed down to Spanner) and stays exact however large the network is.
+# Both paths return the same rows in the same order.
+SURVIVORS_WITH_SKILL_SQL = """
+    SELECT sk.name AS skill_name, s.survivor_id, s.name AS survivor_name
+    FROM Skills sk
+    LEFT JOIN SurvivorHasSkill shs ON shs.skill_id = sk.skill_id
+    LEFT JOIN Survivors s ON s.survivor_id = shs.survivor_id
+    WHERE STRPOS(LOWER(sk.name), @needle) > 0
+    ORDER BY sk.name, s.name
+"""
+
+ALL_SURVIVORS_SQL = """
+    SELECT name, biome
+    FROM Survivors
+    ORDER BY name
+"""
+
+URGENT_NEEDS_SQL = """
+    SELECT n.description, s.name AS survivor_name
+    FROM SurvivorHasNeed shn
+    JOIN Needs n ON n.need_id = shn.need_id
+    JOIN Survivors s ON s.survivor_id = shn.survivor_id
+    WHERE LOWER(shn.status) IN UNNEST(@statuses)
+       OR LOWER(n.urgency) IN UNNEST(@urgencies)
+    ORDER BY s.name, n.description
+"""
+
+# Process-wide service (same client and session pool as the API routes)
+_get_spanner = get_spanner_service
+
+
+async def _graph_index():
+    """Index over the cached full graph, or None if it's truncated/unavailable."""
+    return await GraphService(_get_spanner()).get_complete_graph_index()
+
+
+def _skill_rows_from_index(index, skill_name: str) -> list:
+    """SURVIVORS_WITH_SKILL_SQL rows, answered from the graph index."""
+    rows = []
+    for skill in sorted(index.skills_matching(skill_name), key=lambda node: node.label):
+        holders = [
+            index.node(edge.source)
+            for edge in index.edges_to(skill.id, EdgeType.HAS_SKILL)
+        ]
+        holders = sorted(
+            (node for node in holders if node and node.type == NodeType.SURVIVOR),
+            key=lambda node: node.label
+        )
+        if not holders:
+            rows.append({"skill_name": skill.label, "survivor_id": None, "survivor_name": None})
+        for survivor in holders:
+            rows.append({"skill_name": skill.label, "survivor_id": survivor.id, "survivor_name": survivor.label})
+    return rows
+
+
+def _survivor_rows_from_index(index) -> list:
+    """ALL_SURVIVORS_SQL rows, answered from the graph index."""
+    survivors = sorted(index.nodes_of_type(NodeType.SURVIVOR), key=lambda node: node.label)
+    return [{"name": node.label, "biome": node.biome} for node in survivors]
+
+
+def _urgent_rows_from_index(index) -> list:
+    """URGENT_NEEDS_SQL rows, answered from the graph index."""
+    rows = []
+    for edge in index.urgent_need_edges(URGENT_STATUSES, URGENT_LEVELS):
+        survivor_node = index.node(edge.source)
+        need_node = index.node(edge.target)
+        if survivor_node and need_node:
+            rows.append({"description": need_node.label, "survivor_name": survivor_node.label})
+    return sorted(rows, key=lambda row: (row["survivor_name"], row["description"]))
+
 
 async def get_survivors_with_skill(skill_name: str) -> str:
     """
@@ -9,48 +89,41 @@ async def get_survivors_with_skill(skill_name: str) -> str:
     
     Args:
         skill_name: The name of the skill to search for (e.g., "Medical", "Engineering").
-        
+    
     Returns:
         A formatted string listing the survivors with that skill.
     """
     try:
-        # Initialize services
-        # Note: In a real app with dependency injection, we might want to get these differently,
-        # but for a simple tool, instantiating them here (or using a singleton pattern) is acceptable.
-        spanner = SpannerService()
-        graph_service = GraphService(spanner)
+        index = await _graph_index()
+        if index is not None:
+            rows = _skill_rows_from_index(index, skill_name)
+        else:
+            rows = _get_spanner().execute_sql(
+                SURVIVORS_WITH_SKILL_SQL,
+                params={"needle": skill_name.lower()},
+                param_types={"needle": param_types.STRING}
+            )
         
-        graph_data = await graph_service.get_full_graph()
+        # 1. Skills whose name contains the query (kept even without survivors)
+        skill_names_found = list(dict.fromkeys(row["skill_name"] for row in rows))
         
-        # 1. Find the skill node ID(s) matching the name
-        target_skill_ids = []
-        skill_names_found = []
-        for node in graph_data.nodes:
-            if node.type == NodeType.SKILL and skill_name.lower() in node.label.lower():
-                target_skill_ids.append(node.id)
-                skill_names_found.append(node.label)
-        
-        if not target_skill_ids:
+        if not skill_names_found:
             return f"No skill found matching '{skill_name}'. Available skills might be named differently."
-            
-        # 2. Find survivors connected to these skills
+        
+        # 2. Survivors connected to these skills
         survivors = []
         seen_survivors = set()
         
-        for edge in graph_data.edges:
-            if edge.type == EdgeType.HAS_SKILL and edge.target in target_skill_ids:
-                # Find the source survivor node
-                survivor_node = next((n for n in graph_data.nodes if n.id == edge.source), None)
-                if survivor_node and survivor_node.type == NodeType.SURVIVOR:
-                    if survivor_node.id not in seen_survivors:
-                        survivors.append(survivor_node.label)
-                        seen_survivors.add(survivor_node.id)
+        for row in rows:
+            if row["survivor_id"] and row["survivor_id"] not in seen_survivors:
+                survivors.append(row["survivor_name"] or "")
+                seen_survivors.add(row["survivor_id"])
         
         if not survivors:
              return f"No survivors found with the skill '{skill_name}' (matched skills: {', '.join(skill_names_found)})."
-             
+        
         return f"Survivors with skill matching '{skill_name}' ({', '.join(skill_names_found)}): {', '.join(survivors)}"
-
+    
     except Exception as e:
         print(f"Error in get_survivors_with_skill: {e}")
         import traceback
@@ -65,22 +138,22 @@ async def get_all_survivors() -> str:
         A formatted string listing all survivors and their locations.
     """
     try:
-        spanner = SpannerService()
-        graph_service = GraphService(spanner)
-        
-        graph_data = await graph_service.get_full_graph()
+        index = await _graph_index()
+        if index is not None:
+            rows = _survivor_rows_from_index(index)
+        else:
+            rows = _get_spanner().execute_sql(ALL_SURVIVORS_SQL)
         
         survivors_info = []
-        for node in graph_data.nodes:
-            if node.type == NodeType.SURVIVOR:
-                location = node.biome or "Unknown Location"
-                survivors_info.append(f"{node.label} (Location: {location})")
+        for row in rows:
+            location = row["biome"] or "Unknown Location"
+            survivors_info.append(f"{row['name'] or ''} (Location: {location})")
         
         if not survivors_info:
             return "No survivors found in the network."
-            
+        
         return "All Survivors:\n- " + "\n- ".join(survivors_info)
-
+    
     except Exception as e:
         print(f"Error in get_all_survivors: {e}")
         import traceback
@@ -95,45 +168,33 @@ async def get_urgent_needs() -> str:
         A formatted string listing urgent needs and the affected survivors.
     """
     try:
-        spanner = SpannerService()
-        graph_service = GraphService(spanner)
-        
-        graph_data = await graph_service.get_full_graph()
+        # Urgent by edge status or by the need's own urgency
+        index = await _graph_index()
+        if index is not None:
+            rows = _urgent_rows_from_index(index)
+        else:
+            rows = _get_spanner().execute_sql(
+                URGENT_NEEDS_SQL,
+                params={
+                    "statuses": list(URGENT_STATUSES),
+                    "urgencies": list(URGENT_LEVELS)
+                },
+                param_types={
+                    "statuses": param_types.Array(param_types.STRING),
+                    "urgencies": param_types.Array(param_types.STRING)
+                }
+            )
         
-        urgent_needs = []
-        
-        for edge in graph_data.edges:
-            # Check for HAS_NEED edges that might indicate urgency via status
-            if edge.type == EdgeType.HAS_NEED:
-                is_urgent = False
-                status = edge.properties.get("status", "").lower()
-                
-                # Check edge status
-                if status in ["critical", "high", "urgent", "active"]:
-                    is_urgent = True
-                
-                # Also check target node properties for urgency
-                if not is_urgent:
-                    target_node = next((n for n in graph_data.nodes if n.id == edge.target), None)
-                    if target_node and target_node.type == NodeType.NEED:
-                        urgency = str(target_node.properties.get("urgency", "")).lower()
-                        if urgency in ["high", "critical", "extreme"]:
-                            is_urgent = True
-                
-                if is_urgent:
-                    survivor_node = next((n for n in graph_data.nodes if n.id == edge.source), None)
-                    need_node = next((n for n in graph_data.nodes if n.id == edge.target), None)
-                    
-                    if survivor_node and need_node:
-                        survivor_name = survivor_node.label
-                        need_desc = need_node.label
-                        urgent_needs.append(f"{need_desc} (Affecting: {survivor_name})")
+        urgent_needs = [
+            f"{row['description']} (Affecting: {row['survivor_name']})"
+            for row in rows
+        ]
         
         if not urgent_needs:
             return "No urgent needs detected at this time."
-            
+        
         return "Urgent Needs:\n- " + "\n- ".join(urgent_needs)
-
+    
     except Exception as e:
         print(f"Error in get_urgent_needs: {e}")
         import traceback
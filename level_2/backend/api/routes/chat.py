@@ -1,11 +1,16 @@
-from fastapi import APIRouter
-from models.chat import ChatRequest, ChatResponse
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from models.chat import ChatRequest, ChatResponse, SearchStreamRequest
 from agent.agent import root_agent
+from agent.tools.hybrid_search_tools import _get_service as get_search_service
+from services.hybrid_search_service import SearchMethod
+from services.search_metrics import stage_timer
 
 from google.adk import Runner
 from google.adk.sessions import InMemorySessionService, VertexAiSessionService
 from google.adk.memory import InMemoryMemoryService, VertexAiMemoryBankService
 from google.genai.types import Content, Part
+import json
 import os
 import time
 
@@ -171,3 +176,60 @@ async def chat(request: ChatRequest):
             edges_to_highlight=[],
             suggested_followups=[]
         )
+
+
+def _stage_to_json(stage: dict) -> str:
+    """Serialize a smart_search_stream stage as one NDJSON line."""
+    payload = dict(stage)
+    if "results" in payload:
+        payload["results"] = [
+            {
+                "id": r.id,
+                "name": r.name,
+                "type": r.type,
+                "score": r.score,
+                "method": r.method.value,
+                "details": r.details,
+                "found_by": r.found_by
+            }
+            for r in payload["results"]
+        ]
+    return json.dumps(payload, default=str) + "\n"
+
+
+@router.post("/search/stream")
+async def search_stream(request: SearchStreamRequest):
+    """
+    Stream hybrid search stages as NDJSON.
+
+    One JSON object per line: analysis, keyword / rag results as each leg
+    finishes, fused results for hybrid queries, then done with timings
+    (including `format_ms`, the time spent serializing the stages).
+    """
+    force_method = None
+    if request.method:
+        try:
+            force_method = SearchMethod(request.method.lower())
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Unknown search method: {request.method}")
+
+    service = get_search_service()
+
+    async def stream():
+        format_timings = {}
+        format_ms = 0.0
+        try:
+            async for stage in service.smart_search_stream(
+                request.query, force_method=force_method, limit=request.limit
+            ):
+                if stage["stage"] == "done":
+                    stage["timings"]["format_ms"] = format_ms
+                with stage_timer("format", format_timings):
+                    line = _stage_to_json(stage)
+                format_ms += format_timings["format_ms"]
+                yield line
+        except Exception as e:
+            print(f"Error streaming search: {e}")
+            yield json.dumps({"stage": "error", "error": str(e)}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
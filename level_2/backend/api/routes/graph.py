@@ -1,15 +1,124 @@
-from fastapi import APIRouter, Depends
-from models.graph import GraphData
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from google.api_core.exceptions import InvalidArgument
+from models.graph import (
+    EdgePage, EdgeType, GraphData, GraphQueryRequest, GraphQueryResponse, Node, NodePage, NodeType
+)
 from services.graph_service import GraphService
-from services.spanner_service import SpannerService
+from services.spanner_service import SpannerService, get_spanner_service
 
 router = APIRouter(prefix="/api/graph", tags=["graph"])
 
-# Dependency Injection (Simple Manual for now)
-def get_graph_service():
-    spanner = SpannerService()
+# Dependency Injection: one process-wide SpannerService (shared client + session pool)
+def get_graph_service(spanner: SpannerService = Depends(get_spanner_service)):
     return GraphService(spanner)
 
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check (weak comparison, lists and '*' allowed)."""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
 @router.get("", response_model=GraphData)
-async def get_graph(service: GraphService = Depends(get_graph_service)):
-    return await service.get_full_graph()
+async def get_graph(request: Request, service: GraphService = Depends(get_graph_service)):
+    # Cached snapshot: pre-serialized body + ETag, so unchanged graphs
+    # cost the browser a 304 and the server no JSON encoding
+    snapshot = await service.get_graph_snapshot()
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+# Keyset-paginated and streamed views: the whole network (not the capped
+# /api/graph overview), optionally one biome's survivors and what they link to
+
+def _normalize_biome(biome: Optional[str]) -> Optional[str]:
+    return biome.strip().upper() if biome and biome.strip() else None
+
+
+@router.get("/nodes", response_model=NodePage)
+def get_nodes(
+    type: Optional[List[NodeType]] = Query(None),
+    biome: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    service: GraphService = Depends(get_graph_service)
+):
+    try:
+        return service.get_nodes_page(limit, cursor, type, _normalize_biome(biome))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Lookups the graph view makes on a selected node, answered from the
+# GraphIndex over the cached /api/graph overview (the graph it renders)
+
+@router.get("/nodes/{node_id}", response_model=Node)
+async def get_node(node_id: str, service: GraphService = Depends(get_graph_service)):
+    node = (await service.get_graph_index()).node(node_id)
+    if node is None:
+        raise HTTPException(status_code=404, detail=f"Node '{node_id}' not found")
+    return node
+
+
+@router.get("/neighbors/{node_id}", response_model=GraphData)
+async def get_neighbors(node_id: str, service: GraphService = Depends(get_graph_service)):
+    neighborhood = (await service.get_graph_index()).neighbors(node_id)
+    if neighborhood is None:
+        raise HTTPException(status_code=404, detail=f"Node '{node_id}' not found")
+    return neighborhood
+
+
+@router.get("/path/{from_id}/{to_id}", response_model=GraphData)
+async def find_path(from_id: str, to_id: str, service: GraphService = Depends(get_graph_service)):
+    path = (await service.get_graph_index()).shortest_path(from_id, to_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No path from '{from_id}' to '{to_id}'")
+    return path
+
+
+@router.get("/edges", response_model=EdgePage)
+def get_edges(
+    type: Optional[List[EdgeType]] = Query(None),
+    biome: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    service: GraphService = Depends(get_graph_service)
+):
+    try:
+        return service.get_edges_page(limit, cursor, type, _normalize_biome(biome))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/stream")
+def stream_graph(
+    type: Optional[List[NodeType]] = Query(None),
+    biome: Optional[str] = None,
+    service: GraphService = Depends(get_graph_service)
+):
+    # NDJSON: nodes, then edges between them, then a {"done": true} line
+    return StreamingResponse(
+        service.stream_graph(type, _normalize_biome(biome)),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.post("/query", response_model=GraphQueryResponse)
+async def query_graph(request: GraphQueryRequest, service: GraphService = Depends(get_graph_service)):
+    # Read-only GQL, e.g. MATCH p = (s:Survivor)-[:HAS_SKILL]->(k) RETURN SAFE_TO_JSON(p) AS p
+    if not request.query.strip():
+        raise HTTPException(status_code=400, detail="Query is empty")
+    try:
+        return await service.query_graph(request.query)
+    except InvalidArgument as e:
+        raise HTTPException(status_code=400, detail=e.message)
@@ -0,0 +1,268 @@
+# benchmarks/search_bench.py
+"""
+Offline search benchmark against the SQLite Spanner stand-in.
+
+Runs keyword_search, rag_search (SQL scan and in-process vector index),
+hybrid_search and find_similar_skills over synthetic networks of several
+sizes and reports latency percentiles and throughput per method.
+
+Each tier also compares exact and approximate (vector index) RAG and
+skill similarity on the same queries: recall@limit against the exact
+results and latency, per num_leaves_to_search setting.
+
+Usage (from level_2/backend):
+    python -m benchmarks.search_bench                       # 1k, 100k
+    python -m benchmarks.search_bench --tiers 1000 1000000
+    python -m benchmarks.search_bench --skills 5000 --ann-leaves 1 5 20
+    python -m benchmarks.search_bench --json out.json
+    python -m benchmarks.search_bench --baseline out.json   # exit 1 on regression
+
+Query embeddings are warmed before timing, so RAG numbers measure
+ranking and survivor lookup, not the embedding model.
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from benchmarks.spanner_standin import BIOMES, CATEGORIES, build_database, sample_queries
+from services.hybrid_search_service import (
+    HybridSearchService,
+    KeywordEngine,
+    QueryAnalysis,
+    SearchMethod,
+    VectorSearchMode
+)
+
+
+DEFAULT_TIERS = (1_000, 100_000)
+DEFAULT_ANN_LEAVES = (1, 2, 5, 10)
+
+
+def make_service(
+    database,
+    vector_index: bool,
+    vector_search: VectorSearchMode = VectorSearchMode.EXACT
+) -> HybridSearchService:
+    service = HybridSearchService(
+        database=database,
+        keyword_engine=KeywordEngine.LIKE,
+        vector_index=vector_index,
+        vector_search=vector_search,
+        speculative_rag=False
+    )
+    if service._vector_index is not None:
+        service._vector_index.load()
+    return service
+
+
+def make_analysis(query: str, i: int) -> QueryAnalysis:
+    """Keyword analysis like the analyzer would produce, every other one filtered."""
+    words = query.split()[2:]
+    return QueryAnalysis(
+        original_query=query,
+        recommended_method=SearchMethod.HYBRID,
+        keywords=words,
+        categories=[CATEGORIES[i % len(CATEGORIES)]] if i % 4 == 0 else [],
+        biome_filter=BIOMES[i % len(BIOMES)] if i % 2 == 0 else None,
+        needs_similarity_ranking=True,
+        has_specific_filters=i % 2 == 0,
+        confidence=1.0,
+        reasoning="benchmark"
+    )
+
+
+def run_method(
+    calls: Sequence[Callable[[], Any]],
+    iterations: int,
+    budget_s: float,
+    min_iterations: int = 5
+) -> Dict[str, float]:
+    """
+    Time up to `iterations` calls (cycling through `calls`), stopping
+    early once `budget_s` is spent (after at least `min_iterations`).
+    """
+    for call in calls[:3]:
+        call()  # warm-up
+
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        start = time.perf_counter()
+        calls[i % len(calls)]()
+        latencies.append((time.perf_counter() - start) * 1000)
+        if i + 1 >= min_iterations and start - started > budget_s:
+            break
+    wall = time.perf_counter() - started
+    latencies = np.asarray(latencies)
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "mean_ms": float(latencies.mean()),
+        "qps": len(latencies) / wall if wall else 0.0,
+        "iterations": len(latencies)
+    }
+
+
+def recall(exact: Sequence[Sequence[str]], approx: Sequence[Sequence[str]]) -> float:
+    """Mean fraction of each exact result list found by the approximate one."""
+    fractions = [
+        len(set(e) & set(a)) / len(e)
+        for e, a in zip(exact, approx) if e
+    ]
+    return float(np.mean(fractions)) if fractions else 1.0
+
+
+def bench_ann(
+    database,
+    queries: List[str],
+    skills: List[str],
+    iterations: int,
+    limit: int,
+    budget_s: float,
+    leaves_options: Sequence[int]
+) -> Dict[str, Dict[str, float]]:
+    """Exact vs ANN recall and latency for rag_search and find_similar_skills."""
+    exact = make_service(database, vector_index=False)
+    ann = make_service(database, vector_index=False, vector_search=VectorSearchMode.ANN)
+    for service in (exact, ann):
+        service._embeddings.get_many(queries + skills)
+
+    exact_rag = [[r.id for r in exact.rag_search(q, limit)] for q in queries]
+    exact_similar = [[r["skill_id"] for r in exact.find_similar_skills(s, limit)] for s in skills]
+
+    report = {}
+    print(f"   {'ANN leaves':<14} {'rag recall':>10} {'rag p50':>9} {'similar recall':>15} {'similar p50':>12}")
+    for leaves in leaves_options:
+        ann.ann_leaves_to_search = leaves
+        rag = run_method([lambda q=q: ann.rag_search(q, limit) for q in queries], iterations, budget_s)
+        similar = run_method(
+            [lambda s=s: ann.find_similar_skills(s, limit) for s in skills], iterations, budget_s
+        )
+        rag["recall"] = recall(exact_rag, [[r.id for r in ann.rag_search(q, limit)] for q in queries])
+        similar["recall"] = recall(
+            exact_similar,
+            [[r["skill_id"] for r in ann.find_similar_skills(s, limit)] for s in skills]
+        )
+        report[f"rag_ann_l{leaves}"] = rag
+        report[f"similar_ann_l{leaves}"] = similar
+        print(f"   {leaves:<14} {rag['recall']:>10.3f} {rag['p50_ms']:>7.2f}ms "
+              f"{similar['recall']:>15.3f} {similar['p50_ms']:>10.2f}ms")
+
+    for service in (exact, ann):
+        service._executor.shutdown(wait=False)
+    return report
+
+
+def bench_tier(
+    n_survivors: int,
+    iterations: int,
+    limit: int,
+    budget_s: float,
+    n_skills: int = 500,
+    ann_leaves: Sequence[int] = DEFAULT_ANN_LEAVES
+) -> Dict[str, Dict[str, float]]:
+    print(f"\n== {n_survivors:,} survivors, {n_skills:,} skills ==")
+    start = time.perf_counter()
+    database = build_database(n_survivors, n_skills=n_skills)
+    print(f"   built stand-in in {time.perf_counter() - start:.1f}s")
+
+    queries = sample_queries(database.skill_names())
+    analyses = [make_analysis(q, i) for i, q in enumerate(queries)]
+    skills = database.skill_names()[:len(queries)]
+
+    scan = make_service(database, vector_index=False)
+    indexed = make_service(database, vector_index=True)
+    for service in (scan, indexed):
+        service._embeddings.get_many(queries + skills)
+
+    methods: Dict[str, List[Callable[[], Any]]] = {
+        "keyword": [lambda a=a: scan.keyword_search(a, limit) for a in analyses],
+        "rag_scan": [lambda q=q: scan.rag_search(q, limit) for q in queries],
+        "rag_index": [lambda q=q: indexed.rag_search(q, limit) for q in queries],
+        "hybrid": [
+            lambda q=q, a=a: indexed.hybrid_search(q, a, limit)
+            for q, a in zip(queries, analyses)
+        ],
+        "similar_scan": [lambda s=s: scan.find_similar_skills(s, limit) for s in skills],
+        "similar_index": [lambda s=s: indexed.find_similar_skills(s, limit) for s in skills],
+    }
+
+    report = {}
+    for name, calls in methods.items():
+        report[name] = run_method(calls, iterations, budget_s)
+        r = report[name]
+        print(f"   {name:<14} p50 {r['p50_ms']:>9.2f}  p95 {r['p95_ms']:>9.2f}  "
+              f"p99 {r['p99_ms']:>9.2f} ms   {r['qps']:>9.1f} q/s   (n={r['iterations']})")
+
+    for service in (scan, indexed):
+        service._executor.shutdown(wait=False)
+
+    if ann_leaves:
+        report.update(bench_ann(database, queries, skills, iterations, limit,
+                                budget_s, ann_leaves))
+    return report
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """p95 regressions beyond `tolerance` (fraction) vs a saved run."""
+    regressions = []
+    for tier, methods in results.items():
+        for name, stats in methods.items():
+            old = baseline.get(tier, {}).get(name)
+            if old and stats["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{tier} {name}: p95 {old['p95_ms']:.2f} → {stats['p95_ms']:.2f} ms"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline hybrid search benchmark")
+    parser.add_argument("--tiers", type=int, nargs="+", default=list(DEFAULT_TIERS),
+                        help="Survivor counts to benchmark (e.g. 1000 100000 1000000)")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--skills", type=int, default=500, help="Skills in the synthetic catalog")
+    parser.add_argument("--ann-leaves", type=int, nargs="*", default=list(DEFAULT_ANN_LEAVES),
+                        help="num_leaves_to_search values for the exact-vs-ANN report (none to skip)")
+    parser.add_argument("--budget", type=float, default=15.0,
+                        help="Max seconds per method per tier (slow full scans stop early)")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    parser.add_argument("--baseline", help="Compare p95 against a previous --json file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed p95 slowdown vs baseline (fraction)")
+    args = parser.parse_args(argv)
+
+    results = {
+        str(tier): bench_tier(tier, args.iterations, args.limit, args.budget,
+                              args.skills, args.ann_leaves)
+        for tier in args.tiers
+    }
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print("\nNo regressions against baseline.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+# benchmarks/search_results_alloc.py
+"""
+Allocation micro-benchmark for search results.
+
+Compares the previous result path (one dataclass + details dict + one
+dict per matching skill, per-row details copy on fusion, list-built
+markdown) with the current one (column-wise SearchResults: parallel
+NumPy / list columns, a shared skill table, row views handed out
+lazily). Both sides format the same number of results (--formatted,
+default one page), so the numbers compare representations, not page
+sizes.
+
+Memory is measured under tracemalloc; time is the best of --repeat
+untraced runs, since tracing slows both sides unevenly.
+
+Usage (from level_2/backend):
+    python -m benchmarks.search_results_alloc --survivors 5000
+    python -m benchmarks.search_results_alloc --formatted 0    # format every result
+"""
+
+import argparse
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from agent.tools.hybrid_search_tools import RESULTS_PAGE_SIZE, _format_results
+from services.hybrid_search_service import HybridSearchService, SearchMethod
+from services.fusion import FusionStrategy
+from services.search_results import SearchResultsBuilder
+
+
+# =============================================================================
+# PREVIOUS REPRESENTATION
+# =============================================================================
+
+@dataclass
+class LegacySearchResult:
+    id: str
+    name: str
+    type: str
+    score: float
+    method: SearchMethod
+    details: Dict[str, Any] = field(default_factory=dict)
+
+
+def legacy_merge(keyword_results, rag_results, limit):
+    """The per-id dict-lookup RRF merge that _fuse_legs replaced."""
+    keyword_map = {r.id: r for r in keyword_results}
+    rag_map = {r.id: r for r in rag_results}
+    keyword_ranks = {r.id: i + 1 for i, r in enumerate(keyword_results)}
+    rag_ranks = {r.id: i + 1 for i, r in enumerate(rag_results)}
+    merged = []
+    for surv_id in set(keyword_map) | set(rag_map):
+        kw, rag = keyword_map.get(surv_id), rag_map.get(surv_id)
+        score = 0.0
+        if kw:
+            score += 1.0 / (60 + keyword_ranks[surv_id])
+        if rag:
+            score += 1.0 / (60 + rag_ranks[surv_id])
+        base = rag or kw
+        details = dict(base.details)
+        if kw and rag:
+            skills = {s["id"]: s for s in kw.details.get("matching_skills", [])}
+            skills.update({s["id"]: s for s in rag.details.get("matching_skills", [])})
+            details["matching_skills"] = list(skills.values())
+            details["found_by"] = "both"
+        else:
+            details["found_by"] = base.method.value
+        merged.append(LegacySearchResult(surv_id, base.name, base.type, score,
+                                         SearchMethod.HYBRID if kw and rag else base.method,
+                                         details))
+    merged.sort(key=lambda r: r.score, reverse=True)
+    return merged[:limit]
+
+
+def legacy_format(results) -> str:
+    lines = ["## 📋 Results", ""]
+    for i, r in enumerate(results, 1):
+        lines.append(f"{i}. **{r.name}** ({r.score * 100:.0f}% match)")
+        if r.details.get("biome"):
+            lines.append(f"   📍 Location: {r.details['biome']}")
+        skills = r.details.get("matching_skills", [])
+        if skills:
+            lines.append(f"   🛠️ Skills: {', '.join(s['name'] for s in skills[:5])}")
+        if r.details.get("found_by"):
+            lines.append(f"   _Found by: {r.details['found_by']}_")
+        lines.append("")
+    return "\n".join(lines)
+
+
+# =============================================================================
+# WORKLOAD
+# =============================================================================
+
+def make_rows(n_survivors: int, skills_per_survivor: int = 4) -> List[tuple]:
+    """Rows as they come back from Spanner (fresh, non-interned strings)."""
+    rows = []
+    for i in range(n_survivors):
+        for j in range(skills_per_survivor):
+            rows.append((
+                "".join(["survivor_", str(i)]),
+                f"Survivor {i}",
+                "CRYO" if i % 2 else "VOLCANIC",
+                "".join(["skill_", str((i + j) % 200)]),
+                f"Skill {(i + j) % 200}",
+                "Medical"
+            ))
+    return rows
+
+
+def legacy_results(rows, method):
+    by_survivor: Dict[str, Dict[str, Any]] = {}
+    for surv_id, name, biome, skill_id, skill_name, category in rows:
+        entry = by_survivor.setdefault(surv_id, {"name": name, "biome": biome, "skills": []})
+        entry["skills"].append({"id": skill_id, "name": skill_name, "category": category})
+    return [
+        LegacySearchResult(id=surv_id, name=d["name"], type="survivor",
+                           score=1.0 / (rank + 1), method=method,
+                           details={"biome": d["biome"], "matching_skills": d["skills"]})
+        for rank, (surv_id, d) in enumerate(by_survivor.items())
+    ]
+
+
+def columnar_results(rows, method):
+    """Same grouping as the service's LIKE leg, into a SearchResultsBuilder."""
+    by_survivor: Dict[str, Dict[str, Any]] = {}
+    for surv_id, name, biome, skill_id, skill_name, category in rows:
+        entry = by_survivor.setdefault(surv_id, {"name": name, "biome": biome, "skills": []})
+        entry["skills"].append((skill_id, skill_name, category, None, None))
+    builder = SearchResultsBuilder()
+    for rank, (surv_id, d) in enumerate(by_survivor.items()):
+        builder.add(surv_id, d["name"], 1.0 / (rank + 1), method,
+                    biome=d["biome"], skills=d["skills"])
+    return builder.build()
+
+
+def measure(label: str, fn: Callable[[], Any], repeat: int) -> None:
+    tracemalloc.start()
+    keep = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        keep = fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+        del keep
+    print(f"  {label:<10} retained {current / 1024:>9.1f} KiB   "
+          f"peak {peak / 1024:>9.1f} KiB   {best:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--survivors", type=int, default=5000)
+    parser.add_argument("--formatted", type=int, default=RESULTS_PAGE_SIZE,
+                        help="results rendered on both sides (0 = all)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="untraced runs per side; the best is reported")
+    args = parser.parse_args()
+
+    kw_rows = make_rows(args.survivors)
+    rag_rows = make_rows(args.survivors)[len(kw_rows) // 2:]
+    limit = args.survivors
+    formatted = max(0, args.formatted)
+
+    service = HybridSearchService.__new__(HybridSearchService)
+    service.fusion, service.fusion_weights, service.rrf_k = FusionStrategy.RRF, None, 60
+    analysis = {
+        "recommended_method": "hybrid", "actual_method": "hybrid",
+        "keywords_extracted": [], "categories": [], "biome_filter": None,
+        "confidence": 1.0, "reasoning": ""
+    }
+
+    def legacy():
+        kw = legacy_results(kw_rows, SearchMethod.KEYWORD)
+        rag = legacy_results(rag_rows, SearchMethod.RAG)
+        merged = legacy_merge(kw, rag, limit)
+        return merged, legacy_format(merged[:formatted or None])
+
+    def current():
+        kw = columnar_results(kw_rows, SearchMethod.KEYWORD)
+        rag = columnar_results(rag_rows, SearchMethod.RAG)
+        merged = service._merge_results(kw, rag, limit)
+        page = _format_results(merged[:formatted or None], analysis,
+                               show_analysis=False, total=len(merged))
+        return merged, page
+
+    print(f"{args.survivors} survivors, {len(kw_rows) + len(rag_rows)} rows, "
+          f"{formatted or 'all'} results formatted")
+    measure("legacy", legacy, max(1, args.repeat))
+    measure("current", current, max(1, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
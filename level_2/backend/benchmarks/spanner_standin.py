@@ -0,0 +1,332 @@
+# benchmarks/spanner_standin.py
+"""
+SQLite stand-in for the Spanner database used by HybridSearchService.
+
+Mirrors the setup_data.py tables that search touches (Survivors, Skills
+with skill_embedding, SurvivorHasSkill) in an in-memory SQLite database
+and exposes the small slice of the Spanner client API the service uses:
+
+    database.snapshot(**staleness) → context manager
+        .execute_sql(sql, params=None, param_types=None) → rows
+        .begin()
+
+Spanner SQL is translated on the way in:
+
+    ┌────────────────────────────────────────────────────────────────────┐
+    │  @name                     → :name                                 │
+    │  x IN UNNEST(@list)        → x IN (SELECT value FROM json_each)    │
+    │  COSINE_DISTANCE(a, b)     → NumPy UDF over float32 BLOBs          │
+    │  ML.PREDICT(MODEL          → synthetic embeddings (no SQL)         │
+    │    TextEmbeddings, ...)                                            │
+    │  APPROX_COSINE_DISTANCE    → k-means vector index searching        │
+    │    top-k over Skills         num_leaves_to_search leaves           │
+    └────────────────────────────────────────────────────────────────────┘
+
+The vector index emulation is approximate in the same way Spanner's is
+(only the nearest leaves are searched), so exact-vs-ANN recall measured
+here is meaningful; its latency is an in-process stand-in, not Spanner's.
+
+Anything else Spanner-only (SEARCH(), ARRAY subqueries, ...) raises
+NotImplementedError, so the service falls back exactly as it does when a
+feature is missing in a real database.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+EMBEDDING_DIM = 256
+
+BIOMES = ("BIOLUMINESCENT", "CRYO", "FOSSILIZED", "VOLCANIC")
+CATEGORIES = ("Medical", "Combat", "Engineering", "Survival",
+              "Leadership", "Science", "Agriculture", "Communication")
+SKILL_WORDS = (
+    "first", "aid", "surgery", "triage", "herbal", "medicine", "archery",
+    "tracking", "trapping", "hunting", "welding", "carpentry", "wiring",
+    "solar", "repair", "navigation", "foraging", "water", "purification",
+    "radio", "signals", "farming", "irrigation", "botany", "chemistry",
+    "cooking", "shelter", "building", "scouting", "negotiation", "teaching",
+    "diplomacy", "climbing", "diving", "fishing", "mapping", "mechanics",
+    "engines", "batteries", "smithing", "sewing", "tanning", "pottery",
+)
+
+_UNSUPPORTED = ("SEARCH(", "SCORE(", "ARRAY(", "SELECT AS STRUCT")
+
+_LEAVES_TO_SEARCH_RE = re.compile(r'"num_leaves_to_search"\s*:\s*(\d+)')
+
+
+# =============================================================================
+# SYNTHETIC EMBEDDINGS
+# =============================================================================
+
+@lru_cache(maxsize=8192)
+def _token_vector(token: str, dim: int) -> np.ndarray:
+    seed = int.from_bytes(hashlib.sha1(token.encode("utf-8")).digest()[:8], "little")
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+
+
+def synthetic_embedding(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    Deterministic unit vector: the normalized sum of per-token random
+    vectors, so texts sharing words are close in cosine distance.
+    """
+    tokens = re.findall(r"[a-z0-9]+", (text or "").lower()) or ["<empty>"]
+    vector = np.sum([_token_vector(t, dim) for t in tokens], axis=0)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+@lru_cache(maxsize=65536)
+def _blob_vector(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def _cosine_distance(a: Optional[bytes], b: Optional[bytes]) -> Optional[float]:
+    if a is None or b is None:
+        return None
+    va, vb = _blob_vector(a), _blob_vector(b)
+    denom = float(np.linalg.norm(va) * np.linalg.norm(vb))
+    return 1.0 - float(va @ vb) / denom if denom else 1.0
+
+
+# =============================================================================
+# VECTOR INDEX (APPROX_COSINE_DISTANCE)
+# =============================================================================
+
+class _LeafIndex:
+    """
+    Two-level (tree_depth = 2) vector index like Spanner's: skills are
+    clustered into ~sqrt(n) leaves by spherical k-means; a query ranks
+    the leaf centroids and only searches the nearest few leaves.
+    """
+
+    def __init__(self, rows: Sequence[tuple], seed: int = 3, iterations: int = 8):
+        self.ids = [r[0] for r in rows]
+        self.names = [r[1] for r in rows]
+        self.categories = [r[2] for r in rows]
+        matrix = np.stack([_blob_vector(r[3]) for r in rows]).astype(np.float32)
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        self.matrix = matrix
+
+        n_leaves = max(1, int(round(np.sqrt(len(rows)))))
+        rng = np.random.default_rng(seed)
+        centroids = matrix[rng.choice(len(rows), size=n_leaves, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(matrix @ centroids.T, axis=1)
+            for leaf in range(n_leaves):
+                members = matrix[assignment == leaf]
+                if len(members):
+                    center = members.sum(axis=0)
+                    centroids[leaf] = center / max(np.linalg.norm(center), 1e-12)
+        self.centroids = centroids
+        assignment = np.argmax(matrix @ centroids.T, axis=1)
+        self.leaves = [np.flatnonzero(assignment == leaf) for leaf in range(n_leaves)]
+
+    def search(self, query: Sequence[float], k: int, leaves_to_search: int) -> List[tuple]:
+        q = np.asarray(query, dtype=np.float32)
+        q /= max(float(np.linalg.norm(q)), 1e-12)
+        nearest_leaves = np.argsort(-(self.centroids @ q))[:max(1, leaves_to_search)]
+        candidates = np.concatenate([self.leaves[leaf] for leaf in nearest_leaves])
+        if candidates.size == 0:
+            return []
+        distances = 1.0 - self.matrix[candidates] @ q
+        order = np.argsort(distances, kind="stable")[:k]
+        return [
+            (self.ids[i], self.names[i], self.categories[i], float(distances[j]))
+            for i, j in zip(candidates[order], order)
+        ]
+
+
+# =============================================================================
+# DATABASE
+# =============================================================================
+
+class _Snapshot:
+    """Read-only snapshot over the shared SQLite connection."""
+
+    def __init__(self, database: "SqliteSpannerDatabase"):
+        self._database = database
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def begin(self) -> None:
+        pass
+
+    def execute_sql(self, sql: str, params: Optional[Dict[str, Any]] = None,
+                    param_types: Optional[Dict[str, Any]] = None) -> List[tuple]:
+        return self._database.execute_sql(sql, params or {})
+
+
+class SqliteSpannerDatabase:
+    """In-memory SQLite mirror of the search tables."""
+
+    def __init__(self, embedding_dim: int = EMBEDDING_DIM):
+        self.embedding_dim = embedding_dim
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.create_function("COSINE_DISTANCE", 2, _cosine_distance, deterministic=True)
+        self._lock = threading.Lock()
+        self._leaf_index: Optional[_LeafIndex] = None
+        self.queries = 0
+        self._create_schema()
+
+    def snapshot(self, **kwargs) -> _Snapshot:
+        # Staleness / multi_use options don't apply to a local database
+        return _Snapshot(self)
+
+    # =========================================================================
+    # SCHEMA / DATA
+    # =========================================================================
+
+    def _create_schema(self) -> None:
+        self._conn.executescript("""
+            CREATE TABLE Skills (
+                skill_id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                category TEXT,
+                description TEXT,
+                skill_embedding BLOB
+            );
+            CREATE TABLE Survivors (
+                survivor_id TEXT PRIMARY KEY,
+                name TEXT,
+                role TEXT,
+                biome TEXT,
+                description TEXT
+            );
+            CREATE TABLE SurvivorHasSkill (
+                survivor_id TEXT NOT NULL,
+                skill_id TEXT NOT NULL,
+                proficiency TEXT,
+                PRIMARY KEY (survivor_id, skill_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX SurvivorHasSkillBySkill ON SurvivorHasSkill (skill_id);
+        """)
+
+    def populate(self, n_survivors: int, n_skills: int = 500,
+                 skills_per_survivor: int = 3, seed: int = 7) -> None:
+        """Generate a synthetic network of the given size."""
+        rng = np.random.default_rng(seed)
+
+        skills = []
+        for i in range(n_skills):
+            words = rng.choice(SKILL_WORDS, size=2, replace=False)
+            name = f"{words[0].title()} {words[1].title()} {i}"
+            skills.append((
+                f"skill_{i}", name, CATEGORIES[i % len(CATEGORIES)],
+                f"Knows {words[0]} and {words[1]}",
+                synthetic_embedding(name, self.embedding_dim).astype(np.float32).tobytes()
+            ))
+
+        with self._lock:
+            self._conn.executemany("INSERT INTO Skills VALUES (?, ?, ?, ?, ?)", skills)
+
+            batch = 50_000
+            for start in range(0, n_survivors, batch):
+                ids = range(start, min(start + batch, n_survivors))
+                self._conn.executemany(
+                    "INSERT INTO Survivors VALUES (?, ?, ?, ?, ?)",
+                    ((f"survivor_{i}", f"Survivor {i}", "Scout",
+                      BIOMES[i % len(BIOMES)], "") for i in ids)
+                )
+                picks = rng.integers(0, n_skills, size=(len(ids), skills_per_survivor))
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO SurvivorHasSkill VALUES (?, ?, 'basic')",
+                    ((f"survivor_{i}", f"skill_{j}")
+                     for i, row in zip(ids, picks.tolist()) for j in row)
+                )
+            self._conn.commit()
+            self._leaf_index = None
+
+    def skill_names(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT name FROM Skills ORDER BY skill_id")]
+
+    # =========================================================================
+    # QUERY TRANSLATION
+    # =========================================================================
+
+    def execute_sql(self, sql: str, params: Dict[str, Any]) -> List[tuple]:
+        self.queries += 1
+
+        if "ML.PREDICT" in sql and "TextEmbeddings" in sql:
+            return [
+                (content, synthetic_embedding(content, self.embedding_dim).tolist())
+                for content in params.get("contents", [])
+            ]
+
+        if "APPROX_COSINE_DISTANCE" in sql:
+            match = _LEAVES_TO_SEARCH_RE.search(sql)
+            return self._vector_index().search(
+                params["query_embedding"], int(params["limit"]),
+                int(match.group(1)) if match else 1
+            )
+
+        upper = sql.upper()
+        for token in _UNSUPPORTED:
+            if token in upper:
+                raise NotImplementedError(f"Stand-in database does not support {token}")
+
+        translated = self._translate(sql)
+        bound = {name: self._bind(value) for name, value in params.items()}
+
+        with self._lock:
+            rows = self._conn.execute(translated, bound).fetchall()
+
+        return [
+            tuple(_blob_vector(v).tolist() if isinstance(v, bytes) else v for v in row)
+            for row in rows
+        ]
+
+    def _vector_index(self) -> _LeafIndex:
+        """Build the skill vector index on first use."""
+        with self._lock:
+            if self._leaf_index is None:
+                rows = self._conn.execute(
+                    "SELECT skill_id, name, category, skill_embedding FROM Skills "
+                    "WHERE skill_embedding IS NOT NULL ORDER BY skill_id"
+                ).fetchall()
+                self._leaf_index = _LeafIndex(rows)
+            return self._leaf_index
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _translate(sql: str) -> str:
+        sql = re.sub(r"IN\s+UNNEST\(\s*@(\w+)\s*\)", r"IN (SELECT value FROM json_each(:\1))", sql)
+        return re.sub(r"@(\w+)", r":\1", sql)
+
+    @staticmethod
+    def _bind(value: Any) -> Any:
+        if isinstance(value, (list, tuple)):
+            if value and all(isinstance(v, float) for v in value):
+                return np.asarray(value, dtype=np.float32).tobytes()
+            return json.dumps(list(value))
+        return value
+
+
+def build_database(n_survivors: int, n_skills: int = 500,
+                   embedding_dim: int = EMBEDDING_DIM) -> SqliteSpannerDatabase:
+    """Create and populate a stand-in database."""
+    database = SqliteSpannerDatabase(embedding_dim=embedding_dim)
+    database.populate(n_survivors, n_skills=n_skills)
+    return database
+
+
+def sample_queries(skill_names: Sequence[str], n: int = 50, seed: int = 11) -> List[str]:
+    """Natural-ish queries built from the skill vocabulary."""
+    rng = np.random.default_rng(seed)
+    words = sorted({w.lower() for name in skill_names for w in name.split() if not w.isdigit()})
+    return [
+        "who knows " + " ".join(rng.choice(words, size=2, replace=False))
+        for _ in range(n)
+    ]
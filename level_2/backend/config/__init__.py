@@ -23,6 +23,14 @@ class Settings:
     GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
     USE_MEMORY_BANK = os.getenv("USE_MEMORY_BANK", "false").lower() == "true"
 
+    # Spanner session pool shared by the whole process (services/spanner_client.py).
+    # One session per concurrent read: FastAPI's 40 worker threads run the
+    # sync routes, so fewer sessions than that makes requests queue.
+    SPANNER_POOL_TYPE = os.getenv("SPANNER_POOL_TYPE", "fixed").lower()
+    SPANNER_POOL_SIZE = int(os.getenv("SPANNER_POOL_SIZE", "40"))
+    SPANNER_POOL_TIMEOUT = int(os.getenv("SPANNER_POOL_TIMEOUT", "10"))
+    SPANNER_POOL_PING_INTERVAL = int(os.getenv("SPANNER_POOL_PING_INTERVAL", "300"))
+
 settings = Settings()
 
 __all__ = ['ExtractionConfig', 'MediaType', 'settings']
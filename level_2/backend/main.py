@@ -1,11 +1,23 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv, find_dotenv
+from services.search_metrics import render_prometheus
+from services.spanner_client import warm_up
 
 # Load environment variables from .env file (automatically finds it in parent directories)
 load_dotenv(find_dotenv())
 
-app = FastAPI(title="Survivor Network API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create the shared Spanner client and session pool before serving,
+    # so the first requests don't pay auth, channel and session setup
+    await asyncio.to_thread(warm_up)
+    yield
+
+app = FastAPI(title="Survivor Network API", lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -20,6 +32,11 @@ app.add_middleware(
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    # Prometheus text format: per-stage hybrid search latency histograms
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 
 from api.routes import graph, chat, upload
 app.include_router(graph.router)
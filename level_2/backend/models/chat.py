@@ -17,3 +17,8 @@ class ChatResponse(BaseModel):
     nodes_to_highlight: List[str] = []
     edges_to_highlight: List[str] = []
     suggested_followups: List[str] = []
+
+class SearchStreamRequest(BaseModel):
+    query: str
+    limit: int = 10
+    method: Optional[str] = None  # "keyword" | "rag" | "hybrid" to force a method
@@ -25,6 +25,16 @@ class GraphData(BaseModel):
     nodes: List[Node]
     edges: List[Edge]
 
+class NodePage(BaseModel):
+    """One keyset page of nodes; pass next_cursor back for the next one."""
+    nodes: List[Node]
+    next_cursor: Optional[str] = None
+
+class EdgePage(BaseModel):
+    """One keyset page of edges; pass next_cursor back for the next one."""
+    edges: List[Edge]
+    next_cursor: Optional[str] = None
+
 class GraphQueryRequest(BaseModel):
     query: str
 
@@ -32,3 +42,4 @@ class GraphQueryResponse(BaseModel):
     data: GraphData
     query_executed: str
     execution_time_ms: float
+    cached: bool = False
@@ -0,0 +1,246 @@
+# services/catalog_cache.py
+"""
+Known-values catalog (skills, categories, biomes) for the query analyzer.
+
+    ┌────────────────────────────────────────────────────────────────┐
+    │  get()        current catalog, never blocks after first load   │
+    │    └─ older than ttl → background check on the executor        │
+    │  check        SELECT count + XOR of row fingerprints (cheap)   │
+    │    └─ changed → full load → atomic swap of an immutable        │
+    │                 _Catalog snapshot                              │
+    │  skill_sample(query, token_budget)                             │
+    │               most query-relevant skills that fit the budget   │
+    └────────────────────────────────────────────────────────────────┘
+
+New skills from media ingest therefore reach analyzer prompts within one
+TTL, without a restart and without touching any other cache.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _token_set(text: Optional[str]) -> FrozenSet[str]:
+    return frozenset(_TOKEN_RE.findall((text or "").lower()))
+
+
+def _prompt_tokens(value: str) -> int:
+    """Rough LLM token cost of a JSON-quoted list item (~4 chars/token)."""
+    return (len(value) + 4) // 4 + 1
+
+
+@dataclass(frozen=True)
+class _Catalog:
+    """Immutable catalog contents, swapped atomically."""
+    skills: Tuple[str, ...]
+    categories: Tuple[str, ...]
+    biomes: Tuple[str, ...]
+    skill_tokens: Tuple[FrozenSet[str], ...]
+    signature: Tuple[int, ...]          # content checksums for change checks
+    fingerprint: str
+
+
+class CatalogCache:
+    """
+    TTL-refreshed cache of known skills, categories and biomes.
+
+    `run_read(fn)` runs `fn(snapshot)` against a read-only snapshot (the
+    owning service's read path). `on_change(catalog)` is called after a
+    new catalog is swapped in.
+    """
+
+    # Order-independent checksums of the rows the catalog is built from, so
+    # a renamed skill or a moved survivor changes the signature even when
+    # the row counts stay the same
+    _SIGNATURE_COLUMNS = """
+        (SELECT COUNT(*) FROM Skills),
+        (SELECT BIT_XOR(FARM_FINGERPRINT(
+             CONCAT(skill_id, '|', name, '|', IFNULL(category, '')))) FROM Skills),
+        (SELECT BIT_XOR(FARM_FINGERPRINT(
+             CONCAT(survivor_id, '|', IFNULL(biome, '')))) FROM Survivors)
+    """
+    _SIGNATURE_SQL = f"SELECT {_SIGNATURE_COLUMNS}"
+
+    def __init__(
+        self,
+        run_read: Callable[[Callable[[Any], None]], None],
+        ttl_seconds: float = 300.0,
+        max_skills: int = 1000,
+        on_change: Optional[Callable[["_Catalog"], None]] = None
+    ):
+        self.run_read = run_read
+        self.ttl_seconds = ttl_seconds
+        self.max_skills = max_skills
+        self.on_change = on_change
+
+        self._catalog: Optional[_Catalog] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+        # Counters
+        self.checks = 0
+        self.reloads = 0
+
+    # =========================================================================
+    # ACCESS
+    # =========================================================================
+
+    def get(self, executor=None) -> _Catalog:
+        """
+        Return the current catalog.
+
+        The first call loads synchronously. Afterwards a stale catalog is
+        returned immediately while a refresh runs on `executor` (inline
+        if no executor is given).
+        """
+        catalog = self._catalog
+        if catalog is None:
+            self.refresh(force=True)
+            return self._catalog
+
+        if time.monotonic() - self._checked_at >= self.ttl_seconds:
+            with self._lock:
+                if self._refreshing:
+                    return catalog
+                self._refreshing = True
+            if executor is not None:
+                executor.submit(self._background_refresh)
+            else:
+                self._background_refresh()
+
+        return catalog
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Check for changes and reload if needed.
+
+        Returns True when a new catalog was swapped in.
+        """
+        self.checks += 1
+        current = self._catalog
+        if not force and current is not None:
+            if self._read_signature() == current.signature:
+                self._checked_at = time.monotonic()
+                return False
+
+        catalog = self._load()
+        self._catalog = catalog
+        self._checked_at = time.monotonic()
+        self.reloads += 1
+
+        if self.on_change is not None and \
+                (current is None or current.fingerprint != catalog.fingerprint):
+            self.on_change(catalog)
+        return True
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Catalog refresh failed: {e}")
+        finally:
+            self._refreshing = False
+
+    # =========================================================================
+    # LOADING
+    # =========================================================================
+
+    def _read_signature(self) -> Tuple[int, ...]:
+        signature: List[Tuple[int, ...]] = []
+
+        def run_query(snapshot):
+            for row in snapshot.execute_sql(self._SIGNATURE_SQL):
+                signature.append(tuple(int(v or 0) for v in row))
+
+        self.run_read(run_query)
+        return signature[0] if signature else ()
+
+    def _load(self) -> _Catalog:
+        # One read: single-use snapshots allow only one query
+        sql = f"""
+            SELECT
+                ARRAY(SELECT DISTINCT name FROM Skills WHERE name IS NOT NULL
+                      ORDER BY name LIMIT {int(self.max_skills)}),
+                ARRAY(SELECT DISTINCT category FROM Skills WHERE category IS NOT NULL),
+                ARRAY(SELECT DISTINCT biome FROM Survivors WHERE biome IS NOT NULL),
+                {self._SIGNATURE_COLUMNS}
+        """
+        loaded: Dict[str, Any] = {}
+
+        def run_query(snapshot):
+            for row in snapshot.execute_sql(sql):
+                loaded["skills"] = tuple(row[0] or [])
+                loaded["categories"] = tuple(sorted(row[1] or []))
+                loaded["biomes"] = tuple(sorted(row[2] or []))
+                loaded["signature"] = tuple(int(v or 0) for v in row[3:6])
+
+        self.run_read(run_query)
+
+        skills = loaded.get("skills", ())
+        categories = loaded.get("categories", ())
+        biomes = loaded.get("biomes", ())
+        fingerprint = hashlib.sha1(json.dumps(
+            [list(skills), list(categories), list(biomes)]
+        ).encode("utf-8")).hexdigest()
+
+        return _Catalog(
+            skills=skills,
+            categories=categories,
+            biomes=biomes,
+            skill_tokens=tuple(_token_set(s) for s in skills),
+            signature=loaded.get("signature", ()),
+            fingerprint=fingerprint
+        )
+
+    # =========================================================================
+    # PROMPT SAMPLING
+    # =========================================================================
+
+    def skill_sample(self, query: str, token_budget: int = 400) -> List[str]:
+        """
+        Skills for the analyzer prompt, most relevant to `query` first.
+
+        Skills sharing words with the query come first (by overlap), then
+        the rest in catalog order, until `token_budget` is used up.
+        """
+        catalog = self._catalog
+        if catalog is None:
+            return []
+
+        query_tokens = _token_set(query)
+        overlaps = [
+            (len(tokens & query_tokens), i)
+            for i, tokens in enumerate(catalog.skill_tokens)
+        ]
+        overlaps.sort(key=lambda item: (-item[0], item[1]))
+
+        sample: List[str] = []
+        used = 0
+        for _, i in overlaps:
+            cost = _prompt_tokens(catalog.skills[i])
+            if used + cost > token_budget:
+                break
+            sample.append(catalog.skills[i])
+            used += cost
+        return sample
+
+    def stats(self) -> Dict[str, Any]:
+        """Catalog size and refresh counters."""
+        catalog = self._catalog
+        return {
+            "skills": len(catalog.skills) if catalog else 0,
+            "categories": len(catalog.categories) if catalog else 0,
+            "biomes": len(catalog.biomes) if catalog else 0,
+            "checks": self.checks,
+            "reloads": self.reloads,
+            "age_seconds": time.monotonic() - self._checked_at if catalog else None
+        }
@@ -0,0 +1,168 @@
+# services/embedding_cache.py
+"""
+Query-embedding cache shared by rag_search and find_similar_skills.
+
+Computes a text's vector once (via the TextEmbeddings model) and keeps it
+in a bounded in-process LRU. An optional SQLite file store survives
+restarts, so repeated searches never hit the embedding model.
+
+    ┌──────────┐  miss  ┌──────────┐  miss  ┌────────────────────────┐
+    │   LRU    │ ─────▶ │  SQLite  │ ─────▶ │ ML.PREDICT (batched)   │
+    │ (memory) │ ◀───── │ (disk)   │ ◀───── │ MODEL TextEmbeddings   │
+    └──────────┘        └──────────┘        └────────────────────────┘
+"""
+
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+
+def normalize_text(text: str) -> str:
+    """Cache key for a text: case-folded with collapsed whitespace."""
+    return " ".join((text or "").split()).casefold()
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU of text embeddings with an optional on-disk store.
+
+    `embed_fn` takes a list of texts and returns one vector per text, in
+    order. Misses from a `get_many` call are embedded in a single batch.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], List[List[float]]],
+        max_entries: int = 2048,
+        disk_path: Optional[str] = None,
+        model_name: str = "TextEmbeddings"
+    ):
+        self.embed_fn = embed_fn
+        self.max_entries = max_entries
+        self.model_name = model_name
+
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._disk: Optional[sqlite3.Connection] = None
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute(
+                """CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (model, key)
+                )"""
+            )
+            self._disk.commit()
+
+        # Counters
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    def get(self, text: str) -> List[float]:
+        """Return the embedding for a single text."""
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: List[str]) -> List[List[float]]:
+        """Return embeddings for many texts, embedding all misses in one call."""
+        keys = [normalize_text(t) for t in texts]
+        found: Dict[str, List[float]] = {}
+        missing: Dict[str, str] = {}  # key -> original text
+
+        with self._lock:
+            for key, text in zip(keys, texts):
+                if key in found or key in missing:
+                    continue
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    found[key] = vector
+                else:
+                    missing[key] = text
+
+        if missing and self._disk is not None:
+            for key, vector in self._disk_load(list(missing)).items():
+                found[key] = vector
+                del missing[key]
+                self.disk_hits += 1
+                self._remember(key, vector)
+
+        if missing:
+            self.misses += len(missing)
+            miss_keys = list(missing)
+            vectors = self.embed_fn([missing[k] for k in miss_keys])
+            for key, vector in zip(miss_keys, vectors):
+                vector = [float(v) for v in vector]
+                found[key] = vector
+                self._remember(key, vector)
+            if self._disk is not None:
+                self._disk_store({k: found[k] for k in miss_keys if k in found})
+
+        return [found.get(key, []) for key in keys]
+
+    def clear(self) -> None:
+        """Drop the in-memory entries (the disk store is kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "disk_enabled": self._disk is not None
+        }
+
+    # =========================================================================
+    # HELPERS
+    # =========================================================================
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        if not vector:
+            return
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_load(self, keys: List[str]) -> Dict[str, List[float]]:
+        placeholders = ",".join("?" for _ in keys)
+        with self._lock:
+            rows = self._disk.execute(
+                f"SELECT key, vector FROM embeddings "
+                f"WHERE model = ? AND key IN ({placeholders})",
+                [self.model_name, *keys]
+            ).fetchall()
+        return {key: array("d", blob).tolist() for key, blob in rows}
+
+    def _disk_store(self, vectors: Dict[str, List[float]]) -> None:
+        rows = [
+            (self.model_name, key, array("d", vector).tobytes())
+            for key, vector in vectors.items() if vector
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._disk.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, vector) VALUES (?, ?, ?)",
+                rows
+            )
+            self._disk.commit()
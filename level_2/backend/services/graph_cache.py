@@ -0,0 +1,150 @@
+# services/graph_cache.py
+"""
+Process-wide cache of the full survivor graph.
+
+Every GraphService (the /api/graph route and the survivor agent tools)
+shares one GraphData snapshot instead of re-reading every table:
+
+    ┌────────────────────────────────────────────────────────────────┐
+    │  get(loader)   fresh snapshot → returned as is                 │
+    │    └─ older than ttl → returned, reload in the background      │
+    │                        (stale-while-revalidate)                │
+    │    └─ none / invalidated → loaded now (one loader at a time)   │
+    │  invalidate()  SpannerGraphService.save_extraction_result      │
+    │                after each committed write                      │
+    └────────────────────────────────────────────────────────────────┘
+
+Each snapshot carries its JSON body and ETag, serialized once, so the
+graph route answers If-None-Match with 304 and otherwise just writes
+bytes.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from models.graph import GraphData
+
+
+@dataclass(frozen=True)
+class GraphSnapshot:
+    """Immutable cached graph, swapped atomically."""
+    data: GraphData
+    body: bytes                        # GraphData JSON
+    etag: str                          # strong ETag of `body`
+    loaded_at: float
+
+
+def make_snapshot(data: GraphData) -> GraphSnapshot:
+    """Serialize `data` once and tag it."""
+    body = data.model_dump_json().encode("utf-8")
+    return GraphSnapshot(
+        data=data,
+        body=body,
+        etag='"' + hashlib.sha1(body).hexdigest() + '"',
+        loaded_at=time.monotonic()
+    )
+
+
+class GraphCache:
+    """TTL + stale-while-revalidate cache of one GraphData snapshot."""
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+
+        self._snapshot: Optional[GraphSnapshot] = None
+        self._generation = 0               # bumped by invalidate()
+        self._load_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+        # Counters
+        self.hits = 0
+        self.stale_hits = 0
+        self.loads = 0
+        self.invalidations = 0
+
+    # =========================================================================
+    # ACCESS
+    # =========================================================================
+
+    def get(self, loader: Callable[[], GraphData]) -> GraphSnapshot:
+        """
+        Return the cached snapshot, loading it with `loader()` if needed.
+
+        Loader errors propagate (nothing is cached); a failed background
+        reload keeps serving the stale snapshot.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            if time.monotonic() - snapshot.loaded_at < self.ttl_seconds:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._refresh_in_background(loader)
+            return snapshot
+
+        # Single-flight: concurrent misses wait for one load
+        with self._load_lock:
+            snapshot = self._snapshot
+            if snapshot is not None:
+                self.hits += 1
+                return snapshot
+            return self._load(loader)
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next get() reads the graph again."""
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+            self.invalidations += 1
+
+    # =========================================================================
+    # LOADING
+    # =========================================================================
+
+    def _load(self, loader: Callable[[], GraphData]) -> GraphSnapshot:
+        generation = self._generation
+        snapshot = make_snapshot(loader())
+        with self._lock:
+            # A write committed while we were reading: don't install
+            # pre-write data over the invalidation
+            if generation == self._generation:
+                self._snapshot = snapshot
+            self.loads += 1
+        return snapshot
+
+    def _refresh_in_background(self, loader: Callable[[], GraphData]) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self._load(loader)
+            except Exception as e:
+                print(f"Graph cache refresh failed: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="graph-cache-refresh", daemon=True).start()
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "cached": snapshot is not None,
+            "age_seconds": time.monotonic() - snapshot.loaded_at if snapshot else None,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "loads": self.loads,
+            "invalidations": self.invalidations
+        }
+
+
+# Shared by every GraphService in the process
+graph_cache = GraphCache(ttl_seconds=float(os.getenv("GRAPH_CACHE_TTL_SECONDS", "30")))
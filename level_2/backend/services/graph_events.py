@@ -0,0 +1,49 @@
+"""
+Process-wide change notifications for the survivor graph.
+
+Writers (SpannerGraphService.save_extraction_result) publish a change
+after committing; in-process caches and indexes subscribe to refresh or
+invalidate themselves without polling Spanner.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+ChangeListener = Callable[[Dict[str, Any]], None]
+
+_listeners: List[ChangeListener] = []
+_lock = threading.Lock()
+
+
+def register_change_listener(listener: ChangeListener) -> None:
+    """Subscribe to graph changes. `listener(change)` is called after each write."""
+    with _lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def unregister_change_listener(listener: ChangeListener) -> None:
+    """Stop receiving graph changes."""
+    with _lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def notify_graph_changed(change: Dict[str, Any]) -> None:
+    """
+    Publish a committed change to every listener.
+
+    `change` carries at least `survivor_ids` (survivors whose nodes or
+    edges were written). Listener errors are logged, never raised.
+    """
+    with _lock:
+        listeners = list(_listeners)
+
+    for listener in listeners:
+        try:
+            listener(change)
+        except Exception as e:
+            logger.error(f"Graph change listener failed: {e}")
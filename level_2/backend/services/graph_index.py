@@ -0,0 +1,210 @@
+# services/graph_index.py
+"""
+Indexed, read-only view of a GraphData snapshot for the agent tools and
+the graph lookup routes.
+
+    ┌────────────────────────────────────────────────────────────────┐
+    │  nodes          id → Node                                      │
+    │  by_type        NodeType → [Node]           (graph order)      │
+    │  out / in       EdgeType → node id → [Edge] (adjacency)        │
+    │  incident       node id → [Edge]            (any type, either  │
+    │                                              direction)        │
+    │  skill trie     suffix trie over lowercase skill labels:       │
+    │                 substring match = one walk of the query        │
+    │  urgency        HAS_NEED edges bucketed by edge status, need   │
+    │                 ids bucketed by the need's urgency property    │
+    │  counts         rows per node / edge type                      │
+    └────────────────────────────────────────────────────────────────┘
+
+Built once per cached snapshot (GraphIndex.for_graph), so each lookup
+is linear in the size of its answer instead of O(nodes × edges).
+"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from models.graph import Edge, GraphData, Node, NodeType, EdgeType
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: Set[str] = set()
+
+
+class _SuffixTrie:
+    """Every suffix of every label; a node's ids contain that substring."""
+
+    def __init__(self):
+        self.root = _TrieNode()
+
+    def add(self, label: str, node_id: str) -> None:
+        self.root.ids.add(node_id)
+        for start in range(len(label)):
+            node = self.root
+            for char in label[start:]:
+                node = node.children.setdefault(char, _TrieNode())
+                node.ids.add(node_id)
+
+    def containing(self, text: str) -> Set[str]:
+        node = self.root
+        for char in text:
+            node = node.children.get(char)
+            if node is None:
+                return set()
+        return node.ids
+
+
+class GraphIndex:
+    """Lookup structures over one GraphData."""
+
+    _cache_lock = threading.Lock()
+    _cached: Optional[Tuple[GraphData, "GraphIndex"]] = None
+
+    def __init__(self, graph: GraphData):
+        self.nodes: Dict[str, Node] = {}
+        self._position: Dict[str, int] = {}
+        self.by_type: Dict[NodeType, List[Node]] = defaultdict(list)
+        for position, node in enumerate(graph.nodes):
+            self.nodes[node.id] = node
+            self._position[node.id] = position
+            self.by_type[node.type].append(node)
+
+        self.out_edges: Dict[EdgeType, Dict[str, List[Edge]]] = defaultdict(lambda: defaultdict(list))
+        self.in_edges: Dict[EdgeType, Dict[str, List[Edge]]] = defaultdict(lambda: defaultdict(list))
+        self.incident: Dict[str, List[Edge]] = defaultdict(list)
+        self.need_edges_by_status: Dict[str, List[Tuple[int, Edge]]] = defaultdict(list)
+        self.counts: Dict[Union[NodeType, EdgeType], int] = {
+            node_type: len(nodes) for node_type, nodes in self.by_type.items()
+        }
+        for position, edge in enumerate(graph.edges):
+            self.out_edges[edge.type][edge.source].append(edge)
+            self.in_edges[edge.type][edge.target].append(edge)
+            self.incident[edge.source].append(edge)
+            if edge.target != edge.source:
+                self.incident[edge.target].append(edge)
+            self.counts[edge.type] = self.counts.get(edge.type, 0) + 1
+            if edge.type == EdgeType.HAS_NEED:
+                status = str(edge.properties.get("status", "")).lower()
+                self.need_edges_by_status[status].append((position, edge))
+        self._edge_position = {id(edge): i for i, edge in enumerate(graph.edges)}
+
+        self.needs_by_urgency: Dict[str, List[str]] = defaultdict(list)
+        for node in self.by_type[NodeType.NEED]:
+            urgency = str(node.properties.get("urgency", "")).lower()
+            self.needs_by_urgency[urgency].append(node.id)
+
+        self._skill_trie = _SuffixTrie()
+        for node in self.by_type[NodeType.SKILL]:
+            self._skill_trie.add(node.label.lower(), node.id)
+
+    @classmethod
+    def for_graph(cls, graph: GraphData) -> "GraphIndex":
+        """Index for `graph`, re-used while the same snapshot is current."""
+        with cls._cache_lock:
+            cached = cls._cached
+            if cached is not None and cached[0] is graph:
+                return cached[1]
+        index = cls(graph)
+        with cls._cache_lock:
+            cls._cached = (graph, index)
+        return index
+
+    # =========================================================================
+    # LOOKUPS
+    # =========================================================================
+
+    def node(self, node_id: str) -> Optional[Node]:
+        return self.nodes.get(node_id)
+
+    def nodes_of_type(self, node_type: NodeType) -> List[Node]:
+        return self.by_type.get(node_type, [])
+
+    def edges_from(self, node_id: str, edge_type: EdgeType) -> List[Edge]:
+        return self.out_edges.get(edge_type, {}).get(node_id, [])
+
+    def edges_to(self, node_id: str, edge_type: EdgeType) -> List[Edge]:
+        return self.in_edges.get(edge_type, {}).get(node_id, [])
+
+    def largest_table(self) -> int:
+        """Row count of the biggest node or edge type (0 for an empty graph)."""
+        return max(self.counts.values(), default=0)
+
+    def skills_matching(self, text: str) -> List[Node]:
+        """Skill nodes whose label contains `text` (case-insensitive), in graph order."""
+        ids = self._skill_trie.containing(text.lower())
+        return [self.nodes[i] for i in sorted(ids, key=self._position.__getitem__)]
+
+    def urgent_need_edges(
+        self,
+        statuses: Iterable[str],
+        urgencies: Iterable[str]
+    ) -> List[Edge]:
+        """
+        HAS_NEED edges whose status is in `statuses` or whose need's
+        urgency is in `urgencies` (lowercase), in graph order.
+        """
+        found: Dict[int, Edge] = {}
+        for status in statuses:
+            for position, edge in self.need_edges_by_status.get(status, []):
+                found[position] = edge
+        for urgency in urgencies:
+            for need_id in self.needs_by_urgency.get(urgency, []):
+                for edge in self.edges_to(need_id, EdgeType.HAS_NEED):
+                    found[self._edge_position[id(edge)]] = edge
+        return [found[position] for position in sorted(found)]
+
+    def neighbors(self, node_id: str) -> Optional[GraphData]:
+        """
+        The node, every edge touching it (either direction, any type) and
+        the nodes at the other end. None if the node isn't in the graph.
+        """
+        node = self.nodes.get(node_id)
+        if node is None:
+            return None
+
+        nodes = {node_id: node}
+        edges = []
+        for edge in self.incident.get(node_id, []):
+            other = self.nodes.get(edge.target if edge.source == node_id else edge.source)
+            if other is not None:
+                nodes.setdefault(other.id, other)
+                edges.append(edge)
+        return GraphData(nodes=list(nodes.values()), edges=edges)
+
+    def shortest_path(self, from_id: str, to_id: str) -> Optional[GraphData]:
+        """
+        Fewest-edge path between two nodes, ignoring edge direction
+        (breadth-first over the incident lists). None if either node is
+        missing or they aren't connected.
+        """
+        if from_id not in self.nodes or to_id not in self.nodes:
+            return None
+
+        came_from: Dict[str, Optional[Tuple[str, Edge]]] = {from_id: None}
+        queue = deque([from_id])
+        while queue and to_id not in came_from:
+            current = queue.popleft()
+            for edge in self.incident.get(current, []):
+                other = edge.target if edge.source == current else edge.source
+                if other not in came_from and other in self.nodes:
+                    came_from[other] = (current, edge)
+                    queue.append(other)
+
+        if to_id not in came_from:
+            return None
+
+        nodes = [self.nodes[to_id]]
+        edges: List[Edge] = []
+        step = came_from[to_id]
+        while step is not None:
+            previous, edge = step
+            edges.append(edge)
+            nodes.append(self.nodes[previous])
+            step = came_from[previous]
+        nodes.reverse()
+        edges.reverse()
+        return GraphData(nodes=nodes, edges=edges)
@@ -0,0 +1,133 @@
+# services/graph_query_cache.py
+"""
+Result cache for custom GQL queries (GraphService.query_graph).
+
+    ┌────────────────────────────────────────────────────────────────┐
+    │  key      normalize_gql(query): comments dropped, whitespace   │
+    │           collapsed outside string literals, trailing ';'      │
+    │           dropped                                              │
+    │  value    parsed GraphData                                     │
+    │  evicted  least recently used past max_entries, after the TTL, │
+    │           or all at once on a committed graph write            │
+    │  skipped  results of a query that overlapped a write: put()    │
+    │           with a stale generation is dropped                   │
+    └────────────────────────────────────────────────────────────────┘
+
+Keys keep their case ('Frost' and 'frost' are different queries), so
+only reformatted copies of the same query share an entry. The key is
+never executed: query_graph sends the caller's original text to Spanner.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.graph import GraphData
+from services.graph_events import register_change_listener
+
+
+# Quoted strings / identifiers (kept verbatim by normalize_gql) and
+# comments (dropped): '--', '//' and '#' to end of line, '/* ... */'
+_TOKEN_RE = re.compile(r"""
+    (?P<literal>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`)
+  | (?P<comment>(?:--|//|\#)[^\n]*|/\*.*?(?:\*/|\Z))
+""", re.VERBOSE | re.DOTALL)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_gql(query: str) -> str:
+    """Drop comments, collapse whitespace outside literals, drop a trailing ';'."""
+    query = query or ""
+    parts: List[str] = []
+    code = ""                        # Text since the last literal
+    pos = 0
+    for match in _TOKEN_RE.finditer(query):
+        # A comment separates tokens like whitespace does
+        code += query[pos:match.start()] + (" " if match.group("comment") else "")
+        if match.group("literal"):
+            parts += [_SPACE_RE.sub(" ", code), match.group()]
+            code = ""
+        pos = match.end()
+    parts.append(_SPACE_RE.sub(" ", code + query[pos:]))
+    return "".join(parts).strip().rstrip(";").rstrip()
+
+
+class GraphQueryCache:
+    """Bounded LRU + TTL cache of GQL results keyed by normalized query."""
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[str, Tuple[GraphData, float]]" = OrderedDict()
+        self._generation = 0               # bumped by invalidate()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[GraphData]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    @property
+    def generation(self) -> int:
+        """Read before running a query; pass to put() with its result."""
+        return self._generation
+
+    def put(self, key: str, data: GraphData, generation: Optional[int] = None) -> None:
+        with self._lock:
+            # A write committed while the query ran: don't cache
+            # pre-write data over the invalidation
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (data, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+# Shared by every GraphService in the process; cleared after each write
+graph_query_cache = GraphQueryCache(
+    max_entries=int(os.getenv("GRAPH_QUERY_CACHE_SIZE", "128")),
+    ttl_seconds=float(os.getenv("GRAPH_QUERY_CACHE_TTL_SECONDS", "60"))
+)
+register_change_listener(lambda change: graph_query_cache.invalidate())
@@ -1,7 +1,340 @@
-from typing import List, Dict, Any
-from models.graph import Node, Edge, GraphData, NodeType, EdgeType
+import asyncio
+import base64
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+from google.cloud.spanner_v1 import param_types
+from google.cloud.spanner_v1.data_types import JsonObject
+from models.graph import (
+    Node, Edge, GraphData, NodeType, EdgeType, NodePage, EdgePage, GraphQueryResponse
+)
+from services.graph_cache import GraphSnapshot, graph_cache, make_snapshot
+from services.graph_index import GraphIndex
+from services.graph_query_cache import graph_query_cache, normalize_gql
 from services.spanner_service import SpannerService
 
+
+# Rows read per table for the full-graph overview (/api/graph)
+FULL_GRAPH_TABLE_LIMIT = 100
+
+# Every node and edge table in one statement: one round-trip, one read
+# timestamp. Each column is an ARRAY<STRUCT> of that table's rows.
+FULL_GRAPH_SQL = f"""
+    SELECT
+        ARRAY(SELECT AS STRUCT survivor_id, name, role, biome
+              FROM Survivors LIMIT {FULL_GRAPH_TABLE_LIMIT}) AS survivors,
+        ARRAY(SELECT AS STRUCT skill_id, name
+              FROM Skills LIMIT {FULL_GRAPH_TABLE_LIMIT}) AS skills,
+        ARRAY(SELECT AS STRUCT need_id, description, urgency
+              FROM Needs LIMIT {FULL_GRAPH_TABLE_LIMIT}) AS needs,
+        ARRAY(SELECT AS STRUCT survivor_id, skill_id, proficiency
+              FROM SurvivorHasSkill LIMIT {FULL_GRAPH_TABLE_LIMIT}) AS skill_edges,
+        ARRAY(SELECT AS STRUCT survivor_id, need_id, status
+              FROM SurvivorHasNeed LIMIT {FULL_GRAPH_TABLE_LIMIT}) AS need_edges,
+        ARRAY(SELECT AS STRUCT skill_id, need_id, effectiveness
+              FROM SkillTreatsNeed LIMIT {FULL_GRAPH_TABLE_LIMIT}) AS treats_edges
+"""
+
+
+
+# =============================================================================
+# KEYSET PAGES
+# =============================================================================
+#
+# /api/graph/nodes, /api/graph/edges and /api/graph/stream walk the tables
+# in primary-key order instead of loading the capped full graph:
+#
+#     ┌────────────────────────────────────────────────────────────────┐
+#     │  nodes   Survivors → Skills → Needs          key: id           │
+#     │  edges   HAS_SKILL → HAS_NEED → TREATS       key: (from, to)   │
+#     │  page    WHERE key > @after ORDER BY key LIMIT n + 1           │
+#     │  cursor  opaque: [table type, *last key]                       │
+#     └────────────────────────────────────────────────────────────────┘
+#
+# A page that drains one table continues with the next, so every page is
+# full until the last. The biome filter keeps survivors in that biome and
+# the skills, needs and edges attached to them.
+
+def _survivor_node(row) -> Node:
+    survivor_id, name, role, biome = row
+    return Node(
+        id=survivor_id,
+        type=NodeType.SURVIVOR,
+        label=name or "",
+        properties={"role": role or ""},
+        biome=biome or None
+    )
+
+
+def _skill_node(row) -> Node:
+    skill_id, name = row
+    return Node(id=skill_id, type=NodeType.SKILL, label=name or "", properties={})
+
+
+def _need_node(row) -> Node:
+    need_id, description, urgency = row
+    return Node(
+        id=need_id,
+        type=NodeType.NEED,
+        label=description or "",
+        properties={"urgency": urgency or ""}
+    )
+
+
+def _has_skill_edge(row) -> Edge:
+    survivor_id, skill_id, proficiency = row
+    return Edge(
+        id=f"{survivor_id}-{skill_id}",
+        source=survivor_id,
+        target=skill_id,
+        type=EdgeType.HAS_SKILL,
+        properties={"proficiency": proficiency or ""}
+    )
+
+
+def _has_need_edge(row) -> Edge:
+    survivor_id, need_id, status = row
+    return Edge(
+        id=f"{survivor_id}-{need_id}",
+        source=survivor_id,
+        target=need_id,
+        type=EdgeType.HAS_NEED,
+        properties={"status": status or ""}
+    )
+
+
+def _treats_edge(row) -> Edge:
+    skill_id, need_id, effectiveness = row
+    return Edge(
+        id=f"{skill_id}-{need_id}",
+        source=skill_id,
+        target=need_id,
+        type=EdgeType.TREATS,
+        properties={"effectiveness": effectiveness or ""}
+    )
+
+
+# Skill / need held by at least one survivor in @biome
+_SKILL_IN_BIOME = """EXISTS (
+              SELECT 1 FROM SurvivorHasSkill bs
+              JOIN Survivors b ON b.survivor_id = bs.survivor_id
+              WHERE bs.skill_id = {skill_id} AND b.biome = @biome)"""
+_NEED_IN_BIOME = """EXISTS (
+              SELECT 1 FROM SurvivorHasNeed bn
+              JOIN Survivors b ON b.survivor_id = bn.survivor_id
+              WHERE bn.need_id = {need_id} AND b.biome = @biome)"""
+_SURVIVOR_IN_BIOME = """EXISTS (
+              SELECT 1 FROM Survivors b
+              WHERE b.survivor_id = {survivor_id} AND b.biome = @biome)"""
+
+
+@dataclass(frozen=True)
+class _PageTable:
+    """One node or edge table walked in primary-key order."""
+    type: Any                          # NodeType / EdgeType
+    sql: str                           # {biome_filter} placeholder
+    key_columns: int                   # leading columns that form the key
+    biome_filter: str                  # AND-ed in when a biome is given
+    build: Callable[[Any], Any]        # row -> Node / Edge
+
+
+NODE_TABLES: Tuple[_PageTable, ...] = (
+    _PageTable(
+        type=NodeType.SURVIVOR,
+        sql="""
+            SELECT survivor_id, name, role, biome
+            FROM Survivors
+            WHERE survivor_id > @after {biome_filter}
+            ORDER BY survivor_id
+            LIMIT @limit
+        """,
+        biome_filter="AND biome = @biome",
+        key_columns=1,
+        build=_survivor_node
+    ),
+    _PageTable(
+        type=NodeType.SKILL,
+        sql="""
+            SELECT sk.skill_id, sk.name
+            FROM Skills sk
+            WHERE sk.skill_id > @after {biome_filter}
+            ORDER BY sk.skill_id
+            LIMIT @limit
+        """,
+        biome_filter="AND " + _SKILL_IN_BIOME.format(skill_id="sk.skill_id"),
+        key_columns=1,
+        build=_skill_node
+    ),
+    _PageTable(
+        type=NodeType.NEED,
+        sql="""
+            SELECT n.need_id, n.description, n.urgency
+            FROM Needs n
+            WHERE n.need_id > @after {biome_filter}
+            ORDER BY n.need_id
+            LIMIT @limit
+        """,
+        biome_filter="AND " + _NEED_IN_BIOME.format(need_id="n.need_id"),
+        key_columns=1,
+        build=_need_node
+    ),
+)
+
+EDGE_TABLES: Tuple[_PageTable, ...] = (
+    _PageTable(
+        type=EdgeType.HAS_SKILL,
+        sql="""
+            SELECT e.survivor_id, e.skill_id, e.proficiency
+            FROM SurvivorHasSkill e
+            WHERE (e.survivor_id > @after
+                   OR (e.survivor_id = @after AND e.skill_id > @after_to)) {biome_filter}
+            ORDER BY e.survivor_id, e.skill_id
+            LIMIT @limit
+        """,
+        biome_filter="AND " + _SURVIVOR_IN_BIOME.format(survivor_id="e.survivor_id"),
+        key_columns=2,
+        build=_has_skill_edge
+    ),
+    _PageTable(
+        type=EdgeType.HAS_NEED,
+        sql="""
+            SELECT e.survivor_id, e.need_id, e.status
+            FROM SurvivorHasNeed e
+            WHERE (e.survivor_id > @after
+                   OR (e.survivor_id = @after AND e.need_id > @after_to)) {biome_filter}
+            ORDER BY e.survivor_id, e.need_id
+            LIMIT @limit
+        """,
+        biome_filter="AND " + _SURVIVOR_IN_BIOME.format(survivor_id="e.survivor_id"),
+        key_columns=2,
+        build=_has_need_edge
+    ),
+    _PageTable(
+        type=EdgeType.TREATS,
+        sql="""
+            SELECT e.skill_id, e.need_id, e.effectiveness
+            FROM SkillTreatsNeed e
+            WHERE (e.skill_id > @after
+                   OR (e.skill_id = @after AND e.need_id > @after_to)) {biome_filter}
+            ORDER BY e.skill_id, e.need_id
+            LIMIT @limit
+        """,
+        biome_filter=(
+            "AND " + _SKILL_IN_BIOME.format(skill_id="e.skill_id")
+            + "\n              AND " + _NEED_IN_BIOME.format(need_id="e.need_id")
+        ),
+        key_columns=2,
+        build=_treats_edge
+    ),
+)
+
+# Node types an edge type connects (the stream only sends edges whose
+# endpoints it also sends)
+EDGE_ENDPOINTS: Dict[EdgeType, Tuple[NodeType, NodeType]] = {
+    EdgeType.HAS_SKILL: (NodeType.SURVIVOR, NodeType.SKILL),
+    EdgeType.HAS_NEED: (NodeType.SURVIVOR, NodeType.NEED),
+    EdgeType.TREATS: (NodeType.SKILL, NodeType.NEED),
+}
+
+PAGE_PARAM_TYPES = {
+    "after": param_types.STRING,
+    "after_to": param_types.STRING,
+    "biome": param_types.STRING,
+    "limit": param_types.INT64,
+}
+
+
+def encode_page_cursor(table_type: Any, key: Tuple[str, ...]) -> str:
+    raw = json.dumps([table_type.value, *key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_page_cursor(cursor: str) -> Tuple[str, Tuple[str, ...]]:
+    """Split a cursor into (table type value, last key); raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        table_type, *key = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise ValueError(f"Malformed graph cursor: {cursor!r}")
+    if not key or not all(isinstance(part, str) for part in (table_type, *key)):
+        raise ValueError(f"Malformed graph cursor: {cursor!r}")
+    return table_type, tuple(key)
+
+
+
+
+# =============================================================================
+# GQL RESULTS
+# =============================================================================
+
+# Label / type names -> enums. Covers both property graphs in setup_data:
+# singular labels (Survivor, HAS_SKILL) and table-name labels (Survivors,
+# SurvivorHasSkill).
+_NODE_TYPES: Dict[str, NodeType] = {
+    **{node_type.value.lower(): node_type for node_type in NodeType},
+    **{node_type.value.lower() + "s": node_type for node_type in NodeType},
+    **{node_type.name.lower(): node_type for node_type in NodeType},
+}
+_EDGE_TYPES: Dict[str, EdgeType] = {
+    **{edge_type.value.lower(): edge_type for edge_type in EdgeType},
+    "survivorhasskill": EdgeType.HAS_SKILL,
+    "survivorhasneed": EdgeType.HAS_NEED,
+    "survivorfoundresource": EdgeType.FOUND_RESOURCE,
+    "found": EdgeType.FOUND_RESOURCE,
+    "survivorinbiome": EdgeType.IN_BIOME,
+    "survivorcanhelp": EdgeType.CAN_HELP,
+    "skilltreatsneed": EdgeType.TREATS,
+}
+
+# Node id property per type (the node table's key, same ids as /api/graph)
+_NODE_KEYS: Dict[NodeType, str] = {
+    NodeType.SURVIVOR: "survivor_id",
+    NodeType.SKILL: "skill_id",
+    NodeType.NEED: "need_id",
+    NodeType.RESOURCE: "resource_id",
+    NodeType.BIOME: "biome_id",
+}
+
+
+def _graph_elements(value: Any) -> Iterator[Dict[str, Any]]:
+    """Graph elements ({"kind": "node" | "edge", ...}) in a TO_JSON column value."""
+    if isinstance(value, JsonObject):
+        value = json.loads(value.serialize() or "null")
+    elif isinstance(value, str) and value[:1] in ("{", "["):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return
+    
+    if isinstance(value, dict):
+        if value.get("kind") in ("node", "edge"):
+            yield value
+    elif isinstance(value, (list, tuple)):
+        # Paths and ARRAY<JSON>
+        for item in value:
+            yield from _graph_elements(item)
+
+
+def _node_fields(element: Dict[str, Any]) -> Dict[str, Any]:
+    """TO_JSON node -> the flat dict _parse_node reads."""
+    labels = element.get("labels") or [""]
+    properties = dict(element.get("properties") or {})
+    node_type = _NODE_TYPES.get(labels[0].lower())
+    
+    node_id = properties.pop(_NODE_KEYS.get(node_type, ""), None) or element.get("identifier", "")
+    label = properties.pop("name", None) or properties.pop("description", None) or ""
+    return {**properties, "id": node_id, "type": labels[0], "label": label}
+
+
+def _edge_fields(element: Dict[str, Any], source: str, target: str) -> Dict[str, Any]:
+    """TO_JSON edge -> the flat dict _parse_edge reads (endpoints passed separately)."""
+    labels = element.get("labels") or [""]
+    properties = element.get("properties") or {}
+    return {**properties, "id": f"{source}-{target}", "type": labels[0]}
+
+
 class GraphService:
     def __init__(self, spanner: SpannerService):
         self.spanner = spanner
@@ -10,116 +343,277 @@ class GraphService:
         """
         Fetch all nodes and edges from the Spanner graph.
         Uses direct SQL queries for maximum compatibility.
+        
+        All six tables are read by one statement (an ARRAY subquery per
+        table), so the graph costs a single round-trip and every table is
+        read at the same timestamp. The result is shared process-wide
+        through graph_cache.
+        """
+        return (await self.get_graph_snapshot()).data
+
+    async def get_graph_snapshot(self) -> GraphSnapshot:
+        """
+        Cached full graph with its serialized JSON body and ETag.
+        Falls back to (uncached) mock data if the read fails.
         """
         try:
-            nodes_dict = {}
-            edges_list = []
-            
-            # Execute all queries in a single snapshot
-            with self.spanner.database.snapshot() as snapshot:
-                # Get survivors
-                survivor_query = "SELECT survivor_id, name, role, biome FROM Survivors LIMIT 100"
-                survivor_results = list(snapshot.execute_sql(survivor_query))
-                
-                for row in survivor_results:
-                    survivor_id, name, role, biome = row
-                    nodes_dict[survivor_id] = Node(
-                        id=survivor_id,
-                        type=NodeType.SURVIVOR,
-                        label=name or "",
-                        properties={"role": role or ""},
-                        biome=biome or None
-                    )
-            
-            # Get skills in a new snapshot
-            with self.spanner.database.snapshot() as snapshot:
-                skill_query = "SELECT skill_id, name FROM Skills LIMIT 100"
-                skill_results = list(snapshot.execute_sql(skill_query))
-                
-                for row in skill_results:
-                    skill_id, name = row
-                    nodes_dict[skill_id] = Node(
-                        id=skill_id,
-                        type=NodeType.SKILL,
-                        label=name or "",
-                        properties={}
-                    )
-            
-            # Get needs
-            with self.spanner.database.snapshot() as snapshot:
-                need_query = "SELECT need_id, description FROM Needs LIMIT 100"
-                need_results = list(snapshot.execute_sql(need_query))
-                
-                for row in need_results:
-                    need_id, description = row
-                    nodes_dict[need_id] = Node(
-                        id=need_id,
-                        type=NodeType.NEED,
-                        label=description or "",
-                        properties={}
-                    )
-            
-            # Get edges: SurvivorHasSkill
-            with self.spanner.database.snapshot() as snapshot:
-                skill_edge_query = "SELECT survivor_id, skill_id, proficiency FROM SurvivorHasSkill LIMIT 100"
-                skill_edge_results = list(snapshot.execute_sql(skill_edge_query))
-                
-                for row in skill_edge_results:
-                    survivor_id, skill_id, proficiency = row
-                    edges_list.append(Edge(
-                        id=f"{survivor_id}-{skill_id}",
-                        source=survivor_id,
-                        target=skill_id,
-                        type=EdgeType.HAS_SKILL,
-                        properties={"proficiency": proficiency or ""}
-                    ))
-            
-            # Get edges: SurvivorHasNeed
-            with self.spanner.database.snapshot() as snapshot:
-                need_edge_query = "SELECT survivor_id, need_id, status FROM SurvivorHasNeed LIMIT 100"
-                need_edge_results = list(snapshot.execute_sql(need_edge_query))
-                
-                for row in need_edge_results:
-                    survivor_id, need_id, status = row
-                    edges_list.append(Edge(
-                        id=f"{survivor_id}-{need_id}",
-                        source=survivor_id,
-                        target=need_id,
-                        type=EdgeType.HAS_NEED,
-                        properties={"status": status or ""}
-                    ))
-            
-            # Get edges: SkillTreatsNeed
-            with self.spanner.database.snapshot() as snapshot:
-                treats_edge_query = "SELECT skill_id, need_id, effectiveness FROM SkillTreatsNeed LIMIT 100"
-                treats_edge_results = list(snapshot.execute_sql(treats_edge_query))
-                
-                for row in treats_edge_results:
-                    skill_id, need_id, effectiveness = row
-                    edges_list.append(Edge(
-                        id=f"{skill_id}-{need_id}",
-                        source=skill_id,
-                        target=need_id,
-                        type=EdgeType.TREATS,
-                        properties={"effectiveness": effectiveness or ""}
-                    ))
-            
-            return GraphData(nodes=list(nodes_dict.values()), edges=edges_list)
+            return graph_cache.get(self._read_full_graph)
             
         except Exception as e:
             print(f"Error fetching full graph: {e}")
             import traceback
             traceback.print_exc()
             # Return mock data as fallback
-            return self._get_mock_data()
+            return make_snapshot(self._get_mock_data())
+
+    async def get_graph_index(self) -> GraphIndex:
+        """Lookup index over the cached full graph (built once per snapshot)."""
+        return GraphIndex.for_graph(await self.get_full_graph())
+
+    async def get_complete_graph_index(self) -> Optional[GraphIndex]:
+        """
+        Lookup index over the cached full graph, only when that graph holds
+        the whole network.
+
+        None if the read failed (no mock fallback here) or any table hit
+        FULL_GRAPH_TABLE_LIMIT, i.e. the overview is truncated; callers
+        that need exact answers then query Spanner directly.
+        """
+        try:
+            snapshot = graph_cache.get(self._read_full_graph)
+        except Exception as e:
+            print(f"Graph index unavailable: {e}")
+            return None
+
+        index = GraphIndex.for_graph(snapshot.data)
+        if index.largest_table() >= FULL_GRAPH_TABLE_LIMIT:
+            return None
+        return index
+
+    def get_nodes_page(
+        self,
+        limit: int = 500,
+        cursor: Optional[str] = None,
+        node_types: Optional[Iterable[NodeType]] = None,
+        biome: Optional[str] = None
+    ) -> NodePage:
+        """Keyset page of nodes (survivors, then skills, then needs)."""
+        with self.spanner.database.snapshot() as snapshot:
+            nodes, next_cursor = self._read_page(
+                snapshot, NODE_TABLES, node_types, limit, cursor, biome
+            )
+        return NodePage(nodes=nodes, next_cursor=next_cursor)
+
+    def get_edges_page(
+        self,
+        limit: int = 500,
+        cursor: Optional[str] = None,
+        edge_types: Optional[Iterable[EdgeType]] = None,
+        biome: Optional[str] = None
+    ) -> EdgePage:
+        """Keyset page of edges (HAS_SKILL, then HAS_NEED, then TREATS)."""
+        with self.spanner.database.snapshot() as snapshot:
+            edges, next_cursor = self._read_page(
+                snapshot, EDGE_TABLES, edge_types, limit, cursor, biome
+            )
+        return EdgePage(edges=edges, next_cursor=next_cursor)
 
-    async def query_graph(self, gql_query: str) -> GraphData:
+    def stream_graph(
+        self,
+        node_types: Optional[Iterable[NodeType]] = None,
+        biome: Optional[str] = None,
+        page_size: int = 1000
+    ) -> Iterator[bytes]:
         """
-        Execute a custom query and return graph data.
-        For now, returns the full graph.
+        NDJSON graph: {"node": ...} lines, then {"edge": ...} lines, then
+        {"done": true, "nodes": n, "edges": m}.
+        
+        Nodes come first so a client can draw each edge as it arrives.
+        Every page is read at one pinned timestamp (a consistent graph)
+        in its own short-lived snapshot, so a session is held only while
+        a page is read, never while the client consumes it. One page is
+        in memory at a time.
         """
-        # TODO: Implement custom query parsing
-        return await self.get_full_graph()
+        node_types = set(node_types or [table.type for table in NODE_TABLES])
+        edge_types = [
+            edge_type for edge_type, (source, target) in EDGE_ENDPOINTS.items()
+            if source in node_types and target in node_types
+        ]
+        counts = {"node": 0, "edge": 0}
+        read_timestamp = datetime.now(timezone.utc)
+        
+        for kind, tables, types in (("node", NODE_TABLES, node_types),
+                                    ("edge", EDGE_TABLES, edge_types)):
+            cursor = None
+            while True:
+                with self.spanner.database.snapshot(read_timestamp=read_timestamp) as snapshot:
+                    items, cursor = self._read_page(
+                        snapshot, tables, types, page_size, cursor, biome
+                    )
+                if items:
+                    counts[kind] += len(items)
+                    yield b"".join(
+                        b'{"' + kind.encode() + b'":' + item.model_dump_json().encode("utf-8") + b"}\n"
+                        for item in items
+                    )
+                if cursor is None:
+                    break
+        
+        yield json.dumps({"done": True, "nodes": counts["node"], "edges": counts["edge"]}).encode() + b"\n"
+
+    def _read_page(
+        self,
+        snapshot,
+        tables: Tuple[_PageTable, ...],
+        types: Optional[Iterable[Any]],
+        limit: int,
+        cursor: Optional[str],
+        biome: Optional[str]
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        Up to `limit` rows after `cursor` across `tables` (in order),
+        restricted to `types`; returns (items, next_cursor or None).
+        """
+        wanted = {table.type for table in tables} if types is None else set(types)
+        
+        start_index, after = 0, ("", "")
+        if cursor:
+            table_type, key = decode_page_cursor(cursor)
+            positions = [i for i, table in enumerate(tables) if table.type.value == table_type]
+            if not positions:
+                raise ValueError(f"Graph cursor {cursor!r} is not for this listing")
+            start_index, after = positions[0], (key + ("",))[:2]
+        
+        items: List[Any] = []
+        last_cursor = None
+        for index in range(start_index, len(tables)):
+            table = tables[index]
+            if table.type not in wanted:
+                continue
+            remaining = limit - len(items)
+            if remaining <= 0:
+                # Page filled exactly by the previous table; resume after it
+                return items, last_cursor
+            
+            # Only the cursor's own table resumes mid-way
+            after_key = after if index == start_index else ("", "")
+            params = {"after": after_key[0], "limit": remaining + 1}
+            if table.key_columns == 2:
+                params["after_to"] = after_key[1]
+            sql = table.sql.format(biome_filter=table.biome_filter if biome else "")
+            if biome:
+                params["biome"] = biome
+            
+            rows = list(snapshot.execute_sql(
+                sql,
+                params=params,
+                param_types={name: PAGE_PARAM_TYPES[name] for name in params}
+            ))
+            page_rows = rows[:remaining]
+            items.extend(table.build(row) for row in page_rows)
+            if page_rows:
+                last_key = tuple(page_rows[-1][:table.key_columns])
+                last_cursor = encode_page_cursor(table.type, last_key)
+            if len(rows) > remaining:
+                return items, last_cursor
+        
+        return items, None
+
+    def _read_full_graph(self) -> GraphData:
+        """Run FULL_GRAPH_SQL in one read-only snapshot and build GraphData."""
+        nodes_dict = {}
+        edges_list = []
+        
+        with self.spanner.database.snapshot() as snapshot:
+            row = next(iter(snapshot.execute_sql(FULL_GRAPH_SQL)))
+        survivors, skills, needs, skill_edges, need_edges, treats_edges = \
+            (table or [] for table in row)
+        
+        for build, rows in ((_survivor_node, survivors), (_skill_node, skills), (_need_node, needs)):
+            for row in rows:
+                node = build(row)
+                nodes_dict[node.id] = node
+        
+        # Edges: SurvivorHasSkill, SurvivorHasNeed, SkillTreatsNeed
+        for build, rows in ((_has_skill_edge, skill_edges), (_has_need_edge, need_edges),
+                            (_treats_edge, treats_edges)):
+            edges_list.extend(build(row) for row in rows)
+        
+        return GraphData(nodes=list(nodes_dict.values()), edges=edges_list)
+
+    async def query_graph(self, gql_query: str) -> GraphQueryResponse:
+        """
+        Execute a custom GQL query and return the nodes and edges it returns.
+        
+        Graph elements are read from TO_JSON / SAFE_TO_JSON columns (single
+        elements or paths), or from flat rows with id/type[/source/target]
+        columns. Edges whose endpoints the query didn't return are dropped.
+        
+        Results are cached by normalized query text (graph_query_cache),
+        so a repeated query skips Spanner until the TTL passes or the
+        graph is written. The normalized text is only the cache key;
+        Spanner runs the query as given, in a read-only snapshot.
+        """
+        start = time.perf_counter()
+        key = normalize_gql(gql_query)
+        
+        data = graph_query_cache.get(key)
+        cached = data is not None
+        if data is None:
+            generation = graph_query_cache.generation
+            rows = await asyncio.to_thread(self.spanner.execute_gql, gql_query)
+            data = self._graph_from_rows(rows)
+            graph_query_cache.put(key, data, generation)
+        
+        return GraphQueryResponse(
+            data=data,
+            query_executed=gql_query,
+            execution_time_ms=(time.perf_counter() - start) * 1000,
+            cached=cached
+        )
+
+    def _graph_from_rows(self, rows: List[Dict[str, Any]]) -> GraphData:
+        """Build GraphData from execute_gql rows (see query_graph)."""
+        nodes: Dict[str, Node] = {}
+        edges: Dict[str, Edge] = {}
+        node_ids: Dict[str, str] = {}      # Spanner element identifier -> node id
+        graph_edges = []
+        
+        for row in rows:
+            if self._is_edge(row) or self._is_node(row):
+                elements = [row]
+            else:
+                elements = [element for value in row.values() for element in _graph_elements(value)]
+            
+            for element in elements:
+                kind = element.get("kind")
+                if kind == "edge":
+                    # Resolved once every node in the result is known
+                    graph_edges.append(element)
+                elif kind == "node":
+                    node = self._parse_node(_node_fields(element))
+                    if node:
+                        nodes[node.id] = node
+                        node_ids[element.get("identifier", "")] = node.id
+                elif self._is_edge(element):
+                    edge = self._parse_edge(element, {}, {})
+                    if edge:
+                        edges[edge.id] = edge
+                elif self._is_node(element):
+                    node = self._parse_node(element)
+                    if node:
+                        nodes[node.id] = node
+        
+        for element in graph_edges:
+            source = node_ids.get(element.get("source_node_identifier"))
+            target = node_ids.get(element.get("destination_node_identifier"))
+            if source is None or target is None:
+                continue
+            edge = self._parse_edge(_edge_fields(element, source, target), {"id": source}, {"id": target})
+            if edge:
+                edges[edge.id] = edge
+        
+        return GraphData(nodes=list(nodes.values()), edges=list(edges.values()))
 
     def _is_node(self, data: Any) -> bool:
         """Check if data represents a node."""
@@ -150,11 +644,8 @@ class GraphService:
             properties = {k: v for k, v in node_data.items() 
                          if k not in ['id', 'type', 'label', 'biome']}
             
-            # Convert string type to NodeType enum
-            try:
-                node_type_enum = NodeType(node_type.upper())
-            except ValueError:
-                node_type_enum = NodeType.SURVIVOR
+            # Convert type / label name to NodeType enum
+            node_type_enum = _NODE_TYPES.get(str(node_type).lower(), NodeType.SURVIVOR)
             
             return Node(
                 id=node_id,
@@ -183,11 +674,8 @@ class GraphService:
             properties = {k: v for k, v in edge_data.items() 
                          if k not in ['id', 'source', 'target', 'type']}
             
-            # Convert string type to EdgeType enum
-            try:
-                edge_type_enum = EdgeType(edge_type.upper())
-            except ValueError:
-                edge_type_enum = EdgeType.HAS_SKILL
+            # Convert type / label name to EdgeType enum
+            edge_type_enum = _EDGE_TYPES.get(str(edge_type).lower(), EdgeType.HAS_SKILL)
             
             return Edge(
                 id=edge_id,
@@ -8,12 +8,95 @@ Uses your existing Spanner setup with:
 - skill_embedding column in Skills table
 """
 
-from google.cloud import spanner
 from google.cloud.spanner_v1 import param_types
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple, Callable, Union, AsyncIterator
+from dataclasses import dataclass
 from enum import Enum
+import asyncio
 import json
+import re
+import sys
+import time
+
+from services.catalog_cache import CatalogCache
+from services.embedding_cache import EmbeddingCache
+from services.fusion import DEFAULT_RRF_K, FusionStrategy, fuse
+from services.graph_events import register_change_listener
+from services.index_gate import IndexGate
+from services.keyword_index import KeywordIndex
+from services.query_cache import QueryAnalysisCache
+from services.query_router import QueryRouter
+from services.result_window import ResultWindowCache, decode_cursor
+from services.search_metrics import stage_timer, traced_stage
+from services.search_results import SearchResult, SearchResults, SearchResultsBuilder
+from services.skill_vector_index import SkillHit, SkillVectorIndex
+from services.spanner_client import get_client, get_database
+
+
+# Query vectors are bound as ARRAY<FLOAT64> parameters
+EMBEDDING_PARAM_TYPE = param_types.Array(param_types.FLOAT64)
+
+# Batched query vectors: ARRAY<STRUCT<query_idx INT64, embedding ARRAY<FLOAT64>>>
+QUERY_VECTORS_PARAM_TYPE = param_types.Array(param_types.Struct([
+    param_types.StructField("query_idx", param_types.INT64),
+    param_types.StructField("embedding", EMBEDDING_PARAM_TYPE),
+]))
+
+# First @per_skill holders of one skill by name; _survivors_by_skill joins
+# one of these per skill with UNION ALL (SKILL_LOOKUP_CHUNK skills per query)
+SURVIVORS_FOR_SKILL_SQL = """
+            SELECT * FROM (
+                SELECT shs.skill_id, s.survivor_id, s.name, s.biome
+                FROM SurvivorHasSkill shs
+                JOIN Survivors s ON s.survivor_id = shs.survivor_id
+                WHERE shs.skill_id = @{param}
+                ORDER BY s.name
+                LIMIT @per_skill
+            )"""
+SKILL_LOOKUP_CHUNK = 16
+
+# Schema objects each optional index path needs (setup_data.py). An
+# InvalidArgument naming one of them means the index isn't there.
+FULLTEXT_INDEX_OBJECTS = (
+    "SkillsSearchIndex", "SurvivorsBiomeSearchIndex",
+    "name_tokens", "category_tokens", "description_tokens", "biome_tokens",
+)
+ANN_INDEX_OBJECTS = ("SkillsEmbeddingIndex",)
+
+# SEARCH() terms: word characters only, so no keyword can inject syntax
+SEARCH_WORD_RE = re.compile(r"\w+")
+
+
+# Shared prompt sections for single and batch query analysis
+SEARCH_METHODS_GUIDE = """## Search Methods Available
+
+1. KEYWORD: AI extracts keywords → SQL LIKE/IN search
+   Best for: Specific filters, exact categories, location-based queries
+   Example: "Find medical skills in forest" → keywords=["medical"], biome="forest"
+
+2. RAG: Embed query → Vector similarity search  
+   Best for: Semantic similarity, "find similar to X", open-ended queries
+   Example: "Find skills similar to first aid" → needs embedding comparison
+
+3. HYBRID: Run both methods, merge results
+   Best for: Complex queries that benefit from both approaches
+   Example: "Find someone with healing abilities in the mountain area"
+
+4. EXACT: Direct match (handled separately, don't recommend this)
+"""
+
+DECISION_GUIDELINES = """## Decision Guidelines
+- "similar to", "like", "related to" → RAG
+- Specific biome/location mentioned → KEYWORD (can filter exactly)
+- Category mentioned (medical, combat) → KEYWORD  
+- Vague/abstract concepts → RAG
+- Multiple criteria → HYBRID
+- Simple lookup → KEYWORD
+"""
 
 
 class SearchMethod(Enum):
@@ -24,21 +107,17 @@ class SearchMethod(Enum):
     EXACT = "exact"          # Direct exact match (fastest)
 
 
-@dataclass
-class SearchResult:
-    """Unified search result from any method"""
-    id: str
-    name: str
-    type: str                          # "survivor", "skill", "resource"
-    score: float                       # 0-1, higher = more relevant
-    method: SearchMethod               # Which method found this
-    details: Dict[str, Any] = field(default_factory=dict)
-    
-    def __hash__(self):
-        return hash(self.id)
-    
-    def __eq__(self, other):
-        return self.id == other.id
+class KeywordEngine(Enum):
+    """Which engine runs keyword search"""
+    FULLTEXT = "fulltext"    # Spanner search index: SEARCH()/SCORE()
+    LIKE = "like"            # SQL LIKE scans (fallback, no index needed)
+    BM25 = "bm25"            # In-memory BM25 index, no Spanner round-trip
+
+
+class VectorSearchMode(Enum):
+    """How skill embeddings are ranked for RAG"""
+    EXACT = "exact"          # COSINE_DISTANCE (local index or full scan)
+    ANN = "ann"              # Spanner vector index, APPROX_COSINE_DISTANCE
 
 
 @dataclass
@@ -90,22 +169,145 @@ class HybridSearchService:
         self,
         project_id: str = "neon-emitter-458622-e3",
         instance_id: str = "survivor-network",
-        database_id: str = "survivor-db"
+        database_id: str = "survivor-db",
+        analysis_cache_size: int = 512,
+        analysis_cache_ttl: float = 900.0,
+        semantic_cache: bool = False,
+        search_workers: int = 8,
+        leg_timeout: float = 10.0,
+        speculative_rag: bool = True,
+        embedding_cache_size: int = 2048,
+        embedding_cache_path: Optional[str] = None,
+        vector_index: bool = True,
+        max_staleness_seconds: float = 10.0,
+        session_pool_size: Optional[int] = None,
+        keyword_engine: KeywordEngine = KeywordEngine.FULLTEXT,
+        rule_router: bool = True,
+        catalog_ttl: float = 300.0,
+        prompt_skill_tokens: int = 400,
+        fusion: FusionStrategy = FusionStrategy.RRF,
+        fusion_weights: Optional[Dict[str, float]] = None,
+        rrf_k: int = DEFAULT_RRF_K,
+        page_window_factor: int = 3,
+        page_cache_size: int = 256,
+        page_cache_ttl: float = 600.0,
+        vector_search: VectorSearchMode = VectorSearchMode.EXACT,
+        ann_leaves_to_search: int = 10,
+        index_retry_seconds: float = 30.0,
+        database: Optional[Any] = None
     ):
         self.project_id = project_id
-        self.client = spanner.Client(project=project_id)
-        self.instance = self.client.instance(instance_id)
-        self.database = self.instance.database(database_id)
+        if database is not None:
+            # Injected database (e.g. the benchmark stand-in); no client
+            self.client = None
+            self.instance = None
+            self.database = database
+        else:
+            # Process-wide client and session pool shared with the other services
+            self.client = get_client(project_id)
+            self.instance = self.client.instance(instance_id)
+            self.database = get_database(
+                project_id, instance_id, database_id, pool_size=session_pool_size
+            )
+        
+        # All search reads are read-only snapshots with bounded staleness,
+        # so they take no locks and never contend with ingest writes
+        self.max_staleness = timedelta(seconds=max_staleness_seconds)
+        self._batch_read_timestamp: ContextVar[Optional[datetime]] = \
+            ContextVar(f"hybrid_search_read_timestamp_{id(self)}", default=None)
+        
+        # Cache for AI query analyses (skips Gemini on repeat queries)
+        self._analysis_cache = QueryAnalysisCache(
+            max_entries=analysis_cache_size,
+            ttl_seconds=analysis_cache_ttl
+        )
+        self.semantic_cache = semantic_cache
+        
+        # Deterministic pre-router: clear-cut queries skip Gemini entirely
+        self._router: Optional[QueryRouter] = QueryRouter() if rule_router else None
+        
+        # Known skills/categories/biomes. Re-checked in the background every
+        # catalog_ttl seconds; the analyzer prompt gets a relevance-picked
+        # skill sample of about prompt_skill_tokens tokens.
+        self._catalog = CatalogCache(
+            self._run_read,
+            ttl_seconds=catalog_ttl,
+            on_change=self._on_catalog_change
+        )
+        self.prompt_skill_tokens = prompt_skill_tokens
+        
+        # Cache for query/skill-name embeddings (skips TextEmbeddings on repeats)
+        self._embeddings = EmbeddingCache(
+            embed_fn=self._embed_texts,
+            max_entries=embedding_cache_size,
+            disk_path=embedding_cache_path
+        )
+        
+        # Worker pool for running search legs concurrently
+        self._executor = ThreadPoolExecutor(
+            max_workers=search_workers,
+            thread_name_prefix="hybrid-search"
+        )
+        self.leg_timeout = leg_timeout
+        self.speculative_rag = speculative_rag
+        
+        # Default result fusion (overridable per hybrid_search call)
+        self.fusion = fusion
+        self.fusion_weights = fusion_weights
+        self.rrf_k = rrf_k
+        
+        # Cursor pagination: the first page fetches exactly one page of
+        # survivors; later pages are slices of the cached window, which is
+        # re-fetched larger (page_window_factor pages ahead, at least
+        # doubling) only when a cursor asks for results past its end
+        self.page_window_factor = max(1, page_window_factor)
+        self._result_windows = ResultWindowCache(
+            max_entries=page_cache_size,
+            ttl_seconds=page_cache_ttl
+        )
+        
+        # Keyword engine; full-text falls back to LIKE for good if the
+        # search index is missing (see setup_data.py --search-indexes),
+        # and for index_retry_seconds after any other error
+        self.keyword_engine = keyword_engine
+        self._fulltext = IndexGate(
+            "Full-text keyword search", FULLTEXT_INDEX_OBJECTS, index_retry_seconds
+        )
         
-        # Cache for known values
-        self._known_skills: Optional[List[str]] = None
-        self._known_categories: Optional[List[str]] = None
-        self._known_biomes: Optional[List[str]] = None
+        # Local BM25 index for the BM25 engine. Loads in the background
+        # (LIKE is used until it's ready) and re-reads only the survivors
+        # touched by each save_extraction_result.
+        self._keyword_index: Optional[KeywordIndex] = None
+        if keyword_engine == KeywordEngine.BM25:
+            self._keyword_index = KeywordIndex(self.database)
+            self._executor.submit(self._refresh_keyword_index, None)
+        
+        # Exact or approximate (Spanner vector index, see setup_data.py
+        # --vector-index) skill ranking; overridable per call. ANN falls
+        # back to exact like full-text falls back to LIKE.
+        self.vector_search = vector_search
+        self.ann_leaves_to_search = ann_leaves_to_search
+        self._ann = IndexGate(
+            "ANN vector search", ANN_INDEX_OBJECTS, index_retry_seconds
+        )
+        
+        # Local skill-embedding index for RAG ranking without a Spanner scan.
+        # Loads in the background; searches use SQL until it's ready.
+        self._vector_index: Optional[SkillVectorIndex] = None
+        if vector_index:
+            self._vector_index = SkillVectorIndex(self.database)
+            self._vector_index.ensure_fresh(self._executor)
+        
+        # Committed writes refresh the local indexes instead of waiting
+        # for their timers
+        if self._keyword_index is not None or self._vector_index is not None:
+            register_change_listener(self._on_graph_change)
     
     # =========================================================================
     # QUERY ANALYSIS - Determine best search method
     # =========================================================================
     
+    @traced_stage("analyze")
     def analyze_query(self, query: str) -> QueryAnalysis:
         """
         Use AI to analyze query and determine optimal search strategy.
@@ -115,10 +317,25 @@ class HybridSearchService:
         - Does query ask for "similar" things? → RAG is better
         - Is it open-ended semantic? → RAG is better
         - Does it need exact matches? → Keyword is better
+        
+        Results are cached by normalized query text; a cache hit skips
+        the Gemini call entirely. Queries the rule router can resolve
+        (known biome/category/skill, "similar to") skip it too.
         """
         
-        # Load known values for context
-        self._load_known_values()
+        # Load known values for context (also invalidates stale analyses)
+        catalog = self._load_known_values()
+        
+        # Check the analysis cache first
+        query_embedding = self._embed_text(query) if self.semantic_cache else None
+        cached = self._analysis_cache.get(query, embedding=query_embedding)
+        if cached is not None:
+            return cached
+        
+        # Then the rule router
+        routed = self._route(query)
+        if routed is not None:
+            return routed
         
         prompt = f"""You are a search strategy optimizer. Analyze this query and determine 
 the best search approach.
@@ -127,26 +344,11 @@ the best search approach.
 "{query}"
 
 ## Available Database Values
-Skills (sample): {json.dumps(self._known_skills[:30] if self._known_skills else [])}
-Categories: {json.dumps(self._known_categories or [])}
-Biomes: {json.dumps(self._known_biomes or [])}
-
-## Search Methods Available
-
-1. KEYWORD: AI extracts keywords → SQL LIKE/IN search
-   Best for: Specific filters, exact categories, location-based queries
-   Example: "Find medical skills in forest" → keywords=["medical"], biome="forest"
-
-2. RAG: Embed query → Vector similarity search  
-   Best for: Semantic similarity, "find similar to X", open-ended queries
-   Example: "Find skills similar to first aid" → needs embedding comparison
-
-3. HYBRID: Run both methods, merge results
-   Best for: Complex queries that benefit from both approaches
-   Example: "Find someone with healing abilities in the mountain area"
-
-4. EXACT: Direct match (handled separately, don't recommend this)
+Skills (sample): {json.dumps(self._catalog.skill_sample(query, self.prompt_skill_tokens))}
+Categories: {json.dumps(list(catalog.categories))}
+Biomes: {json.dumps(list(catalog.biomes))}
 
+{SEARCH_METHODS_GUIDE}
 ## Output Format (JSON only, no markdown):
 {{
     "recommended_method": "keyword" | "rag" | "hybrid",
@@ -159,78 +361,456 @@ Biomes: {json.dumps(self._known_biomes or [])}
     "reasoning": "Brief explanation of why this method"
 }}
 
-## Decision Guidelines
-- "similar to", "like", "related to" → RAG
-- Specific biome/location mentioned → KEYWORD (can filter exactly)
-- Category mentioned (medical, combat) → KEYWORD  
-- Vague/abstract concepts → RAG
-- Multiple criteria → HYBRID
-- Simple lookup → KEYWORD
-
+{DECISION_GUIDELINES}
 Analyze the query:"""
 
         result = self._call_gemini(prompt)
         
         try:
-            # Parse JSON response
-            clean_json = result.strip()
-            if clean_json.startswith("```"):
-                lines = clean_json.split("\n")
-                clean_json = "\n".join(lines[1:-1])
+            parsed = json.loads(self._strip_json_fence(result))
+            analysis = self._analysis_from_dict(query, parsed)
             
-            parsed = json.loads(clean_json)
+            # Only successful parses are cached; fallbacks retry next time
+            self._analysis_cache.put(query, analysis, embedding=query_embedding)
             
-            method_map = {
-                "keyword": SearchMethod.KEYWORD,
-                "rag": SearchMethod.RAG,
-                "hybrid": SearchMethod.HYBRID
-            }
-            
-            return QueryAnalysis(
-                original_query=query,
-                recommended_method=method_map.get(
-                    parsed.get("recommended_method", "hybrid"), 
-                    SearchMethod.HYBRID
-                ),
-                keywords=parsed.get("keywords", []),
-                categories=parsed.get("categories", []),
-                biome_filter=parsed.get("biome_filter"),
-                needs_similarity_ranking=parsed.get("needs_similarity_ranking", False),
-                has_specific_filters=parsed.get("has_specific_filters", False),
-                confidence=parsed.get("confidence", 0.5),
-                reasoning=parsed.get("reasoning", "")
-            )
+            return analysis
             
-        except (json.JSONDecodeError, KeyError) as e:
+        except (json.JSONDecodeError, KeyError, AttributeError) as e:
             # Fallback to hybrid
-            return QueryAnalysis(
-                original_query=query,
-                recommended_method=SearchMethod.HYBRID,
-                keywords=query.lower().split()[:5],
-                categories=[],
-                biome_filter=None,
-                needs_similarity_ranking=True,
-                has_specific_filters=False,
-                confidence=0.3,
-                reasoning=f"Fallback to hybrid due to parsing error: {e}"
+            return self._fallback_analysis(
+                query, f"Fallback to hybrid due to parsing error: {e}"
             )
     
+    @traced_stage("analyze")
+    def analyze_queries(self, queries: List[str]) -> List[QueryAnalysis]:
+        """
+        Analyze many queries with a single Gemini call.
+        
+        Cached analyses are reused; only the misses go into one batched
+        prompt. Queries the model doesn't answer fall back to hybrid.
+        """
+        catalog = self._load_known_values()
+        
+        analyses: List[Optional[QueryAnalysis]] = [
+            self._analysis_cache.get(q) or self._route(q) for q in queries
+        ]
+        pending = [i for i, a in enumerate(analyses) if a is None]
+        if not pending:
+            return analyses
+        
+        numbered = "\n".join(f'{n}. "{queries[i]}"' for n, i in enumerate(pending))
+        skill_sample = self._catalog.skill_sample(
+            " ".join(queries[i] for i in pending),
+            self.prompt_skill_tokens * 2
+        )
+        
+        prompt = f"""You are a search strategy optimizer. Analyze EACH of these queries and
+determine the best search approach for each one independently.
+
+## User Queries
+{numbered}
+
+## Available Database Values
+Skills (sample): {json.dumps(skill_sample)}
+Categories: {json.dumps(list(catalog.categories))}
+Biomes: {json.dumps(list(catalog.biomes))}
+
+{SEARCH_METHODS_GUIDE}
+## Output Format (JSON array only, no markdown, one object per query):
+[
+    {{
+        "index": 0,
+        "recommended_method": "keyword" | "rag" | "hybrid",
+        "keywords": ["term1", "term2"],
+        "categories": ["cat1"],
+        "biome_filter": "forest" | null,
+        "needs_similarity_ranking": true/false,
+        "has_specific_filters": true/false,
+        "confidence": 0.0-1.0,
+        "reasoning": "Brief explanation of why this method"
+    }}
+]
+
+{DECISION_GUIDELINES}
+Analyze the queries:"""
+        
+        result = self._call_gemini(prompt)
+        
+        parsed_by_index: Dict[int, Dict[str, Any]] = {}
+        item_errors: Dict[int, Exception] = {}
+        error: Optional[Exception] = None
+        try:
+            parsed = json.loads(self._strip_json_fence(result))
+            if not isinstance(parsed, list):
+                raise ValueError(f"expected a JSON array, got {type(parsed).__name__}")
+        except (json.JSONDecodeError, TypeError, ValueError) as e:
+            error, parsed = e, []
+        
+        # Each item is checked on its own; a malformed one only costs its query
+        for n, item in enumerate(parsed):
+            try:
+                index = self._check_batch_item(item, n, len(pending))
+            except (TypeError, ValueError) as e:
+                print(f"Skipping batch analysis item {n}: {e}")
+                index = item.get("index", n) if isinstance(item, dict) else n
+                if isinstance(index, int):
+                    item_errors.setdefault(index, e)
+                continue
+            parsed_by_index.setdefault(index, item)
+        
+        for n, i in enumerate(pending):
+            item = parsed_by_index.get(n)
+            if item is None:
+                reason = error or item_errors.get(n)
+                analyses[i] = self._fallback_analysis(
+                    queries[i],
+                    f"Fallback to hybrid due to parsing error: {reason}" if reason
+                    else "Fallback to hybrid: query missing from batch analysis"
+                )
+                continue
+            analyses[i] = self._analysis_from_dict(queries[i], item)
+            self._analysis_cache.put(queries[i], analyses[i])
+        
+        return analyses
+    
+    def _route(self, query: str) -> Optional[QueryAnalysis]:
+        """Rule-router analysis, or None when the query needs the LLM."""
+        if self._router is None:
+            return None
+        routed = self._router.route(query)
+        return self._analysis_from_dict(query, routed) if routed else None
+    
+    @staticmethod
+    def _strip_json_fence(result: str) -> str:
+        """Strip a ```json markdown fence from a model response."""
+        clean_json = (result or "").strip()
+        if clean_json.startswith("```"):
+            lines = clean_json.split("\n")
+            clean_json = "\n".join(lines[1:-1])
+        return clean_json
+    
+    @staticmethod
+    def _check_batch_item(item: Any, position: int, count: int) -> int:
+        """
+        Validate one object of a batch analysis answer and return the
+        query index it answers; raises TypeError / ValueError otherwise.
+        """
+        if not isinstance(item, dict):
+            raise TypeError(f"expected an object, got {type(item).__name__}")
+        index = item.get("index", position)
+        if not isinstance(index, int) or isinstance(index, bool) or not 0 <= index < count:
+            raise ValueError(f"index {index!r} is not a query number")
+        if not isinstance(item.get("recommended_method", "hybrid"), str):
+            raise TypeError("recommended_method must be a string")
+        for key in ("keywords", "categories"):
+            values = item.get(key, [])
+            if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+                raise TypeError(f"{key} must be a list of strings")
+        if not isinstance(item.get("biome_filter"), (str, type(None))):
+            raise TypeError("biome_filter must be a string or null")
+        confidence = item.get("confidence", 0.5)
+        if not isinstance(confidence, (int, float)) or isinstance(confidence, bool):
+            raise TypeError("confidence must be a number")
+        return index
+    
+    @staticmethod
+    def _analysis_from_dict(query: str, parsed: Dict[str, Any]) -> QueryAnalysis:
+        """Build a QueryAnalysis from the model's parsed JSON."""
+        method_map = {
+            "keyword": SearchMethod.KEYWORD,
+            "rag": SearchMethod.RAG,
+            "hybrid": SearchMethod.HYBRID
+        }
+        
+        return QueryAnalysis(
+            original_query=query,
+            recommended_method=method_map.get(
+                parsed.get("recommended_method", "hybrid"), 
+                SearchMethod.HYBRID
+            ),
+            keywords=parsed.get("keywords", []),
+            categories=parsed.get("categories", []),
+            biome_filter=parsed.get("biome_filter"),
+            needs_similarity_ranking=parsed.get("needs_similarity_ranking", False),
+            has_specific_filters=parsed.get("has_specific_filters", False),
+            confidence=parsed.get("confidence", 0.5),
+            reasoning=parsed.get("reasoning", "")
+        )
+    
+    @staticmethod
+    def _fallback_analysis(query: str, reasoning: str) -> QueryAnalysis:
+        """Hybrid analysis used when the model's answer can't be parsed."""
+        return QueryAnalysis(
+            original_query=query,
+            recommended_method=SearchMethod.HYBRID,
+            keywords=query.lower().split()[:5],
+            categories=[],
+            biome_filter=None,
+            needs_similarity_ranking=True,
+            has_specific_filters=False,
+            confidence=0.3,
+            reasoning=reasoning
+        )
+    
+    @staticmethod
+    def _forced_rag_analysis(query: str) -> QueryAnalysis:
+        """Analysis stub for forced RAG searches (no Gemini call needed)."""
+        return QueryAnalysis(
+            original_query=query,
+            recommended_method=SearchMethod.RAG,
+            keywords=[],
+            categories=[],
+            biome_filter=None,
+            needs_similarity_ranking=True,
+            has_specific_filters=False,
+            confidence=1.0,
+            reasoning="Forced RAG search (Optimization: Skipped AI Analysis)"
+        )
+    
     # =========================================================================
     # KEYWORD SEARCH - AI-Interpreted
     # =========================================================================
     
+    @traced_stage("keyword")
     def keyword_search(
         self,
         analysis: QueryAnalysis,
-        limit: int = 10
-    ) -> List[SearchResult]:
+        limit: int = 10,
+        engine: Optional[KeywordEngine] = None
+    ) -> SearchResults:
         """
         Perform keyword-based search using AI-extracted terms.
         
-        Uses traditional SQL with LIKE clauses - no embeddings needed.
+        Engines:
+        - FULLTEXT: Spanner search index with SEARCH()/SCORE(); survivors
+          are scored by real text relevance
+        - LIKE: traditional SQL with LIKE clauses (fallback)
+        - BM25: in-memory inverted index, no database round-trip
+        
+        No embeddings needed for any of them.
+        
+        Args:
+            analysis: Query analysis with keywords/categories/biome
+            limit: Max survivors to return
+            engine: Override the service's keyword engine
         """
+        engine = engine or self.keyword_engine
         
-        results = []
+        if engine == KeywordEngine.BM25 and self._keyword_index is not None \
+                and self._keyword_index.ready:
+            return self._bm25_keyword_search(analysis, limit)
+        
+        # Full-text needs search terms; filters-only queries (or keywords
+        # with no word characters left) use LIKE
+        if engine == KeywordEngine.FULLTEXT and self._fulltext.available:
+            terms = self._search_terms(analysis.keywords[:10])
+            if terms:
+                try:
+                    return self._fulltext_keyword_search(analysis, terms, limit)
+                except Exception as e:
+                    self._fulltext.failed(e)
+        
+        return self._like_keyword_search(analysis, limit)
+    
+    def _fulltext_keyword_search(
+        self,
+        analysis: QueryAnalysis,
+        terms: str,
+        limit: int = 10
+    ) -> SearchResults:
+        """
+        Keyword search through the Skills/Survivors search indexes.
+        
+        Each survivor's score is the summed SCORE() of its matching skills
+        (name matches weighted double), normalized to 0-1 against the best
+        survivor in the result set.
+        """
+        
+        builder = SearchResultsBuilder()
+        
+        params: Dict[str, Any] = {"terms": terms}
+        param_types_dict: Dict[str, Any] = {"terms": param_types.STRING}
+        conditions = [
+            "(SEARCH(sk.name_tokens, @terms) "
+            "OR SEARCH(sk.category_tokens, @terms) "
+            "OR SEARCH(sk.description_tokens, @terms))"
+        ]
+        
+        # Category filter
+        if analysis.categories:
+            conditions.append("LOWER(sk.category) IN UNNEST(@categories)")
+            params["categories"] = [c.lower() for c in analysis.categories]
+            param_types_dict["categories"] = param_types.Array(param_types.STRING)
+        
+        # Biome filter (substring match if it has no searchable words)
+        biome_terms = self._search_terms([analysis.biome_filter or ""])
+        if biome_terms:
+            conditions.append("SEARCH(s.biome_tokens, @biome)")
+            params["biome"] = biome_terms
+            param_types_dict["biome"] = param_types.STRING
+        elif analysis.biome_filter:
+            conditions.append("LOWER(s.biome) LIKE @biome")
+            params["biome"] = f"%{analysis.biome_filter.lower()}%"
+            param_types_dict["biome"] = param_types.STRING
+        
+        # LIMIT applies to survivors (ranked by summed relevance), not
+        # skill rows, so `limit` survivors come back with all their matches
+        sql = f"""
+            WITH matches AS (
+                SELECT
+                    s.survivor_id,
+                    s.name AS survivor_name,
+                    s.biome,
+                    sk.skill_id,
+                    sk.name AS skill_name,
+                    sk.category,
+                    2 * SCORE(sk.name_tokens, @terms)
+                        + SCORE(sk.category_tokens, @terms)
+                        + SCORE(sk.description_tokens, @terms) AS relevance
+                FROM Skills sk
+                JOIN SurvivorHasSkill shs ON shs.skill_id = sk.skill_id
+                JOIN Survivors s ON s.survivor_id = shs.survivor_id
+                WHERE {" AND ".join(conditions)}
+            ),
+            top_survivors AS (
+                SELECT survivor_id, SUM(relevance) AS total_relevance
+                FROM matches
+                GROUP BY survivor_id
+                ORDER BY total_relevance DESC, survivor_id
+                LIMIT @limit
+            )
+            SELECT
+                m.survivor_id, m.survivor_name, m.biome,
+                m.skill_id, m.skill_name, m.category, m.relevance
+            FROM matches m
+            JOIN top_survivors t ON t.survivor_id = m.survivor_id
+            ORDER BY t.total_relevance DESC, m.survivor_id, m.relevance DESC
+        """
+        
+        params["limit"] = limit
+        param_types_dict["limit"] = param_types.INT64
+        
+        def run_query(snapshot):
+            rows = snapshot.execute_sql(
+                sql, params=params, param_types=param_types_dict
+            )
+            
+            # Group by survivor, summing skill relevance
+            survivor_map = {}
+            for row in rows:
+                surv_id, surv_name, biome, skill_id, skill_name, category, relevance = row
+                
+                if surv_id not in survivor_map:
+                    survivor_map[surv_id] = {
+                        "name": surv_name,
+                        "biome": biome,
+                        "relevance": 0.0,
+                        "skills": []
+                    }
+                survivor_map[surv_id]["relevance"] += float(relevance or 0.0)
+                survivor_map[surv_id]["skills"].append(
+                    (skill_id, skill_name, category, float(relevance or 0.0), None)
+                )
+            
+            best = max((d["relevance"] for d in survivor_map.values()), default=0.0)
+            
+            # Convert to results
+            for surv_id, data in survivor_map.items():
+                score = data["relevance"] / best if best > 0 else 0.0
+                
+                builder.add(
+                    surv_id, data["name"], score, SearchMethod.KEYWORD,
+                    biome=data["biome"],
+                    skills=data["skills"],
+                    match_count=len(data["skills"]),
+                    relevance=data["relevance"]
+                )
+        
+        self._run_read(run_query)
+        
+        # Sort by score
+        return builder.build().sorted_by_score()
+    
+    def _bm25_keyword_search(
+        self,
+        analysis: QueryAnalysis,
+        limit: int = 10
+    ) -> SearchResults:
+        """
+        Keyword search against the local BM25 index.
+        
+        Survivor documents cover their own fields plus skill and need
+        text; scores are normalized to 0-1 against the best hit.
+        """
+        hits = self._keyword_index.search(
+            analysis.keywords[:10],
+            limit=limit,
+            categories=analysis.categories,
+            biome_filter=analysis.biome_filter
+        )
+        
+        best = max((hit.score for hit in hits), default=0.0)
+        builder = SearchResultsBuilder()
+        for hit in hits:
+            builder.add(
+                hit.survivor_id, hit.name, hit.score / best if best > 0 else 0.0,
+                SearchMethod.KEYWORD,
+                biome=hit.biome,
+                skills=[
+                    (skill["id"], skill["name"], skill["category"], None, None)
+                    for skill in hit.matching_skills
+                ],
+                match_count=len(hit.matching_skills),
+                relevance=hit.score
+            )
+        return builder.build()
+    
+    def _refresh_keyword_index(self, survivor_ids: Optional[List[str]]) -> None:
+        """Load (None) or incrementally refresh the BM25 index."""
+        try:
+            self._keyword_index.refresh(survivor_ids)
+        except Exception as e:
+            print(f"Keyword index refresh failed: {e}")
+    
+    def _on_graph_change(self, change: Dict[str, Any]) -> None:
+        """
+        graph_events listener: refresh touched survivors in the BM25 index
+        and re-check the skill vector index, off the writer's thread.
+        """
+        survivor_ids = change.get("survivor_ids") or []
+        if survivor_ids and self._keyword_index is not None:
+            self._executor.submit(self._refresh_keyword_index, list(survivor_ids))
+        if self._vector_index is not None:
+            # Incremental: one id listing, embeddings only for new skills
+            self._vector_index.invalidate()
+            self._vector_index.ensure_fresh(self._executor)
+    
+    @staticmethod
+    def _search_terms(keywords: List[str]) -> str:
+        """
+        Build a SEARCH() query matching any keyword.
+        
+        Each keyword is reduced to its lowercase word characters, so quotes,
+        operators and stray punctuation never reach the query syntax.
+        Multi-word keywords become quoted phrases: ["First-aid", "medical!"]
+        → '"first aid" OR medical'. Empty if no keyword has a word left.
+        """
+        terms = []
+        for kw in keywords:
+            words = SEARCH_WORD_RE.findall(kw.lower())
+            if not words:
+                continue
+            terms.append(words[0] if len(words) == 1 else '"' + " ".join(words) + '"')
+        return " OR ".join(terms)
+    
+    def _like_keyword_search(
+        self,
+        analysis: QueryAnalysis,
+        limit: int = 10
+    ) -> SearchResults:
+        """Keyword search with SQL LIKE clauses (no index required)."""
+        
+        builder = SearchResultsBuilder()
         
         # Build SQL dynamically
         conditions = []
@@ -272,27 +852,42 @@ Analyze the query:"""
         
         where_clause = " AND ".join(conditions) if conditions else "1=1"
         
+        # LIMIT applies to survivors (most matching skills first), not
+        # joined skill rows, so grouping can't return fewer than asked for
         sql = f"""
+            WITH matches AS (
+                SELECT
+                    s.survivor_id,
+                    s.name AS survivor_name,
+                    s.biome,
+                    sk.skill_id,
+                    sk.name AS skill_name,
+                    sk.category
+                FROM Survivors s
+                JOIN SurvivorHasSkill shs ON s.survivor_id = shs.survivor_id
+                JOIN Skills sk ON shs.skill_id = sk.skill_id
+                WHERE {where_clause}
+            ),
+            top_survivors AS (
+                SELECT survivor_id, survivor_name, COUNT(*) AS match_count
+                FROM matches
+                GROUP BY survivor_id, survivor_name
+                ORDER BY match_count DESC, survivor_name, survivor_id
+                LIMIT @limit
+            )
             SELECT
-                s.survivor_id,
-                s.name AS survivor_name,
-                s.biome,
-                sk.skill_id,
-                sk.name AS skill_name,
-                sk.category
-            FROM Survivors s
-            JOIN SurvivorHasSkill shs ON s.survivor_id = shs.survivor_id
-            JOIN Skills sk ON shs.skill_id = sk.skill_id
-            WHERE {where_clause}
-            ORDER BY s.name, sk.name
-            LIMIT @limit
+                m.survivor_id, m.survivor_name, m.biome,
+                m.skill_id, m.skill_name, m.category
+            FROM matches m
+            JOIN top_survivors t ON t.survivor_id = m.survivor_id
+            ORDER BY t.match_count DESC, m.survivor_name, m.survivor_id, m.skill_name
         """
         
         params["limit"] = limit
         param_types_dict["limit"] = param_types.INT64
         
-        def run_query(transaction):
-            rows = transaction.execute_sql(
+        def run_query(snapshot):
+            rows = snapshot.execute_sql(
                 sql, params=params, param_types=param_types_dict
             )
             
@@ -307,248 +902,461 @@ Analyze the query:"""
                         "biome": biome,
                         "skills": []
                     }
-                survivor_map[surv_id]["skills"].append({
-                    "id": skill_id,
-                    "name": skill_name,
-                    "category": category
-                })
+                survivor_map[surv_id]["skills"].append(
+                    (skill_id, skill_name, category, None, None)
+                )
             
             # Convert to results
             for surv_id, data in survivor_map.items():
                 # Score based on number of matching skills
                 score = min(len(data["skills"]) / 5.0, 1.0)
                 
-                results.append(SearchResult(
-                    id=surv_id,
-                    name=data["name"],
-                    type="survivor",
-                    score=score,
-                    method=SearchMethod.KEYWORD,
-                    details={
-                        "biome": data["biome"],
-                        "matching_skills": data["skills"],
-                        "match_count": len(data["skills"])
-                    }
-                ))
+                builder.add(
+                    surv_id, data["name"], score, SearchMethod.KEYWORD,
+                    biome=data["biome"],
+                    skills=data["skills"],
+                    match_count=len(data["skills"])
+                )
         
-        self.database.run_in_transaction(run_query)
+        self._run_read(run_query)
         
         # Sort by score
-        results.sort(key=lambda x: x.score, reverse=True)
-        
-        return results
+        return builder.build().sorted_by_score()
     
     # =========================================================================
     # RAG SEARCH - Semantic Embeddings
     # =========================================================================
     
+    @traced_stage("rag")
     def rag_search(
         self,
         query: str,
-        limit: int = 10
-    ) -> List[SearchResult]:
+        limit: int = 10,
+        mode: Optional[VectorSearchMode] = None
+    ) -> SearchResults:
         """
         Perform semantic search using embeddings.
         
         Uses your existing setup:
-        - TextEmbeddings model
+        - TextEmbeddings model (via the shared embedding cache)
         - skill_embedding column
         - COSINE_DISTANCE function
+        
+        When the in-process skill vector index is loaded, skills are ranked
+        locally and survivors are resolved with one keyed lookup instead.
+        In ANN mode skills are ranked by the Spanner vector index.
+        
+        Args:
+            query: Natural language query
+            limit: Max survivors to return
+            mode: Override the service's vector search mode
         """
         
-        results = []
+        # Query vector comes from the embedding cache and is bound as a
+        # parameter, so repeated queries never call the model again
+        query_embedding = self._embed_text(query)
+        if not query_embedding:
+            return SearchResults.empty()
+        
+        # Approximate: Spanner vector index, then the keyed survivor lookup
+        if (mode or self.vector_search) == VectorSearchMode.ANN and self._ann.available:
+            try:
+                hits = self._ann_skill_hits(query_embedding, limit * 2)
+                return self._rag_results_from_rows(
+                    self._survivor_rows_for_skills(hits, limit)
+                )
+            except Exception as e:
+                self._ann.failed(e)
+        
+        # Fast path: in-memory skill ranking, no Spanner scan
+        if self._vector_index is not None:
+            self._vector_index.ensure_fresh(self._executor)
+            if self._vector_index.ready:
+                # Over-fetch: some skills may have no survivors
+                hits = self._vector_index.search([query_embedding], k=limit * 2)[0]
+                rows = self._survivor_rows_for_skills(hits, limit)
+                return self._rag_results_from_rows(rows)
+        
+        rows = []
         
        # TODO: REPLACE_SQL
                # This is your working query from the successful run!
+        # Distances are computed once per skill, then survivors are ranked
+        # by their nearest skill and LIMIT applies to survivors. Skill rows
+        # are kept up to the last admitted survivor's best distance -
+        # exactly the rows a row-level scan would return until it had seen
+        # `limit` survivors.
         sql = """
-            WITH query_embedding AS (
-                SELECT embeddings.values AS val
-                FROM ML.PREDICT(
-                    MODEL TextEmbeddings,
-                    (SELECT @query AS content)
-                )
+            WITH skill_distances AS (
+                SELECT
+                    sk.skill_id,
+                    sk.name AS skill_name,
+                    sk.category,
+                    COSINE_DISTANCE(
+                        sk.skill_embedding, 
+                        @query_embedding
+                    ) AS distance
+                FROM Skills sk
+                WHERE sk.skill_embedding IS NOT NULL
+            ),
+            matches AS (
+                SELECT
+                    s.survivor_id,
+                    s.name AS survivor_name,
+                    s.biome,
+                    d.skill_id,
+                    d.skill_name,
+                    d.category,
+                    d.distance
+                FROM skill_distances d
+                JOIN SurvivorHasSkill shs ON shs.skill_id = d.skill_id
+                JOIN Survivors s ON s.survivor_id = shs.survivor_id
+            ),
+            top_survivors AS (
+                SELECT survivor_id, MIN(distance) AS best_distance
+                FROM matches
+                GROUP BY survivor_id
+                ORDER BY best_distance ASC, survivor_id
+                LIMIT @limit
             )
             SELECT
-                s.survivor_id,
-                s.name AS survivor_name,
-                s.biome,
-                sk.skill_id,
-                sk.name AS skill_name,
-                sk.category,
-                COSINE_DISTANCE(
-                    sk.skill_embedding, 
-                    (SELECT val FROM query_embedding)
-                ) AS distance
-            FROM Survivors s
-            JOIN SurvivorHasSkill shs ON s.survivor_id = shs.survivor_id
-            JOIN Skills sk ON shs.skill_id = sk.skill_id
-            WHERE sk.skill_embedding IS NOT NULL
-            ORDER BY distance ASC
-            LIMIT @limit
+                m.survivor_id, m.survivor_name, m.biome,
+                m.skill_id, m.skill_name, m.category, m.distance
+            FROM matches m
+            JOIN top_survivors t ON t.survivor_id = m.survivor_id
+            WHERE m.distance <= (SELECT MAX(best_distance) FROM top_survivors)
+            ORDER BY m.distance ASC
         """
         
-        def run_query(transaction):
-            rows = transaction.execute_sql(
+        def run_query(snapshot):
+            rows.extend(snapshot.execute_sql(
                 sql,
-                params={"query": query, "limit": limit},
+                params={"query_embedding": query_embedding, "limit": limit},
                 param_types={
-                    "query": param_types.STRING,
+                    "query_embedding": EMBEDDING_PARAM_TYPE,
                     "limit": param_types.INT64
                 }
-            )
-            
-            # Group by survivor, keeping best skill match
-            survivor_map = {}
-            for row in rows:
-                surv_id, surv_name, biome, skill_id, skill_name, category, distance = row
-                
-                if surv_id not in survivor_map:
-                    survivor_map[surv_id] = {
-                        "name": surv_name,
-                        "biome": biome,
-                        "best_distance": float(distance),
-                        "skills": []
-                    }
-                else:
-                    # Track best (lowest) distance
-                    survivor_map[surv_id]["best_distance"] = min(
-                        survivor_map[surv_id]["best_distance"],
-                        float(distance)
-                    )
-                
-                survivor_map[surv_id]["skills"].append({
-                    "id": skill_id,
-                    "name": skill_name,
-                    "category": category,
-                    "similarity": 1 - float(distance)  # Convert to similarity
-                })
-            
-            # Convert to results
-            for surv_id, data in survivor_map.items():
-                # Score is 1 - distance (so higher = more similar)
-                score = 1 - data["best_distance"]
-                
-                results.append(SearchResult(
-                    id=surv_id,
-                    name=data["name"],
-                    type="survivor",
-                    score=score,
-                    method=SearchMethod.RAG,
-                    details={
-                        "biome": data["biome"],
-                        "matching_skills": sorted(
-                            data["skills"], 
-                            key=lambda x: x["similarity"], 
-                            reverse=True
-                        ),
-                        "best_similarity": score
-                    }
-                ))
-        
-        self.database.run_in_transaction(run_query)
+            ))
         
-        # Sort by score (highest first)
-        results.sort(key=lambda x: x.score, reverse=True)
+        self._run_read(run_query)
         
-        return results
+        return self._rag_results_from_rows(rows)
     
-    # =========================================================================
-    # HYBRID SEARCH - Combine Both Methods
-    # =========================================================================
-    
-    def hybrid_search(
+    def _ann_skill_hits(
         self,
-        query: str,
-        analysis: QueryAnalysis,
-        limit: int = 10
-    ) -> List[SearchResult]:
+        embedding: List[float],
+        k: int
+    ) -> List[SkillHit]:
         """
-        Run both keyword and RAG search, merge results.
+        Nearest skills through the SkillsEmbeddingIndex vector index.
         
-        Merging Strategy:
-        ┌─────────────────────────────────────────────────────────────┐
-        │  1. Run both searches in parallel (conceptually)            │
-        │  2. Deduplicate by survivor ID                              │
-        │  3. Combine scores: final = 0.4*keyword + 0.6*rag           │
-        │     (RAG weighted higher for semantic understanding)        │
-        │  4. Merge skill details from both sources                   │
-        │  5. Sort by combined score                                  │
-        └─────────────────────────────────────────────────────────────┘
+        APPROX_COSINE_DISTANCE only visits ann_leaves_to_search of the
+        index's leaves: more leaves, better recall, more latency.
         """
+        hits: List[SkillHit] = []
         
-        # Run both searches
-        keyword_results = self.keyword_search(analysis, limit=limit)
-        rag_results = self.rag_search(query, limit=limit)
-        
-        # Create lookup maps
-        keyword_map = {r.id: r for r in keyword_results}
-        rag_map = {r.id: r for r in rag_results}
-        
-        # Get all unique IDs
-        all_ids = set(keyword_map.keys()) | set(rag_map.keys())
+        sql = """
+            SELECT
+                sk.skill_id,
+                sk.name,
+                sk.category,
+                APPROX_COSINE_DISTANCE(
+                    sk.skill_embedding,
+                    @query_embedding,
+                    options => JSON '{"num_leaves_to_search": %d}'
+                ) AS distance
+            FROM Skills@{FORCE_INDEX=SkillsEmbeddingIndex} sk
+            WHERE sk.skill_embedding IS NOT NULL
+            ORDER BY distance
+            LIMIT @limit
+        """ % max(1, int(self.ann_leaves_to_search))
         
-        # Create rank maps (ID -> Rank, 1-based)
-        keyword_ranks = {r.id: i + 1 for i, r in enumerate(keyword_results)}
-        rag_ranks = {r.id: i + 1 for i, r in enumerate(rag_results)}
+        def run_query(snapshot):
+            for skill_id, name, category, distance in snapshot.execute_sql(
+                sql,
+                params={"query_embedding": embedding, "limit": k},
+                param_types={
+                    "query_embedding": EMBEDDING_PARAM_TYPE,
+                    "limit": param_types.INT64
+                }
+            ):
+                hits.append(SkillHit(sys.intern(skill_id), name, category, float(distance)))
         
-        # Constants
-        K = 60
+        self._run_read(run_query)
         
-        merged_results = []
+        return hits
+    
+    def _survivor_rows_for_skills(
+        self,
+        hits: List[SkillHit],
+        limit: int
+    ) -> List[tuple]:
+        """
+        Resolve survivors for index hits with bounded keyed lookups.
         
-        for surv_id in all_ids:
-            kw_result = keyword_map.get(surv_id)
-            rag_result = rag_map.get(surv_id)
-            
-            # Calculate RRF Score
-            rank_kw = keyword_ranks.get(surv_id, float('inf'))
-            rank_rag = rag_ranks.get(surv_id, float('inf'))
+        Returns rows shaped like the RAG SQL (survivor_id, survivor_name,
+        biome, skill_id, skill_name, category, distance), nearest skill
+        first and covering at most `limit` survivors. Hits are resolved a
+        chunk at a time in distance order, stopping as soon as the nearest
+        skills already cover `limit` survivors (usually the first chunk).
+        """
+        survivors_by_skill: Dict[str, List[tuple]] = {}
+        for start in range(0, len(hits), SKILL_LOOKUP_CHUNK):
+            chunk = [h.skill_id for h in hits[start:start + SKILL_LOOKUP_CHUNK]]
+            survivors_by_skill.update(self._survivors_by_skill(chunk, limit + 1))
+            rows, complete = self._expand_hits(
+                hits[:start + SKILL_LOOKUP_CHUNK], survivors_by_skill, limit
+            )
+            if complete:
+                return rows
+        return self._rows_for_hits(hits, survivors_by_skill, limit)
+    
+    def _survivors_by_skill(
+        self,
+        skill_ids: List[str],
+        per_skill: int
+    ) -> Dict[str, List[tuple]]:
+        """
+        Map skill_id -> [(survivor_id, name, biome)], the first `per_skill`
+        survivors by name for each skill.
+        
+        One UNION ALL of per-skill ORDER BY / LIMIT subqueries per chunk of
+        skills, so a popular skill costs `per_skill` rows, not all of its
+        holders. With per_skill = limit + 1, _rows_for_hits sees exactly
+        the rows it would have used from the unbounded lists.
+        """
+        survivors_by_skill: Dict[str, List[tuple]] = {}
+        
+        for start in range(0, len(skill_ids), SKILL_LOOKUP_CHUNK):
+            chunk = skill_ids[start:start + SKILL_LOOKUP_CHUNK]
+            sql = "\n            UNION ALL\n".join(
+                SURVIVORS_FOR_SKILL_SQL.format(param=f"skill_id_{i}")
+                for i in range(len(chunk))
+            )
+            params: Dict[str, Any] = {f"skill_id_{i}": skill_id for i, skill_id in enumerate(chunk)}
+            params["per_skill"] = per_skill
+            types = {name: param_types.STRING for name in params}
+            types["per_skill"] = param_types.INT64
             
-            rrf_score = 0.0
-            if rank_kw != float('inf'):
-                rrf_score += 1.0 / (K + rank_kw)
-            if rank_rag != float('inf'):
-                rrf_score += 1.0 / (K + rank_rag)
+            def run_query(snapshot, sql=sql, params=params, types=types):
+                for skill_id, surv_id, surv_name, biome in snapshot.execute_sql(
+                    sql, params=params, param_types=types
+                ):
+                    survivors_by_skill.setdefault(skill_id, []).append(
+                        (surv_id, surv_name, biome)
+                    )
             
-            combined_score = rrf_score
+            self._run_read(run_query)
+        
+        # Each subquery is name-ordered; UNION ALL keeps no order between them
+        for survivors in survivors_by_skill.values():
+            survivors.sort(key=lambda row: row[1] or "")
+        return survivors_by_skill
+    
+    @staticmethod
+    def _rows_for_hits(
+        hits: List[SkillHit],
+        survivors_by_skill: Dict[str, List[tuple]],
+        limit: int
+    ) -> List[tuple]:
+        """
+        Expand skill hits into RAG-shaped rows, nearest skill first,
+        stopping before the (limit + 1)-th distinct survivor.
+        """
+        return HybridSearchService._expand_hits(hits, survivors_by_skill, limit)[0]
+    
+    @staticmethod
+    def _expand_hits(
+        hits: List[SkillHit],
+        survivors_by_skill: Dict[str, List[tuple]],
+        limit: int
+    ) -> Tuple[List[tuple], bool]:
+        """_rows_for_hits plus whether it stopped early (later hits can't add rows)."""
+        rows = []
+        seen = set()
+        for hit in hits:
+            for surv_id, surv_name, biome in survivors_by_skill.get(hit.skill_id, []):
+                if surv_id not in seen:
+                    if len(seen) >= limit:
+                        return rows, True
+                    seen.add(surv_id)
+                rows.append((
+                    surv_id, surv_name, biome,
+                    hit.skill_id, hit.name, hit.category, hit.distance
+                ))
+        return rows, False
+    
+    def _rag_results_from_rows(self, rows) -> SearchResults:
+        """Group RAG rows by survivor, keeping the best skill match."""
+        builder = SearchResultsBuilder()
+        
+        # Group by survivor, keeping best skill match
+        survivor_map = {}
+        for row in rows:
+            surv_id, surv_name, biome, skill_id, skill_name, category, distance = row
             
-            # Determine method for display
-            if rank_kw != float('inf') and rank_rag != float('inf'):
-                method = SearchMethod.HYBRID
-            elif rank_rag != float('inf'):
-                method = SearchMethod.RAG
+            if surv_id not in survivor_map:
+                survivor_map[surv_id] = {
+                    "name": surv_name,
+                    "biome": biome,
+                    "best_distance": float(distance),
+                    "skills": []
+                }
             else:
-                method = SearchMethod.KEYWORD
-            
-            # Merge details
-            base_result = rag_result or kw_result
-            merged_details = dict(base_result.details)
+                # Track best (lowest) distance
+                survivor_map[surv_id]["best_distance"] = min(
+                    survivor_map[surv_id]["best_distance"],
+                    float(distance)
+                )
             
-            if kw_result and rag_result:
-                # Combine skill lists, remove duplicates
-                kw_skills = {s["id"]: s for s in kw_result.details.get("matching_skills", [])}
-                rag_skills = {s["id"]: s for s in rag_result.details.get("matching_skills", [])}
-                
-                # Merge, preferring RAG skills (have similarity scores)
-                all_skills = {**kw_skills, **rag_skills}
-                merged_details["matching_skills"] = list(all_skills.values())
-                merged_details["found_by"] = "both"
-            else:
-                merged_details["found_by"] = method.value
+            survivor_map[surv_id]["skills"].append(
+                # Convert to similarity
+                (skill_id, skill_name, category, None, 1 - float(distance))
+            )
+        
+        # Convert to results
+        for surv_id, data in survivor_map.items():
+            # Score is 1 - distance (so higher = more similar)
+            score = 1 - data["best_distance"]
             
-            merged_results.append(SearchResult(
-                id=surv_id,
-                name=base_result.name,
-                type=base_result.type,
-                score=combined_score,
-                method=method,
-                details=merged_details
-            ))
+            builder.add(
+                surv_id, data["name"], score, SearchMethod.RAG,
+                biome=data["biome"],
+                skills=sorted(data["skills"], key=lambda x: x[4], reverse=True),
+                best_similarity=score
+            )
         
-        # Sort by combined score
-        merged_results.sort(key=lambda x: x.score, reverse=True)
+        # Sort by score (highest first)
+        return builder.build().sorted_by_score()
+    
+    # =========================================================================
+    # HYBRID SEARCH - Combine Both Methods
+    # =========================================================================
+    
+    def hybrid_search(
+        self,
+        query: str,
+        analysis: QueryAnalysis,
+        limit: int = 10,
+        leg_timeout: Optional[float] = None,
+        timings: Optional[Dict[str, Any]] = None,
+        rag_future: Optional[Future] = None,
+        fusion: Optional[FusionStrategy] = None,
+        weights: Optional[Dict[str, float]] = None,
+        rrf_k: Optional[int] = None
+    ) -> SearchResults:
+        """
+        Run both keyword and RAG search, merge results.
         
-        return merged_results[:limit]
+        Merging Strategy:
+        ┌─────────────────────────────────────────────────────────────┐
+        │  1. Run both searches in parallel (thread pool)             │
+        │     - Each leg has a deadline; late legs are dropped        │
+        │  2. Deduplicate by survivor ID                              │
+        │  3. Fuse with RRF / weighted / CombMNZ (services/fusion.py)  │
+        │  4. Merge skill details from both sources                   │
+        │  5. Sort by fused score                                     │
+        └─────────────────────────────────────────────────────────────┘
+        
+        Args:
+            query: User's natural language query
+            analysis: Query analysis (keywords/filters for keyword leg)
+            limit: Max results to return
+            leg_timeout: Per-leg deadline in seconds (default: self.leg_timeout)
+            timings: Optional dict filled with per-leg timings (ms) and
+                the names of any dropped legs
+            rag_future: Already-running RAG leg (from speculative
+                execution in smart_search) to reuse instead of re-querying
+            fusion: Fusion strategy (default: self.fusion)
+            weights: Per-leg weights, e.g. {"keyword": 1.0, "rag": 2.0}
+            rrf_k: RRF rank constant (default: self.rrf_k)
+        """
+        
+        # Run both searches concurrently
+        leg_results = self._run_legs(
+            {
+                "keyword": (self.keyword_search, (analysis, limit)),
+                "rag": rag_future or (self.rag_search, (query, limit)),
+            },
+            leg_timeout=leg_timeout,
+            timings=timings
+        )
+        keyword_results = leg_results.get("keyword", SearchResults.empty())
+        rag_results = leg_results.get("rag", SearchResults.empty())
+        
+        with stage_timer("fusion", timings):
+            return self._merge_results(
+                keyword_results, rag_results, limit,
+                fusion=fusion, weights=weights, rrf_k=rrf_k
+            )
+    
+    def _merge_results(
+        self,
+        keyword_results: SearchResults,
+        rag_results: SearchResults,
+        limit: int,
+        fusion: Optional[FusionStrategy] = None,
+        weights: Optional[Dict[str, float]] = None,
+        rrf_k: Optional[int] = None
+    ) -> SearchResults:
+        """Fuse keyword and RAG result lists (RRF unless told otherwise)."""
+        return self._fuse_legs(
+            {"keyword": keyword_results, "rag": rag_results},
+            limit, fusion=fusion, weights=weights, rrf_k=rrf_k
+        )
+    
+    def _fuse_legs(
+        self,
+        legs: Dict[str, SearchResults],
+        limit: int,
+        fusion: Optional[FusionStrategy] = None,
+        weights: Optional[Dict[str, float]] = None,
+        rrf_k: Optional[int] = None
+    ) -> SearchResults:
+        """
+        Fuse any number of named legs (keyword, rag, graph, ...).
+        
+        Scores are fused with NumPy; SearchResults and merged skill
+        lists are built only for the `limit` winners. Later legs win
+        when merging details, so RAG skills (with similarity) are kept.
+        
+        Args:
+            legs: Leg name → ranked results
+            limit: Max results to return
+            fusion: Strategy (default: self.fusion)
+            weights: Leg name → weight (default 1.0)
+            rrf_k: RRF rank constant (default: self.rrf_k)
+        """
+        names = list(legs)
+        lists = [SearchResults.of(legs[name]) for name in names]
+        weights = weights or self.fusion_weights or {}
+        
+        fused = fuse(
+            [results.ids for results in lists],
+            [results.scores for results in lists],
+            strategy=fusion or self.fusion,
+            weights=[weights.get(name, 1.0) for name in names],
+            k=rrf_k or self.rrf_k,
+            limit=limit
+        )
+        
+        # Display method per row; row fields and skills are gathered by
+        # SearchResults.from_legs (last leg wins, skills unioned by id)
+        methods, found_by = [], []
+        for positions in fused.leg_positions.T.tolist():
+            found = [leg for leg, pos in enumerate(positions) if pos >= 0]
+            if len(found) > 1:
+                methods.append(SearchMethod.HYBRID)
+                found_by.append("both" if len(found) == 2
+                                else ", ".join(names[leg] for leg in found))
+            else:
+                method = lists[found[0]].methods[positions[found[0]]]
+                methods.append(method)
+                found_by.append(method.value)
+        
+        return SearchResults.from_legs(
+            lists, fused.leg_positions, fused.scores, methods, found_by
+        )
     
     # =========================================================================
     # MAIN ENTRY POINT - Smart Search
@@ -558,68 +1366,625 @@ Analyze the query:"""
         self,
         query: str,
         force_method: Optional[SearchMethod] = None,
-        limit: int = 10
+        limit: int = 10,
+        speculative: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Main entry point for hybrid search.
         
         1. Analyzes query to determine best method
         2. Executes appropriate search(es)
-        3. Returns results with full transparency
+        3. Returns results with full transparency, including a `timings`
+           block (analyze_ms, keyword_ms, rag_ms, fusion_ms, total_ms)
+        
+        In speculative mode the RAG leg (which doesn't depend on the
+        analysis) starts at the same moment as the AI analysis. Once the
+        analysis picks a method the RAG result is reused (RAG/HYBRID) or
+        thrown away (KEYWORD), taking LLM latency off the RAG critical path.
         
         Args:
             query: User's natural language query
             force_method: Override the AI's recommendation
             limit: Max results to return
+            speculative: Start RAG before analysis finishes
+                (default: self.speculative_rag)
             
         Returns:
             Dict with analysis, method used, and results
         """
         
+        if speculative is None:
+            speculative = self.speculative_rag
+        
+        timings: Dict[str, Any] = {}
+        rag_future: Optional[Future] = None
+        start = time.perf_counter()
+        
         # Step 1: Analyze query (Conditional)
         if force_method == SearchMethod.RAG:
             # OPTIMIZATION: RAG doesn't need analysis (keywords/categories), so skip the expensive Gemini call
-            analysis = QueryAnalysis(
-                original_query=query,
-                recommended_method=SearchMethod.RAG,
-                keywords=[],
-                categories=[],
-                biome_filter=None,
-                needs_similarity_ranking=True,
-                has_specific_filters=False,
-                confidence=1.0,
-                reasoning="Forced RAG search (Optimization: Skipped AI Analysis)"
-            )
+            analysis = self._forced_rag_analysis(query)
         else:
+            # Speculatively start RAG while the analysis runs
+            if speculative and force_method != SearchMethod.KEYWORD:
+                rag_future = self._executor.submit(
+                    self._timed, self.rag_search, query, limit
+                )
+            
             # Keyword and Hybrid methods require extracted keywords/filters, so we must analyze
-            analysis = self.analyze_query(query)
+            analysis, timings["analyze_ms"] = self._timed(self.analyze_query, query)
         
         # Step 2: Determine method (allow override)
         method = force_method or analysis.recommended_method
         
         # Step 3: Execute search
         if method == SearchMethod.KEYWORD:
-            results = self.keyword_search(analysis, limit)
+            if rag_future is not None:
+                rag_future.cancel()
+                timings["speculative_rag"] = "discarded"
+            results, timings["keyword_ms"] = self._timed(
+                self.keyword_search, analysis, limit
+            )
         elif method == SearchMethod.RAG:
-            results = self.rag_search(query, limit)
+            if rag_future is not None:
+                timings["speculative_rag"] = "reused"
+            # Same leg deadline as HYBRID; a RAG leg that misses it falls
+            # back to keyword search instead of blocking the request
+            leg_results = self._run_legs(
+                {"rag": rag_future or (self.rag_search, (query, limit))},
+                timings=timings
+            )
+            if "rag" in leg_results:
+                results = leg_results["rag"]
+            else:
+                keyword_analysis = analysis if analysis.keywords else \
+                    self._fallback_analysis(query, "RAG leg missed its deadline")
+                results, timings["keyword_ms"] = self._timed(
+                    self.keyword_search, keyword_analysis, limit
+                )
+                timings["fallback"] = "keyword"
         else:  # HYBRID
-            results = self.hybrid_search(query, analysis, limit)
+            if rag_future is not None:
+                timings["speculative_rag"] = "reused"
+            results = self.hybrid_search(
+                query, analysis, limit,
+                timings=timings,
+                rag_future=rag_future
+            )
+        
+        timings["total_ms"] = (time.perf_counter() - start) * 1000
         
         return {
             "query": query,
-            "analysis": {
-                "recommended_method": analysis.recommended_method.value,
-                "actual_method": method.value,
-                "keywords_extracted": analysis.keywords,
-                "categories": analysis.categories,
-                "biome_filter": analysis.biome_filter,
-                "confidence": analysis.confidence,
-                "reasoning": analysis.reasoning
-            },
+            "analysis": self._analysis_summary(analysis, method),
+            "results": results,
+            "result_count": len(results),
+            "timings": timings
+        }
+    
+    # =========================================================================
+    # STREAMING SEARCH - Results as each stage finishes
+    # =========================================================================
+    
+    async def smart_search_stream(
+        self,
+        query: str,
+        force_method: Optional[SearchMethod] = None,
+        limit: int = 10,
+        speculative: Optional[bool] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async-generator variant of smart_search that yields stages.
+        
+        ┌─────────────────────────────────────────────────────────────┐
+        │  t=0   RAG leg starts (speculative; needs no analysis)      │
+        │        analysis starts (cache → router → Gemini)            │
+        │  ...   {"stage": "analysis"}  → keyword leg starts          │
+        │        (a RAG result that beat the analysis follows it at   │
+        │        once for RAG/HYBRID; it is dropped otherwise)        │
+        │  ...   {"stage": "keyword"} / {"stage": "rag"}              │
+        │        in whichever order they finish                       │
+        │  end   {"stage": "fused"}  (HYBRID only, RRF of both legs)  │
+        │        {"stage": "done", "timings": {...}}                  │
+        └─────────────────────────────────────────────────────────────┘
+        
+        Each result stage carries `results` (SearchResult list) and
+        `elapsed_ms` since the call started, so the first results arrive
+        after one query instead of LLM + two queries. No result stage is
+        yielded before the analysis has picked a method that wants it.
+        
+        Legs that miss self.leg_timeout, and a speculative RAG leg the
+        analysis doesn't want, are dropped and listed in the final
+        timings. A leg still queued is cancelled; one already running
+        can't be interrupted, so it finishes on the pool and its result
+        is ignored (timings say "abandoned").
+        
+        Args:
+            query: User's natural language query
+            force_method: Override the AI's recommendation
+            limit: Max results per stage
+            speculative: Start RAG before analysis finishes
+                (default: self.speculative_rag)
+        """
+        if speculative is None:
+            speculative = self.speculative_rag
+        
+        start = time.perf_counter()
+        timings: Dict[str, Any] = {}
+        
+        def elapsed() -> float:
+            return (time.perf_counter() - start) * 1000
+        
+        def leg_stage(name: str, results: SearchResults) -> Dict[str, Any]:
+            return {
+                "stage": name,
+                "results": results,
+                "result_count": len(results),
+                "elapsed_ms": elapsed()
+            }
+        
+        # asyncio future -> pool future, which is the one that can be cancelled
+        pool_futures: Dict[asyncio.Future, Future] = {}
+        
+        def submit(fn: Callable, *args) -> asyncio.Future:
+            pool_future = self._executor.submit(self._timed, fn, *args)
+            future = asyncio.wrap_future(pool_future)
+            pool_futures[future] = pool_future
+            return future
+        
+        legs: Dict[asyncio.Future, str] = {}
+        deadlines: Dict[asyncio.Future, float] = {}
+        
+        def start_leg(name: str, fn: Callable, *args) -> None:
+            future = submit(fn, *args)
+            legs[future] = name
+            deadlines[future] = time.monotonic() + self.leg_timeout
+        
+        def drop_leg(future: asyncio.Future) -> str:
+            """Stop waiting on a leg; returns "cancelled" or "abandoned"."""
+            legs.pop(future, None)
+            deadlines.pop(future, None)
+            stopped = pool_futures.pop(future).cancel()
+            future.cancel()
+            return "cancelled" if stopped else "abandoned"
+        
+        analysis_future: Optional[asyncio.Future] = None
+        if force_method == SearchMethod.RAG:
+            analysis = self._forced_rag_analysis(query)
+            method = SearchMethod.RAG
+            start_leg("rag", self.rag_search, query, limit)
+        else:
+            analysis, method = None, None
+            analysis_future = submit(self.analyze_query, query)
+            if speculative and force_method != SearchMethod.KEYWORD:
+                start_leg("rag", self.rag_search, query, limit)
+        rag_started = bool(legs)
+        
+        leg_results: Dict[str, SearchResults] = {}
+        held_rag: Optional[SearchResults] = None    # Finished before the analysis
+        dropped: List[str] = []
+        
+        while analysis_future is not None or legs:
+            pending = set(legs)
+            if analysis_future is not None:
+                pending.add(analysis_future)
+            
+            # Wake up at the nearest leg deadline (the analysis has none)
+            timeout = None
+            if deadlines:
+                timeout = max(0.0, min(deadlines.values()) - time.monotonic())
+            done, _ = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            
+            if analysis_future is not None and analysis_future in done:
+                analysis, timings["analyze_ms"] = analysis_future.result()
+                pool_futures.pop(analysis_future, None)
+                analysis_future = None
+                method = force_method or analysis.recommended_method
+                
+                yield {
+                    "stage": "analysis",
+                    "analysis": self._analysis_summary(analysis, method),
+                    "elapsed_ms": elapsed()
+                }
+                
+                rag_running = [f for f, name in legs.items() if name == "rag"]
+                if method not in (SearchMethod.RAG, SearchMethod.HYBRID):
+                    # RAG isn't wanted: drop a held result or stop waiting on it
+                    if held_rag is not None:
+                        held_rag = None
+                        timings["speculative_rag"] = "discarded"
+                    for future in rag_running:
+                        timings["speculative_rag"] = f"discarded ({drop_leg(future)})"
+                    leg_results.pop("rag", None)
+                    timings.pop("rag_ms", None)
+                else:
+                    if held_rag is not None:
+                        timings["speculative_rag"] = "reused"
+                        leg_results["rag"] = held_rag
+                        yield leg_stage("rag", held_rag)
+                        held_rag = None
+                    elif rag_running:
+                        timings["speculative_rag"] = "reused"
+                    elif not rag_started:
+                        start_leg("rag", self.rag_search, query, limit)
+                
+                if method in (SearchMethod.KEYWORD, SearchMethod.HYBRID):
+                    start_leg("keyword", self.keyword_search, analysis, limit)
+            
+            for future in done:
+                name = legs.pop(future, None)
+                if name is None:
+                    continue
+                del deadlines[future]
+                pool_futures.pop(future, None)
+                try:
+                    results, timings[f"{name}_ms"] = future.result()
+                except Exception as e:
+                    print(f"Streaming {name} leg failed: {e}")
+                    dropped.append(name)
+                    continue
+                if method is None:
+                    # Speculative RAG beat the analysis: hold it until the
+                    # method says whether it's wanted
+                    held_rag = results
+                    continue
+                leg_results[name] = results
+                yield leg_stage(name, results)
+            
+            # Drop legs past their deadline
+            now = time.monotonic()
+            for future, deadline in list(deadlines.items()):
+                if deadline <= now and not future.done():
+                    name = legs[future]
+                    timings[f"{name}_leg"] = drop_leg(future)
+                    dropped.append(name)
+        
+        if method == SearchMethod.HYBRID and leg_results:
+            with stage_timer("fusion", timings):
+                fused = self._merge_results(
+                    leg_results.get("keyword", SearchResults.empty()),
+                    leg_results.get("rag", SearchResults.empty()),
+                    limit
+                )
+            yield leg_stage("fused", fused)
+        
+        timings["dropped_legs"] = dropped
+        timings["total_ms"] = elapsed()
+        yield {"stage": "done", "timings": timings, "elapsed_ms": timings["total_ms"]}
+    
+    # =========================================================================
+    # PAGINATED SEARCH - Cursor over a cached candidate window
+    # =========================================================================
+    
+    def search_page(
+        self,
+        query: Optional[str] = None,
+        force_method: Optional[SearchMethod] = None,
+        page_size: int = 10,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Cursor-paginated smart search.
+        
+        Without a cursor, runs smart_search once for exactly one page of
+        survivors, caches it as the ranked window and returns it. With a
+        cursor, returns the next slice of that window: no analysis,
+        embedding or Spanner reads, unless the page asks for results past
+        the end of a window that may hold more, which re-runs the search
+        with a larger limit and grows the window.
+        
+        Args:
+            query: User's query (ignored when a cursor is given)
+            force_method: Override the AI's recommendation (first page only)
+            page_size: Results per page
+            cursor: `next_cursor` from a previous page
+            
+        Returns:
+            Dict shaped like smart_search() plus `offset`, `total_results`
+            (survivors fetched so far), `total_complete` (False while more
+            may follow) and `next_cursor` (None on the last page)
+            
+        Raises:
+            CursorExpiredError: The cursor's window is gone; search again
+            ValueError: Malformed cursor, or neither query nor cursor
+        """
+        page_size = max(1, page_size)
+        
+        if cursor:
+            window_id, offset = decode_cursor(cursor)
+            window = self._result_windows.get(window_id)
+            timings: Dict[str, Any] = {"window_cache": "hit"}
+        else:
+            if not query:
+                raise ValueError("search_page needs a query or a cursor")
+            limit = page_size
+            response = self.smart_search(query, force_method=force_method, limit=limit)
+            window_id = self._result_windows.put(
+                query,
+                response["analysis"],
+                response["results"],
+                method=SearchMethod(response["analysis"]["actual_method"]),
+                limit=limit
+            )
+            window = self._result_windows.get(window_id)
+            offset = 0
+            timings = response["timings"]
+        
+        end = offset + page_size
+        if end > len(window.results) and not window.complete:
+            # Cursor asks past the window: fetch a few more pages' worth
+            limit = max(window.limit * 2, end + page_size * self.page_window_factor)
+            response = self.smart_search(
+                window.query, force_method=window.method, limit=limit
+            )
+            self._result_windows.extend(window, response["results"], limit)
+            timings = {"window_cache": "grown", **response["timings"]}
+        
+        results, next_cursor = self._result_windows.page(
+            window_id, window, offset, page_size
+        )
+        
+        return {
+            "query": window.query,
+            "analysis": window.analysis,
             "results": results,
-            "result_count": len(results)
+            "result_count": len(results),
+            "offset": offset,
+            "total_results": len(window.results),
+            "total_complete": window.complete,
+            "next_cursor": next_cursor,
+            "timings": timings
+        }
+    
+    @staticmethod
+    def _analysis_summary(analysis: QueryAnalysis, method: SearchMethod) -> Dict[str, Any]:
+        """The `analysis` block returned to callers."""
+        return {
+            "recommended_method": analysis.recommended_method.value,
+            "actual_method": method.value,
+            "keywords_extracted": analysis.keywords,
+            "categories": analysis.categories,
+            "biome_filter": analysis.biome_filter,
+            "confidence": analysis.confidence,
+            "reasoning": analysis.reasoning
         }
     
+    # =========================================================================
+    # BATCH SEARCH - Many queries at once
+    # =========================================================================
+    
+    def batch_smart_search(
+        self,
+        queries: List[str],
+        force_method: Optional[SearchMethod] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Run smart search for many queries with a handful of round-trips.
+        
+        ┌─────────────────────────────────────────────────────────────┐
+        │  1. ONE Gemini prompt analyzes every (uncached) query       │
+        │  2. ONE batched embedding call for every (uncached) query   │
+        │  3. ONE Spanner query ranks skills for all query vectors    │
+        │     (UNNEST over the vectors), or the local vector index    │
+        │  4. Keyword and RAG legs run concurrently on the search     │
+        │     pool under one shared deadline                          │
+        │  5. Results are fused per query                             │
+        └─────────────────────────────────────────────────────────────┘
+        
+        Args:
+            queries: Natural language queries (e.g. one per open need)
+            force_method: Override the AI's recommendation for all queries
+            limit: Max results per query
+            
+        Returns:
+            One dict per query, in order, shaped like smart_search()
+        """
+        if not queries:
+            return []
+        
+        # Every read sees the same read timestamp
+        with self.read_only_batch():
+            return self._batch_smart_search(queries, force_method, limit)
+    
+    def _batch_smart_search(
+        self,
+        queries: List[str],
+        force_method: Optional[SearchMethod],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """batch_smart_search body; runs inside read_only_batch()."""
+        timings: Dict[str, Any] = {}
+        
+        # Step 1: Analyze all queries in one prompt
+        if force_method == SearchMethod.RAG:
+            analyses = [self._forced_rag_analysis(q) for q in queries]
+        else:
+            analyses, timings["analyze_ms"] = self._timed(self.analyze_queries, queries)
+        
+        methods = [force_method or a.recommended_method for a in analyses]
+        rag_idx = [
+            i for i, m in enumerate(methods)
+            if m in (SearchMethod.RAG, SearchMethod.HYBRID)
+        ]
+        kw_idx = [
+            i for i, m in enumerate(methods)
+            if m in (SearchMethod.KEYWORD, SearchMethod.HYBRID)
+        ]
+        
+        # Step 2: Keyword legs and the batched RAG leg run concurrently on
+        # the pool, under one deadline counted from here
+        deadline = time.monotonic() + self.leg_timeout
+        start = time.perf_counter()
+        kw_futures = {
+            i: self._executor.submit(
+                copy_context().run, self.keyword_search, analyses[i], limit
+            )
+            for i in kw_idx
+        }
+        
+        # Step 3: Batched embeddings + one ranking query
+        rag_future = self._executor.submit(
+            copy_context().run, self._timed,
+            self._batch_rag_search, [queries[i] for i in rag_idx], limit
+        ) if rag_idx else None
+        
+        def remaining() -> float:
+            return max(0.0, deadline - time.monotonic())
+        
+        rag_by_query: Dict[int, SearchResults] = {}
+        if rag_future is not None:
+            try:
+                rag_lists, timings["rag_ms"] = rag_future.result(timeout=remaining())
+                rag_by_query = dict(zip(rag_idx, rag_lists))
+            except Exception as e:
+                # Too slow or failed: hybrid queries keep their keyword leg
+                print(f"Batch RAG leg failed: {e!r}")
+                rag_future.cancel()
+                timings["rag_ms"] = None
+        
+        kw_by_query: Dict[int, SearchResults] = {}
+        for i, future in kw_futures.items():
+            try:
+                kw_by_query[i] = future.result(timeout=remaining())
+            except Exception as e:
+                print(f"Batch keyword leg failed for query {i}: {e!r}")
+                future.cancel()
+                kw_by_query[i] = SearchResults.empty()
+        if kw_futures:
+            timings["keyword_ms"] = (time.perf_counter() - start) * 1000
+        
+        # Step 4: Per-query results
+        per_query: List[SearchResults] = []
+        with stage_timer("fusion", timings):
+            for i, method in enumerate(methods):
+                if method == SearchMethod.KEYWORD:
+                    per_query.append(kw_by_query.get(i, SearchResults.empty()))
+                elif method == SearchMethod.RAG:
+                    per_query.append(rag_by_query.get(i, SearchResults.empty()))
+                else:  # HYBRID
+                    per_query.append(self._merge_results(
+                        kw_by_query.get(i, SearchResults.empty()),
+                        rag_by_query.get(i, SearchResults.empty()),
+                        limit
+                    ))
+        
+        responses = []
+        for query, analysis, method, results in zip(queries, analyses, methods, per_query):
+            responses.append({
+                "query": query,
+                "analysis": self._analysis_summary(analysis, method),
+                "results": results,
+                "result_count": len(results),
+                "timings": dict(timings)
+            })
+        
+        return responses
+    
+    @traced_stage("rag")
+    def _batch_rag_search(
+        self,
+        queries: List[str],
+        limit: int = 10
+    ) -> List[SearchResults]:
+        """
+        RAG search for many queries: one embedding call, one ranking query.
+        
+        Uses the local vector index (plus one survivor lookup for the union
+        of top skills) when loaded, otherwise a single Spanner query with a
+        correlated top-k subquery per query vector.
+        """
+        vectors = self._embeddings.get_many(queries)
+        
+        if self._vector_index is not None:
+            self._vector_index.ensure_fresh(self._executor)
+            if self._vector_index.ready:
+                present = [i for i, v in enumerate(vectors) if v]
+                hit_lists = self._vector_index.search(
+                    [vectors[i] for i in present], k=limit * 2
+                )
+                hits_by_query = dict(zip(present, hit_lists))
+                skill_ids = sorted({
+                    h.skill_id for hits in hit_lists for h in hits
+                })
+                survivors_by_skill = self._survivors_by_skill(skill_ids, limit + 1)
+                return [
+                    self._rag_results_from_rows(self._rows_for_hits(
+                        hits_by_query.get(i, []), survivors_by_skill, limit
+                    ))
+                    for i in range(len(queries))
+                ]
+        
+        # Per query vector: rank distinct survivors by their nearest skill
+        # and LIMIT those (as rag_search does), then fetch their skills
+        sql = """
+            SELECT
+                q.query_idx,
+                ARRAY(
+                    SELECT AS STRUCT
+                        s.survivor_id,
+                        s.name AS survivor_name,
+                        s.biome,
+                        sk.skill_id,
+                        sk.name AS skill_name,
+                        sk.category,
+                        COSINE_DISTANCE(sk.skill_embedding, q.embedding) AS distance
+                    FROM (
+                        SELECT
+                            shs.survivor_id,
+                            MIN(COSINE_DISTANCE(sk.skill_embedding, q.embedding)) AS best_distance
+                        FROM SurvivorHasSkill shs
+                        JOIN Skills sk ON sk.skill_id = shs.skill_id
+                        WHERE sk.skill_embedding IS NOT NULL
+                        GROUP BY shs.survivor_id
+                        ORDER BY best_distance ASC, shs.survivor_id
+                        LIMIT @limit
+                    ) AS top_survivors
+                    JOIN Survivors s ON s.survivor_id = top_survivors.survivor_id
+                    JOIN SurvivorHasSkill shs ON shs.survivor_id = s.survivor_id
+                    JOIN Skills sk ON sk.skill_id = shs.skill_id
+                    WHERE sk.skill_embedding IS NOT NULL
+                    ORDER BY distance ASC
+                ) AS matches
+            FROM UNNEST(@query_vectors) AS q
+        """
+        
+        query_vectors = [(i, v) for i, v in enumerate(vectors) if v]
+        rows_by_query: Dict[int, List[tuple]] = {}
+        
+        def up_to_last_survivor(matches: List[tuple]) -> List[tuple]:
+            # rag_search's cutoff: skill rows up to the last admitted
+            # survivor's best distance
+            best: Dict[str, float] = {}
+            for m in matches:
+                best[m[0]] = min(best.get(m[0], m[6]), m[6])
+            cutoff = max(best.values(), default=0.0)
+            return [m for m in matches if m[6] <= cutoff]
+        
+        def run_query(snapshot):
+            rows = snapshot.execute_sql(
+                sql,
+                params={"query_vectors": query_vectors, "limit": limit},
+                param_types={
+                    "query_vectors": QUERY_VECTORS_PARAM_TYPE,
+                    "limit": param_types.INT64
+                }
+            )
+            for query_idx, matches in rows:
+                rows_by_query[int(query_idx)] = up_to_last_survivor(
+                    [tuple(m) for m in matches or []]
+                )
+        
+        if query_vectors:
+            self._run_read(run_query)
+        
+        return [
+            self._rag_results_from_rows(rows_by_query.get(i, []))
+            for i in range(len(queries))
+        ]
+    
     # =========================================================================
     # SKILL SIMILARITY SEARCH (Pure RAG)
     # =========================================================================
@@ -627,32 +1992,69 @@ Analyze the query:"""
     def find_similar_skills(
         self,
         skill_name: str,
-        limit: int = 10
+        limit: int = 10,
+        mode: Optional[VectorSearchMode] = None
     ) -> List[Dict[str, Any]]:
         """
         Find skills similar to a given skill.
         
         This is a pure RAG use case - finding semantically similar items.
-        Uses your existing working query pattern.
+        Uses your existing working query pattern, with the skill name's
+        embedding taken from the shared embedding cache. `mode` overrides
+        the service's exact/ANN vector search mode.
         """
         
         results = []
         
+        skill_embedding = self._embed_text(skill_name)
+        if not skill_embedding:
+            return results
+        
+        # Approximate: Spanner vector index (one extra hit for the skill itself)
+        if (mode or self.vector_search) == VectorSearchMode.ANN and self._ann.available:
+            try:
+                hits = self._ann_skill_hits(skill_embedding, limit + 1)
+            except Exception as e:
+                self._ann.failed(e)
+            else:
+                name = skill_name.lower()
+                return [
+                    {
+                        "skill_id": h.skill_id,
+                        "name": h.name,
+                        "category": h.category,
+                        "similarity": 1 - h.distance,
+                        "distance": h.distance
+                    }
+                    for h in hits if h.name.lower() != name
+                ][:limit]
+        
+        # Fast path: in-memory skill ranking
+        if self._vector_index is not None:
+            self._vector_index.ensure_fresh(self._executor)
+            if self._vector_index.ready:
+                hits = self._vector_index.search(
+                    [skill_embedding], k=limit, exclude_names=[skill_name]
+                )[0]
+                return [
+                    {
+                        "skill_id": h.skill_id,
+                        "name": h.name,
+                        "category": h.category,
+                        "similarity": 1 - h.distance,
+                        "distance": h.distance
+                    }
+                    for h in hits
+                ]
+        
         sql = """
-            WITH query_embedding AS (
-                SELECT embeddings.values AS val
-                FROM ML.PREDICT(
-                    MODEL TextEmbeddings,
-                    (SELECT @skill_name AS content)
-                )
-            )
             SELECT
                 sk.skill_id,
                 sk.name,
                 sk.category,
                 COSINE_DISTANCE(
                     sk.skill_embedding,
-                    (SELECT val FROM query_embedding)
+                    @skill_embedding
                 ) AS distance
             FROM Skills sk
             WHERE sk.skill_embedding IS NOT NULL
@@ -661,15 +2063,17 @@ Analyze the query:"""
             LIMIT @limit
         """
         
-        def run_query(transaction):
-            rows = transaction.execute_sql(
+        def run_query(snapshot):
+            rows = snapshot.execute_sql(
                 sql,
                 params={
                     "skill_name": skill_name,
+                    "skill_embedding": skill_embedding,
                     "limit": limit
                 },
                 param_types={
                     "skill_name": param_types.STRING,
+                    "skill_embedding": EMBEDDING_PARAM_TYPE,
                     "limit": param_types.INT64
                 }
             )
@@ -684,7 +2088,7 @@ Analyze the query:"""
                     "distance": float(distance)
                 })
         
-        self.database.run_in_transaction(run_query)
+        self._run_read(run_query)
         
         return results
     
@@ -692,31 +2096,180 @@ Analyze the query:"""
     # HELPER METHODS
     # =========================================================================
     
+    def _run_read(self, fn: Callable[[Any], None]) -> None:
+        """
+        Run fn(snapshot) on a single-use read-only snapshot.
+        
+        Inside read_only_batch() the snapshot reads at that block's pinned
+        timestamp; otherwise with bounded staleness (max_staleness).
+        """
+        read_timestamp = self._batch_read_timestamp.get()
+        if read_timestamp is not None:
+            kwargs = {"read_timestamp": read_timestamp}
+        else:
+            kwargs = {"max_staleness": self.max_staleness} if self.max_staleness else {}
+        with self.database.snapshot(**kwargs) as snapshot:
+            fn(snapshot)
+    
+    @contextmanager
+    def read_only_batch(self):
+        """
+        Read a block of queries at one consistent timestamp.
+        
+        The block pins a read timestamp `max_staleness` in the past and
+        every read in it opens its own snapshot at that timestamp: all see
+        the same data, but legs read in parallel, each on its own session,
+        and a leg still running after the block exits keeps a valid
+        snapshot. Work submitted to the search pool must be wrapped with
+        contextvars.copy_context().run to see the pinned timestamp.
+        """
+        read_timestamp = datetime.now(timezone.utc) - self.max_staleness
+        token = self._batch_read_timestamp.set(read_timestamp)
+        try:
+            yield read_timestamp
+        finally:
+            self._batch_read_timestamp.reset(token)
+    
+    @staticmethod
+    def _timed(fn: Callable, *args) -> Tuple[Any, float]:
+        """Call fn(*args) and return (result, elapsed milliseconds)."""
+        start = time.perf_counter()
+        result = fn(*args)
+        return result, (time.perf_counter() - start) * 1000
+    
+    def _run_legs(
+        self,
+        legs: Dict[str, Union[Tuple[Callable, tuple], Future]],
+        leg_timeout: Optional[float] = None,
+        timings: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, SearchResults]:
+        """
+        Run search legs concurrently with a shared deadline.
+        
+        Legs that miss the deadline or raise are dropped and the caller
+        degrades to whichever legs returned. Only if every leg raised is
+        the first error re-raised.
+        
+        A leg may also be a Future already returned by
+        `self._executor.submit(self._timed, ...)`, which is reused as-is.
+        """
+        timings = timings if timings is not None else {}
+        deadline = self.leg_timeout if leg_timeout is None else leg_timeout
+        
+        futures = {
+            name: leg if isinstance(leg, Future)
+            else self._executor.submit(self._timed, leg[0], *leg[1])
+            for name, leg in legs.items()
+        }
+        done, _ = wait(futures.values(), timeout=deadline)
+        
+        results: Dict[str, SearchResults] = {}
+        errors: List[Exception] = []
+        dropped: List[str] = []
+        
+        for name, future in futures.items():
+            if future not in done:
+                # Too slow - let it finish in the background, ignore result
+                future.cancel()
+                dropped.append(name)
+                timings[f"{name}_ms"] = None
+                continue
+            try:
+                results[name], timings[f"{name}_ms"] = future.result()
+            except Exception as e:
+                print(f"Search leg '{name}' failed: {e}")
+                errors.append(e)
+                dropped.append(name)
+                timings[f"{name}_ms"] = None
+        
+        timings["dropped_legs"] = dropped
+        
+        if not results and errors and len(errors) == len(futures):
+            raise errors[0]
+        
+        return results
+    
+    def analysis_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the query-analysis cache."""
+        return self._analysis_cache.stats()
+    
+    def router_stats(self) -> Dict[str, Any]:
+        """How many analyses the rule router resolved without an LLM call."""
+        if self._router is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._router.stats()}
+    
+    def refresh_known_values(self):
+        """
+        Reload known skills, categories, biomes now.
+        
+        Cached analyses are dropped if the catalog changed.
+        """
+        self._catalog.refresh(force=True)
+    
+    def catalog_stats(self) -> Dict[str, Any]:
+        """Size and refresh counters for the known-values catalog."""
+        return self._catalog.stats()
+    
     def _load_known_values(self):
-        """Load known skills, categories, biomes from database."""
-        if self._known_skills is not None:
-            return
-        
-        def load(transaction):
-            # Skills
-            skill_rows = transaction.execute_sql(
-                "SELECT DISTINCT name FROM Skills ORDER BY name LIMIT 100"
-            )
-            self._known_skills = [row[0] for row in skill_rows]
-            
-            # Categories
-            cat_rows = transaction.execute_sql(
-                "SELECT DISTINCT category FROM Skills WHERE category IS NOT NULL"
+        """
+        Return the known-values catalog.
+        
+        Loads on first use; afterwards a stale catalog is served while
+        it's re-checked on the worker pool.
+        """
+        return self._catalog.get(self._executor)
+    
+    def _on_catalog_change(self, catalog) -> None:
+        """A new catalog was swapped in: rebuild the router, drop stale analyses."""
+        if self._router is not None:
+            self._router.update(catalog.skills, catalog.categories, catalog.biomes)
+        
+        # Cached analyses reference these values; drop them if they changed
+        self._analysis_cache.check_fingerprint(catalog.fingerprint)
+    
+    def embedding_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the embedding cache."""
+        return self._embeddings.stats()
+    
+    def result_window_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters for the pagination window cache."""
+        return self._result_windows.stats()
+    
+    def _embed_text(self, text: str) -> List[float]:
+        """Embed a single text, using the embedding cache."""
+        return self._embeddings.get(text)
+    
+    @traced_stage("embed")
+    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts via Spanner ML.PREDICT with the TextEmbeddings model.
+        
+        All texts go in a single ML.PREDICT call. Used by the embedding
+        cache for misses - call _embed_text instead.
+        """
+        by_content: Dict[str, List[float]] = {}
+        
+        sql = """
+            SELECT content, embeddings.values
+            FROM ML.PREDICT(
+                MODEL TextEmbeddings,
+                (SELECT content FROM UNNEST(@contents) AS content)
             )
-            self._known_categories = [row[0] for row in cat_rows]
-            
-            # Biomes
-            biome_rows = transaction.execute_sql(
-                "SELECT DISTINCT biome FROM Survivors WHERE biome IS NOT NULL"
+        """
+        
+        def run_query(snapshot):
+            rows = snapshot.execute_sql(
+                sql,
+                params={"contents": list(texts)},
+                param_types={"contents": param_types.Array(param_types.STRING)}
             )
-            self._known_biomes = [row[0] for row in biome_rows]
+            for row in rows:
+                by_content[row[0]] = [float(v) for v in row[1]]
+        
+        self._run_read(run_query)
         
-        self.database.run_in_transaction(load)
+        return [by_content.get(text, []) for text in texts]
     
     def _call_gemini(self, prompt: str) -> str:
         """Call Gemini model via Spanner ML.PREDICT."""
@@ -730,9 +2283,9 @@ Analyze the query:"""
             )
         """
         
-        def run_query(transaction):
+        def run_query(snapshot):
             nonlocal result
-            rows = transaction.execute_sql(
+            rows = snapshot.execute_sql(
                 sql,
                 params={"prompt": prompt},
                 param_types={"prompt": param_types.STRING}
@@ -740,6 +2293,6 @@ Analyze the query:"""
             for row in rows:
                 result = row[0]
         
-        self.database.run_in_transaction(run_query)
+        self._run_read(run_query)
         
         return result or ""
@@ -0,0 +1,71 @@
+# services/index_gate.py
+"""
+Fallback switch for search paths that need an optional Spanner index.
+
+Full-text keyword search (search indexes) and ANN skill ranking (vector
+index) only work once setup_data.py has created their index. When a
+query on one of them fails, the caller falls back (LIKE / exact ranking)
+and reports the error here:
+
+    ┌────────────────────────────────────────────────────────────────┐
+    │  NotFound, or InvalidArgument  the index is missing: stay on   │
+    │  naming one of the gate's      the fallback for good           │
+    │  objects (index / column)                                      │
+    │  anything else                 transient (deadline, session,   │
+    │                                network) or a bad query: fall   │
+    │                                back, retry after retry_seconds │
+    └────────────────────────────────────────────────────────────────┘
+
+InvalidArgument alone isn't enough: Spanner also returns it for a
+malformed query (e.g. bad SEARCH() syntax), which says nothing about
+the index; and "Session not found" is a NotFound that isn't about it
+either. So a timeout, a dropped session or one odd query never disables
+the index for the lifetime of the process.
+"""
+
+import threading
+import time
+from typing import Iterable
+
+from google.api_core.exceptions import InvalidArgument, NotFound
+
+
+class IndexGate:
+    """Whether an optional index should be tried right now."""
+
+    def __init__(self, name: str, objects: Iterable[str] = (), retry_seconds: float = 30.0):
+        """
+        `objects` are the schema names the index path depends on (index
+        and column names); an InvalidArgument mentioning one of them
+        means the index is missing.
+        """
+        self.name = name
+        self.objects = tuple(o.lower() for o in objects)
+        self.retry_seconds = retry_seconds
+
+        self.missing = False
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return not self.missing and time.monotonic() >= self._retry_at
+
+    def is_missing_index(self, error: Exception) -> bool:
+        """Whether `error` says the index (or a column it needs) doesn't exist."""
+        message = str(error).lower()
+        if isinstance(error, NotFound):
+            return "session not found" not in message
+        if isinstance(error, InvalidArgument):
+            return any(name in message for name in self.objects)
+        return False
+
+    def failed(self, error: Exception) -> None:
+        """Record a failed query on the index and pick how long to skip it."""
+        with self._lock:
+            if self.is_missing_index(error):
+                self.missing = True
+                print(f"{self.name} unavailable, using the fallback: {error}")
+            else:
+                self._retry_at = time.monotonic() + self.retry_seconds
+                print(f"{self.name} failed, retrying in {self.retry_seconds:.0f}s: {error}")
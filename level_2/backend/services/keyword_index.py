@@ -0,0 +1,436 @@
+# services/keyword_index.py
+"""
+In-memory BM25 keyword index over Survivors, Skills and Needs.
+
+A zero-Spanner alternative to the SQL keyword engines: one document per
+survivor, built from its own fields plus its skills and needs.
+
+    ┌─────────────────────────────────────────────────────────────┐
+    │  Document (per survivor)                                    │
+    │    name, role, biome, description                           │
+    │    + skill name/category/description  (skill fields)       │
+    │    + need descriptions                                      │
+    │                                                             │
+    │  Inverted index   term → {doc_id: tf}      (BM25 scoring)   │
+    │  Filter sets      biome → {doc_id}, category → {doc_id}     │
+    │                                                             │
+    │  Search views (NumPy, rebuilt lazily after a mutation)      │
+    │    term arrays    term → (doc ids, tfs)                     │
+    │    doc lengths    doc id → length                           │
+    │    filter masks   biome / category → bool mask              │
+    │    name order     live doc ids sorted by name               │
+    └─────────────────────────────────────────────────────────────┘
+
+A search ORs/ANDs a few bool masks, scores each query term's postings in
+one vectorized step and takes the top k with argpartition; nothing is
+done per document in Python. After each save_extraction_result only the
+touched survivors are re-read, and only their terms' arrays are rebuilt.
+"""
+
+import math
+import re
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from google.cloud.spanner_v1 import param_types
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase alphanumeric tokens."""
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+@dataclass
+class _SurvivorDoc:
+    survivor_id: str
+    name: str
+    biome: Optional[str]
+    skills: List[Dict[str, Any]]            # {"tokens", "ref": {"id", "name", "category"}}
+    terms: Counter = field(default_factory=Counter)
+    length: int = 0
+
+
+@dataclass(frozen=True)
+class KeywordHit:
+    """A survivor matched by the index."""
+    survivor_id: str
+    name: str
+    biome: Optional[str]
+    score: float                            # raw BM25 score
+    matching_skills: List[Dict[str, Any]]
+
+
+class KeywordIndex:
+    """BM25 inverted index with set / mask filters."""
+
+    # Survivor documents, one Spanner round-trip
+    _LOAD_SQL = """
+        SELECT
+            s.survivor_id,
+            s.name,
+            s.role,
+            s.biome,
+            s.description,
+            ARRAY(
+                SELECT AS STRUCT sk.skill_id, sk.name, sk.category, sk.description
+                FROM SurvivorHasSkill shs
+                JOIN Skills sk ON sk.skill_id = shs.skill_id
+                WHERE shs.survivor_id = s.survivor_id
+            ) AS skills,
+            ARRAY(
+                SELECT n.description
+                FROM SurvivorHasNeed shn
+                JOIN Needs n ON n.need_id = shn.need_id
+                WHERE shn.survivor_id = s.survivor_id
+            ) AS needs
+        FROM Survivors s
+    """
+
+    def __init__(self, database, k1: float = 1.2, b: float = 0.75):
+        self.database = database
+        self.k1 = k1
+        self.b = b
+
+        self._lock = threading.RLock()
+        self._docs: List[Optional[_SurvivorDoc]] = []
+        self._doc_ids: Dict[str, int] = {}                  # survivor_id → doc id
+        self._postings: Dict[str, Dict[int, int]] = {}      # term → {doc: tf}
+        self._biome_docs: Dict[str, Set[int]] = {}
+        self._category_docs: Dict[str, Set[int]] = {}
+        self._live_count = 0
+        self._total_length = 0
+        self.ready = False
+
+        # Search views, dropped on mutation and rebuilt on demand
+        self._term_arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lengths: Optional[np.ndarray] = None
+        self._masks: Dict[Tuple[str, str], np.ndarray] = {}
+        self._by_name: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    # =========================================================================
+    # LOADING
+    # =========================================================================
+
+    def load(self) -> None:
+        """Build the index from every survivor."""
+        rows = self._fetch_rows()
+        with self._lock:
+            self._docs = []
+            self._doc_ids = {}
+            self._postings = {}
+            self._biome_docs = {}
+            self._category_docs = {}
+            self._live_count = 0
+            self._total_length = 0
+            self._term_arrays = {}
+            self._docs_changed()
+            for row in rows:
+                self._upsert(row)
+            self.ready = True
+
+    def refresh(self, survivor_ids: Optional[Sequence[str]] = None) -> None:
+        """
+        Re-read only the given survivors (full load if None).
+
+        Survivors that no longer exist are removed from the index.
+        """
+        if survivor_ids is None or not self.ready:
+            self.load()
+            return
+        if not survivor_ids:
+            return
+
+        rows = self._fetch_rows(list(survivor_ids))
+        found = {row[0] for row in rows}
+        with self._lock:
+            for row in rows:
+                self._upsert(row)
+            for survivor_id in survivor_ids:
+                if survivor_id not in found:
+                    self._remove(survivor_id)
+
+    def _fetch_rows(self, survivor_ids: Optional[List[str]] = None) -> List[tuple]:
+        sql = self._LOAD_SQL
+        params, types = None, None
+        if survivor_ids is not None:
+            sql += " WHERE s.survivor_id IN UNNEST(@survivor_ids)"
+            params = {"survivor_ids": survivor_ids}
+            types = {"survivor_ids": param_types.Array(param_types.STRING)}
+
+        with self.database.snapshot() as snapshot:
+            return [
+                tuple(row)
+                for row in snapshot.execute_sql(sql, params=params, param_types=types)
+            ]
+
+    # =========================================================================
+    # MUTATION (caller holds the lock)
+    # =========================================================================
+
+    def _upsert(self, row: tuple) -> None:
+        survivor_id, name, role, biome, description, skills, needs = row
+        self._remove(survivor_id)
+
+        doc_id = self._doc_ids.get(survivor_id)
+        if doc_id is None:
+            doc_id = len(self._docs)
+            self._docs.append(None)
+            self._doc_ids[survivor_id] = doc_id
+
+        terms = Counter(tokenize(name) + tokenize(role) + tokenize(biome) + tokenize(description))
+        doc_skills = []
+        for skill_id, skill_name, category, skill_desc in skills or []:
+            skill_tokens = tokenize(skill_name) + tokenize(category) + tokenize(skill_desc)
+            terms.update(skill_tokens)
+            doc_skills.append({
+                "tokens": frozenset(skill_tokens),
+                # Returned as-is in matching_skills, never copied per search
+                "ref": {"id": sys.intern(skill_id), "name": skill_name, "category": category}
+            })
+        for need in needs or []:
+            terms.update(tokenize(need))
+
+        doc = _SurvivorDoc(
+            survivor_id=sys.intern(survivor_id),
+            name=name or "",
+            biome=biome,
+            skills=doc_skills,
+            terms=terms,
+            length=sum(terms.values())
+        )
+        self._docs[doc_id] = doc
+        self._total_length += doc.length
+        self._live_count += 1
+        self._docs_changed()
+
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+            self._term_arrays.pop(term, None)
+        for docs, key in self._filter_keys(doc):
+            docs.setdefault(key, set()).add(doc_id)
+
+    def _remove(self, survivor_id: str) -> None:
+        doc_id = self._doc_ids.get(survivor_id)
+        if doc_id is None or self._docs[doc_id] is None:
+            return
+
+        doc = self._docs[doc_id]
+        for term in doc.terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+            self._term_arrays.pop(term, None)
+
+        for docs, key in self._filter_keys(doc):
+            members = docs.get(key)
+            if members is not None:
+                members.discard(doc_id)
+                if not members:
+                    del docs[key]
+
+        self._total_length -= doc.length
+        self._live_count -= 1
+        self._docs_changed()
+        self._docs[doc_id] = None
+
+    def _filter_keys(self, doc: _SurvivorDoc) -> Iterable[Tuple[Dict[str, Set[int]], str]]:
+        """(filter dict, key) pairs a document is listed under."""
+        if doc.biome:
+            yield self._biome_docs, doc.biome.lower()
+        for skill in doc.skills:
+            if skill["ref"]["category"]:
+                yield self._category_docs, skill["ref"]["category"].lower()
+
+    def _docs_changed(self) -> None:
+        # Per-document views; term arrays are dropped per term instead
+        self._lengths = None
+        self._masks = {}
+        self._by_name = None
+
+    # =========================================================================
+    # SEARCH
+    # =========================================================================
+
+    def search(
+        self,
+        keywords: Sequence[str],
+        limit: int = 10,
+        categories: Optional[Sequence[str]] = None,
+        biome_filter: Optional[str] = None
+    ) -> List[KeywordHit]:
+        """
+        Rank survivors by BM25 over the keyword tokens.
+
+        Args:
+            keywords: Search terms (multi-word terms are tokenized)
+            limit: Max survivors to return
+            categories: Keep survivors with a skill in any of these
+                categories (exact, case-insensitive)
+            biome_filter: Keep survivors whose biome contains this text
+
+        Returns:
+            Hits, best first. With no keywords, every survivor passing the
+            filters is returned with score 0.
+        """
+        query_terms = list(dict.fromkeys(t for kw in keywords for t in tokenize(kw)))
+
+        with self._lock:
+            if not self._live_count or limit <= 0:
+                return []
+            # None = no filter (every live document)
+            allowed = self._allowed_mask(categories, biome_filter)
+            if allowed is not None and not allowed.any():
+                return []
+
+            if query_terms:
+                ranked = self._top_scored(query_terms, allowed, limit)
+            else:
+                by_name = self._name_order()
+                if allowed is not None:
+                    by_name = by_name[allowed[by_name]]
+                ranked = [(int(doc_id), 0.0) for doc_id in by_name[:limit]]
+
+            term_set = set(query_terms)
+            category_set = {c.lower() for c in categories or []}
+            return [
+                self._hit(self._docs[doc_id], score, term_set, category_set)
+                for doc_id, score in ranked
+            ]
+
+    def _top_scored(
+        self,
+        query_terms: List[str],
+        allowed: Optional[np.ndarray],
+        limit: int
+    ) -> List[Tuple[int, float]]:
+        """Best `limit` (doc id, BM25 score) pairs, ties broken by name."""
+        n_docs = self._live_count
+        avgdl = (self._total_length / n_docs) or 1.0
+        lengths = self._doc_lengths()
+        scores = np.zeros(len(self._docs))
+
+        for term in query_terms:
+            arrays = self._postings_arrays(term)
+            if arrays is None:
+                continue
+            doc_ids, tfs = arrays
+            idf = math.log(1 + (n_docs - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            length_norm = 1 - self.b + self.b * lengths[doc_ids] / avgdl
+            # doc ids are unique within one term's postings
+            scores[doc_ids] += idf * tfs * (self.k1 + 1) / (tfs + self.k1 * length_norm)
+
+        # Every BM25 contribution is > 0, so 0 means "no term matched"
+        if allowed is not None:
+            scores[~allowed] = 0.0
+        matched = np.flatnonzero(scores)
+        if len(matched) > limit:
+            # Keep the top `limit` plus anything tied with the last of them
+            cutoff = -np.partition(-scores[matched], limit - 1)[limit - 1]
+            matched = matched[scores[matched] >= cutoff]
+
+        ranked = sorted(
+            ((int(doc_id), float(scores[doc_id])) for doc_id in matched),
+            key=lambda item: (-item[1], self._docs[item[0]].name)
+        )
+        return ranked[:limit]
+
+    def _allowed_mask(
+        self,
+        categories: Optional[Sequence[str]],
+        biome_filter: Optional[str]
+    ) -> Optional[np.ndarray]:
+        """Bool mask of documents passing the filters, or None when unfiltered."""
+        allowed = None
+        if categories:
+            allowed = self._union_mask(
+                ("category", category.lower()) for category in categories
+            )
+        if biome_filter:
+            needle = biome_filter.lower()
+            biome_mask = self._union_mask(
+                ("biome", biome) for biome in self._biome_docs if needle in biome
+            )
+            allowed = biome_mask if allowed is None else allowed & biome_mask
+        return allowed
+
+    # =========================================================================
+    # SEARCH VIEWS (caller holds the lock)
+    # =========================================================================
+
+    def _union_mask(self, keys: Iterable[Tuple[str, str]]) -> np.ndarray:
+        mask = np.zeros(len(self._docs), dtype=bool)
+        for key in keys:
+            mask |= self._filter_mask(key)
+        return mask
+
+    def _filter_mask(self, key: Tuple[str, str]) -> np.ndarray:
+        mask = self._masks.get(key)
+        if mask is None:
+            kind, value = key
+            docs = (self._biome_docs if kind == "biome" else self._category_docs).get(value, ())
+            mask = np.zeros(len(self._docs), dtype=bool)
+            mask[np.fromiter(docs, dtype=np.int64, count=len(docs))] = True
+            self._masks[key] = mask
+        return mask
+
+    def _postings_arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        arrays = self._term_arrays.get(term)
+        if arrays is None:
+            postings = self._postings.get(term)
+            if not postings:
+                return None
+            arrays = (
+                np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            )
+            self._term_arrays[term] = arrays
+        return arrays
+
+    def _doc_lengths(self) -> np.ndarray:
+        if self._lengths is None:
+            self._lengths = np.fromiter(
+                (doc.length if doc is not None else 0 for doc in self._docs),
+                dtype=np.float64,
+                count=len(self._docs)
+            )
+        return self._lengths
+
+    def _name_order(self) -> np.ndarray:
+        if self._by_name is None:
+            live = [i for i, doc in enumerate(self._docs) if doc is not None]
+            live.sort(key=lambda doc_id: self._docs[doc_id].name)
+            self._by_name = np.asarray(live, dtype=np.int64)
+        return self._by_name
+
+    @staticmethod
+    def _hit(
+        doc: _SurvivorDoc,
+        score: float,
+        terms: Set[str],
+        categories: Set[str]
+    ) -> KeywordHit:
+        matching = [
+            s["ref"]
+            for s in doc.skills
+            if (terms and s["tokens"] & terms)
+            or (categories and (s["ref"]["category"] or "").lower() in categories)
+        ]
+        return KeywordHit(
+            survivor_id=doc.survivor_id,
+            name=doc.name,
+            biome=doc.biome,
+            score=score,
+            matching_skills=matching
+        )
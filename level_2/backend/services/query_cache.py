@@ -0,0 +1,215 @@
+# services/query_cache.py
+"""
+Query-analysis cache for HybridSearchService.
+
+Stores QueryAnalysis objects keyed by normalized query text so repeated
+queries ("medical skills in forest", "who can fix injuries") skip the
+GeminiPro ML.PREDICT round-trip entirely.
+
+- Bounded LRU with a per-entry TTL
+- Optional semantic near-duplicate lookup using query embeddings
+- Hit/miss counters for observability
+- Invalidated when the known-values catalog changes
+"""
+
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace."""
+    return " ".join(_TOKEN_RE.findall((query or "").lower()))
+
+
+def _unit_vector(values: List[float]) -> Optional[Tuple[float, ...]]:
+    """Return the L2-normalized vector, or None for empty/zero vectors."""
+    if not values:
+        return None
+    norm = math.sqrt(sum(v * v for v in values))
+    if norm == 0:
+        return None
+    return tuple(v / norm for v in values)
+
+
+@dataclass
+class _CacheEntry:
+    analysis: Any                              # QueryAnalysis
+    expires_at: float
+    embedding: Optional[Tuple[float, ...]] = None
+
+
+class QueryAnalysisCache:
+    """
+    Bounded LRU + TTL cache of QueryAnalysis objects.
+
+    Lookups try the exact normalized key first; if an embedding is given
+    and semantic lookup is enabled, the most similar cached query above
+    `similarity_threshold` is returned instead.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 900.0,
+        similarity_threshold: float = 0.95,
+        semantic_scan_limit: int = 128
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.semantic_scan_limit = semantic_scan_limit
+
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._catalog_fingerprint: Optional[str] = None
+
+        # Counters
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # =========================================================================
+    # LOOKUP / STORE
+    # =========================================================================
+
+    def get(
+        self,
+        query: str,
+        embedding: Optional[List[float]] = None
+    ) -> Optional[Any]:
+        """
+        Return a cached analysis for `query`, or None on a miss.
+
+        The returned analysis has `original_query` set to the caller's query.
+        """
+        key = normalize_query(query)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return replace(entry.analysis, original_query=query)
+                del self._entries[key]
+
+            if embedding is not None:
+                match = self._nearest(_unit_vector(embedding), now)
+                if match is not None:
+                    match_key, match_entry = match
+                    self._entries.move_to_end(match_key)
+                    self.semantic_hits += 1
+                    return replace(match_entry.analysis, original_query=query)
+
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        query: str,
+        analysis: Any,
+        embedding: Optional[List[float]] = None
+    ) -> None:
+        """Store an analysis, evicting the least recently used entry if full."""
+        key = normalize_query(query)
+        if not key:
+            return
+
+        entry = _CacheEntry(
+            analysis=analysis,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            embedding=_unit_vector(embedding) if embedding else None
+        )
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _nearest(
+        self,
+        query_vec: Optional[Tuple[float, ...]],
+        now: float
+    ) -> Optional[Tuple[str, _CacheEntry]]:
+        """Find the most similar live entry (caller holds the lock)."""
+        if query_vec is None:
+            return None
+
+        best: Optional[Tuple[str, _CacheEntry]] = None
+        best_sim = self.similarity_threshold
+        scanned = 0
+
+        # Most recently used entries first
+        for key in reversed(self._entries):
+            if scanned >= self.semantic_scan_limit:
+                break
+            entry = self._entries[key]
+            if entry.embedding is None or entry.expires_at <= now:
+                continue
+            if len(entry.embedding) != len(query_vec):
+                continue
+            scanned += 1
+            sim = sum(a * b for a, b in zip(query_vec, entry.embedding))
+            if sim >= best_sim:
+                best_sim = sim
+                best = (key, entry)
+
+        return best
+
+    # =========================================================================
+    # INVALIDATION
+    # =========================================================================
+
+    def invalidate(self) -> None:
+        """Drop every cached analysis."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def check_fingerprint(self, fingerprint: str) -> bool:
+        """
+        Record the current catalog fingerprint.
+
+        Clears the cache and returns True when it differs from the last one
+        seen, since cached analyses reference skills/categories/biomes.
+        """
+        with self._lock:
+            previous = self._catalog_fingerprint
+            self._catalog_fingerprint = fingerprint
+        if previous is not None and previous != fingerprint:
+            self.invalidate()
+            return True
+        return False
+
+    # =========================================================================
+    # STATS
+    # =========================================================================
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.semantic_hits + self.misses
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": (self.hits + self.semantic_hits) / lookups if lookups else 0.0
+        }
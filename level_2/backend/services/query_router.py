@@ -0,0 +1,238 @@
+# services/query_router.py
+"""
+Deterministic pre-router for HybridSearchService.
+
+Resolves clear-cut queries without calling Gemini, using the cached
+catalog of known skills, categories and biomes:
+
+    ┌──────────────────────────────────────────────────────────────┐
+    │  "medical skills in the cryo zone"                           │
+    │    trie match   medical → category, cryo → biome             │
+    │    leftovers    (none: skills/in/the/zone are filler)        │
+    │    → KEYWORD  categories=[Medical]  biome=CRYO               │
+    │                                                              │
+    │  "skills similar to first aid"                               │
+    │    pattern      "similar to"                                 │
+    │    → RAG                                                     │
+    │                                                              │
+    │  "someone good with people near the old dam"                 │
+    │    leftovers    good, people, old, dam → ambiguous → LLM     │
+    │                                                              │
+    │  "medics without combat skills"                              │
+    │    negation     without → exclusion the router can't express │
+    │    → LLM                                                     │
+    └──────────────────────────────────────────────────────────────┘
+
+`route()` returns a dict in the same shape as the analyzer's JSON output,
+or None when the query should go to the LLM.
+"""
+
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# "similar to X", "related to X", "skills like X", ...
+_SIMILARITY_RE = re.compile(
+    r"\b(?:similar|related|comparable|akin|equivalent|close)\s+to\b"
+    r"|\b(?:alternatives?|substitutes?)\s+(?:to|for)\b"
+    r"|\b(?:skills?|abilities|ability|someone|anyone|people|survivors?)\s+like\b"
+    r"|\bsimilar\b"
+)
+
+# Words that carry no search meaning on their own (stemmed below)
+_FILLER_WORDS = """
+    a an the and or of in on at to for from with by near around
+    who whom which what where whose is are was be can could has have had do does
+    find show list get give search look looking need needs want me us i we you
+    someone somebody anyone anybody person people survivor survivors member members
+    skill skills ability abilities all any some every that this those these there
+    area areas region regions zone zones biome biomes camp located living live lives
+    please good
+"""
+
+# Exclusions ("medics without combat skills") would route to a search
+# *for* the excluded terms, so any of these sends the query to the LLM.
+# "t" is the tail of don't / can't / isn't after tokenizing.
+_NEGATION_WORDS = """
+    without not no non none nor never except excluding exclude besides
+    lacking lack lacks unless t
+"""
+_NEGATION_PHRASE_RE = re.compile(r"\bother\s+than\b")
+
+_TERMINAL = "$"
+
+
+def _stem(token: str) -> str:
+    """Crude plural folding so "mountains" matches "mountain"."""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def _tokens(text: Optional[str]) -> List[str]:
+    return [_stem(t) for t in _TOKEN_RE.findall((text or "").lower())]
+
+
+_FILLER = frozenset(_tokens(_FILLER_WORDS))
+_NEGATION = frozenset(_tokens(_NEGATION_WORDS))
+
+
+class QueryRouter:
+    """Pattern + token-trie router that skips the LLM for obvious queries."""
+
+    def __init__(self):
+        self._trie: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.resolved = 0
+        self.fallthrough = 0
+
+    # =========================================================================
+    # CATALOG
+    # =========================================================================
+
+    def update(
+        self,
+        skills: Sequence[str],
+        categories: Sequence[str],
+        biomes: Sequence[str]
+    ) -> None:
+        """Rebuild the token trie from the known-values catalog."""
+        trie: Dict[str, Any] = {}
+        for kind, values in (("skill", skills), ("category", categories), ("biome", biomes)):
+            for value in values or []:
+                tokens = _tokens(value)
+                if not tokens:
+                    continue
+                node = trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node.setdefault(_TERMINAL, []).append((kind, value))
+
+        with self._lock:
+            self._trie = trie
+
+    def _match(self, tokens: List[str]) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """
+        Longest-match scan of the tokens against the trie.
+
+        Returns (matched (kind, value) pairs, leftover non-filler tokens).
+        """
+        trie = self._trie
+        matches: List[Tuple[str, str]] = []
+        leftovers: List[str] = []
+
+        i = 0
+        while i < len(tokens):
+            node, end, found = trie, i, None
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                if _TERMINAL in node:
+                    end, found = j + 1, node[_TERMINAL]
+            if found:
+                matches.extend(found)
+                i = end
+            else:
+                if tokens[i] not in _FILLER:
+                    leftovers.append(tokens[i])
+                i += 1
+
+        return matches, leftovers
+
+    # =========================================================================
+    # ROUTING
+    # =========================================================================
+
+    def route(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Return an analysis dict for a clear-cut query, or None if ambiguous.
+        """
+        decision = self._decide(query)
+        with self._lock:
+            if decision is None:
+                self.fallthrough += 1
+            else:
+                self.resolved += 1
+        return decision
+
+    def _decide(self, query: str) -> Optional[Dict[str, Any]]:
+        text = (query or "").lower()
+        if _NEGATION_PHRASE_RE.search(text) or not _NEGATION.isdisjoint(_tokens(text)):
+            return None
+
+        similarity = _SIMILARITY_RE.search(text)
+
+        if similarity:
+            target = text[similarity.end():]
+            # Categories before the phrase filter; after it they're the
+            # thing being compared. Biomes filter wherever they appear.
+            before, _ = self._match(_tokens(text[:similarity.start()]))
+            after, _ = self._match(_tokens(target))
+            filters = [m for m in before if m[0] in ("category", "biome")] \
+                + [m for m in after if m[0] == "biome"]
+            if not _tokens(target):
+                return None
+            if filters:
+                # Similarity plus explicit filters: both legs are useful
+                return self._analysis(
+                    "hybrid", filters, _tokens(target), similarity=True,
+                    reasoning="Rule router: similarity phrase with catalog filters"
+                )
+            return self._analysis(
+                "rag", [], [], similarity=True,
+                reasoning="Rule router: similarity phrase"
+            )
+
+        matches, leftovers = self._match(_tokens(text))
+        if not matches or leftovers:
+            return None
+
+        return self._analysis(
+            "keyword", matches, [], similarity=False,
+            reasoning="Rule router: query fully matched known "
+                      + "/".join(sorted({kind for kind, _ in matches}))
+        )
+
+    @staticmethod
+    def _analysis(
+        method: str,
+        matches: List[Tuple[str, str]],
+        extra_keywords: List[str],
+        similarity: bool,
+        reasoning: str
+    ) -> Dict[str, Any]:
+        categories = list(dict.fromkeys(v for k, v in matches if k == "category"))
+        biomes = [v for k, v in matches if k == "biome"]
+        keywords = list(dict.fromkeys(
+            [v.lower() for k, v in matches if k in ("skill", "category")]
+            + [t for t in extra_keywords if t not in _FILLER]
+        ))
+        return {
+            "recommended_method": method,
+            "keywords": keywords,
+            "categories": categories,
+            "biome_filter": biomes[0] if biomes else None,
+            "needs_similarity_ranking": similarity,
+            "has_specific_filters": bool(categories or biomes),
+            "confidence": 0.9,
+            "reasoning": reasoning
+        }
+
+    # =========================================================================
+    # STATS
+    # =========================================================================
+
+    def stats(self) -> Dict[str, Any]:
+        """Share of routed queries resolved without an LLM call."""
+        total = self.resolved + self.fallthrough
+        return {
+            "resolved": self.resolved,
+            "fallthrough": self.fallthrough,
+            "llm_free_fraction": self.resolved / total if total else 0.0
+        }
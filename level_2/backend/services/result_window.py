@@ -0,0 +1,165 @@
+# services/result_window.py
+"""
+Cached result windows for cursor-paginated search.
+
+The first page of a search runs analysis, embedding and the legs once for
+a small candidate set (the "window", a few pages deep); the window is
+cached and later pages are slices of it. Only a cursor that reaches the
+end of a window that may have more results re-runs the search, for a
+larger limit, and the window grows in place:
+
+    ┌──────────────────────────────────────────────────────────────┐
+    │  page 1   smart_search(limit=30) → window w                  │
+    │           results[0:10]          next_cursor "w.10"          │
+    │  page 2   cache[w]                                           │
+    │           results[10:20]         next_cursor "w.20"          │
+    │  page 3   reaches the end: smart_search(limit=60), extend w  │
+    │           results[20:30]         next_cursor "w.30"          │
+    │  ...      last page              next_cursor None            │
+    └──────────────────────────────────────────────────────────────┘
+
+Growing keeps the results already in the window, in order, and appends
+the new ones, so pages already served never shift.
+
+Cursors are opaque "<window id>.<offset>" strings. Windows live in a
+bounded LRU with a TTL; an expired cursor raises CursorExpiredError and
+the caller starts the search again.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+
+class CursorExpiredError(LookupError):
+    """The cursor's result window was evicted or has expired."""
+
+
+@dataclass
+class ResultWindow:
+    """Candidate set for one search, in final rank order."""
+    query: str
+    analysis: Dict[str, Any]           # smart_search "analysis" block
+    results: Sequence[Any]             # SearchResults (or any SearchResult sequence)
+    expires_at: float
+    method: Any = None                 # SearchMethod used; pinned when growing
+    limit: int = 0                     # Candidate limit the results came from
+    complete: bool = True              # False while a larger limit may add results
+
+
+def encode_cursor(window_id: str, offset: int) -> str:
+    return f"{window_id}.{offset}"
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Split a cursor into (window id, offset); raises ValueError if malformed."""
+    window_id, _, offset = (cursor or "").strip().rpartition(".")
+    if not window_id or not offset.isdigit():
+        raise ValueError(f"Malformed search cursor: {cursor!r}")
+    return window_id, int(offset)
+
+
+class ResultWindowCache:
+    """Bounded LRU + TTL store of result windows keyed by window id."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._windows: "OrderedDict[str, ResultWindow]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def put(
+        self,
+        query: str,
+        analysis: Dict[str, Any],
+        results: Sequence[Any],
+        method: Any = None,
+        limit: Optional[int] = None
+    ) -> str:
+        """
+        Store a window and return its id.
+
+        `limit` is the candidate limit the search ran with; a full window
+        (len(results) >= limit) is marked incomplete so it can grow.
+        """
+        window_id = secrets.token_urlsafe(6)
+        window = ResultWindow(
+            query=query,
+            analysis=analysis,
+            results=results,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            method=method,
+            limit=limit or len(results),
+            complete=limit is None or len(results) < limit
+        )
+        with self._lock:
+            self._windows[window_id] = window
+            while len(self._windows) > self.max_entries:
+                self._windows.popitem(last=False)
+                self.evictions += 1
+        return window_id
+
+    def get(self, window_id: str) -> ResultWindow:
+        """Return a live window (refreshing its LRU position) or raise CursorExpiredError."""
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(window_id)
+            if window is not None and window.expires_at > now:
+                self._windows.move_to_end(window_id)
+                self.hits += 1
+                return window
+            if window is not None:
+                del self._windows[window_id]
+            self.misses += 1
+        raise CursorExpiredError("Search cursor expired; run the search again")
+
+    def extend(self, window: ResultWindow, results: Sequence[Any], limit: int) -> None:
+        """
+        Grow a window with the results of a re-run at a larger `limit`.
+
+        Results already in the window keep their positions; new ones (by
+        id) are appended in their new rank order.
+        """
+        with self._lock:
+            if limit <= window.limit:
+                return  # A concurrent page already grew it
+            seen = {r.id for r in window.results}
+            window.results = window.results + [r for r in results if r.id not in seen]
+            window.limit = limit
+            window.complete = len(results) < limit
+
+    def page(
+        self,
+        window_id: str,
+        window: ResultWindow,
+        offset: int,
+        page_size: int
+    ) -> Tuple[Sequence[Any], Optional[str]]:
+        """Slice one page out of a window; returns (results, next_cursor)."""
+        end = offset + page_size
+        more = end < len(window.results) or not window.complete
+        next_cursor = encode_cursor(window_id, end) if more else None
+        return window.results[offset:end], next_cursor
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._windows)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
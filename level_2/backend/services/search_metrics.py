@@ -0,0 +1,151 @@
+# services/search_metrics.py
+"""
+Per-stage latency instrumentation for hybrid search.
+
+Every stage (analyze, embed, keyword, rag, fusion, format) is timed into
+a process-wide histogram, rendered in Prometheus text format at /metrics.
+When OpenTelemetry is installed each stage is also a span
+("hybrid_search.<stage>"), nested under whatever span is current.
+
+    @traced_stage("keyword")
+    def keyword_search(...): ...
+
+    with stage_timer("fusion", timings):   # also sets timings["fusion_ms"]
+        ...
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from opentelemetry import trace as _otel_trace
+    _tracer = _otel_trace.get_tracer("survivor_network.hybrid_search")
+except ImportError:  # OpenTelemetry is optional
+    _tracer = None
+
+
+STAGES = ("analyze", "embed", "keyword", "rag", "fusion", "format")
+
+# Upper bounds in milliseconds (Prometheus "le" buckets)
+BUCKETS_MS: Tuple[float, ...] = (
+    0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000
+)
+
+
+class _Histogram:
+    """Cumulative-bucket latency histogram for one stage."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)     # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, value: float, error: bool = False) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+        if error:
+            self.errors += 1
+
+
+_histograms: Dict[str, _Histogram] = {}
+_lock = threading.Lock()
+
+
+def observe(stage: str, elapsed_ms: float, error: bool = False) -> None:
+    """Record one stage duration."""
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = _Histogram(BUCKETS_MS)
+        histogram.observe(elapsed_ms, error)
+
+
+@contextmanager
+def stage_timer(stage: str, timings: Optional[Dict[str, Any]] = None) -> Iterator[None]:
+    """
+    Time a stage: histogram, optional OpenTelemetry span and, if given,
+    `timings[f"{stage}_ms"]`.
+    """
+    span_cm = _tracer.start_as_current_span(f"hybrid_search.{stage}") \
+        if _tracer is not None else nullcontext()
+
+    with span_cm as span:
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            observe(stage, elapsed_ms, error)
+            if timings is not None:
+                timings[f"{stage}_ms"] = elapsed_ms
+            if span is not None:
+                span.set_attribute("hybrid_search.elapsed_ms", elapsed_ms)
+
+
+def traced_stage(stage: str) -> Callable:
+    """Decorator: time every call of the function as `stage`."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Per-stage count, error count, sum and mean (ms)."""
+    with _lock:
+        return {
+            stage: {
+                "count": h.count,
+                "errors": h.errors,
+                "sum_ms": h.sum,
+                "mean_ms": h.sum / h.count if h.count else 0.0
+            }
+            for stage, h in _histograms.items()
+        }
+
+
+def render_prometheus() -> str:
+    """Prometheus text exposition of the stage histograms."""
+    name = "hybrid_search_stage_duration_ms"
+    lines: List[str] = [
+        f"# HELP {name} Hybrid search stage latency in milliseconds.",
+        f"# TYPE {name} histogram",
+    ]
+    errors: List[str] = [
+        "# HELP hybrid_search_stage_errors_total Hybrid search stages that raised.",
+        "# TYPE hybrid_search_stage_errors_total counter",
+    ]
+
+    with _lock:
+        stages = sorted(_histograms.items(), key=lambda item: (
+            STAGES.index(item[0]) if item[0] in STAGES else len(STAGES), item[0]
+        ))
+        for stage, h in stages:
+            cumulative = 0
+            for bound, count in zip(h.buckets, h.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {h.sum:.3f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {h.count}')
+            errors.append(f'hybrid_search_stage_errors_total{{stage="{stage}"}} {h.errors}')
+
+    return "\n".join(lines + errors) + "\n"
@@ -0,0 +1,461 @@
+# services/search_results.py
+"""
+Column-oriented search results.
+
+A search returns tens to thousands of survivors with a few matching skills
+each. Instead of a result object, a details dict and a dict per skill for
+every row, SearchResults keeps parallel columns:
+
+    ┌────────────────────────────────────────────────────────────────┐
+    │  per result   ids, names, types, biomes, methods, found_by     │
+    │               (lists of shared references; ids interned)       │
+    │               scores, relevance, best_similarity    float64    │
+    │               match_count                           int32      │
+    │  per skill    skill_offsets   result i owns skill entries      │
+    │  entry                        offsets[i]:offsets[i + 1]        │
+    │               skill_refs      row of the skill table           │
+    │               skill_relevance, skill_similarity     float64    │
+    │  skill table  id / name / category, once per distinct skill;   │
+    │               shared by the result sets sliced from this one   │
+    └────────────────────────────────────────────────────────────────┘
+
+NaN (floats) and -1 (match_count) mean "not reported by this method".
+
+Indexing hands out SearchResult views (two slots) on demand. A view's
+`details` rebuilds the nested dict the search methods used to return,
+only for consumers that want a mapping (the NDJSON route). Slicing,
+re-ordering and concatenation gather columns; nothing is copied per row.
+"""
+
+import math
+import sys
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+# (skill_id, name, category, relevance, similarity); None = not reported
+SkillMatch = Tuple[str, str, Optional[str], Optional[float], Optional[float]]
+
+_NAN = float("nan")
+
+# Per-result columns: Python lists of shared references / NumPy arrays
+_ROW_LISTS = ("ids", "names", "types", "biomes", "methods", "found_by")
+_ROW_ARRAYS = ("scores", "relevance", "best_similarity", "match_count")
+# Per-skill-entry arrays (indexed through skill_offsets)
+_ENTRY_ARRAYS = ("skill_refs", "skill_relevance", "skill_similarity")
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+class _SkillTable:
+    """Distinct skills of a result set. Rows are never removed or changed."""
+
+    __slots__ = ("ids", "names", "categories")
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.categories: List[Optional[str]] = []
+
+
+class SearchResult:
+    """
+    One row of a SearchResults, made when it's accessed. Read-only.
+
+    Equal (and hashed) by survivor id, like the results it replaces.
+    """
+
+    __slots__ = ("_results", "_row")
+
+    def __init__(self, results: "SearchResults", row: int):
+        self._results = results
+        self._row = row
+
+    @property
+    def id(self) -> str:
+        return self._results.ids[self._row]
+
+    @property
+    def name(self) -> str:
+        return self._results.names[self._row]
+
+    @property
+    def type(self) -> str:
+        return self._results.types[self._row]
+
+    @property
+    def score(self) -> float:
+        return float(self._results.scores[self._row])
+
+    @property
+    def method(self) -> Any:
+        return self._results.methods[self._row]
+
+    @property
+    def found_by(self) -> Optional[str]:
+        return self._results.found_by[self._row]
+
+    @property
+    def biome(self) -> Optional[str]:
+        return self._results.biomes[self._row]
+
+    def skill_names(self, limit: Optional[int] = None) -> List[str]:
+        """Matching skill names in the order the method ranked them."""
+        results = self._results
+        start, end = results._skill_span(self._row)
+        if limit is not None:
+            end = min(end, start + limit)
+        names = results._skills.names
+        return [names[ref] for ref in results.skill_refs[start:end].tolist()]
+
+    @property
+    def details(self) -> Dict[str, Any]:
+        """
+        The method's details as a nested dict: biome, matching_skills and
+        whichever of match_count / relevance / best_similarity it reports.
+        Built on every access; read the columns where you can.
+        """
+        results, row = self._results, self._row
+        table = results._skills
+        start, end = results._skill_span(row)
+
+        skills = []
+        for ref, relevance, similarity in zip(
+            results.skill_refs[start:end].tolist(),
+            results.skill_relevance[start:end].tolist(),
+            results.skill_similarity[start:end].tolist()
+        ):
+            skill = {"id": table.ids[ref], "name": table.names[ref], "category": table.categories[ref]}
+            if not math.isnan(relevance):
+                skill["relevance"] = relevance
+            if not math.isnan(similarity):
+                skill["similarity"] = similarity
+            skills.append(skill)
+
+        details: Dict[str, Any] = {"biome": results.biomes[row], "matching_skills": skills}
+        match_count = int(results.match_count[row])
+        if match_count >= 0:
+            details["match_count"] = match_count
+        relevance = float(results.relevance[row])
+        if not math.isnan(relevance):
+            details["relevance"] = relevance
+        best_similarity = float(results.best_similarity[row])
+        if not math.isnan(best_similarity):
+            details["best_similarity"] = best_similarity
+        return details
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __eq__(self, other):
+        return isinstance(other, SearchResult) and self.id == other.id
+
+    def __repr__(self):
+        return f"SearchResult(id={self.id!r}, name={self.name!r}, score={self.score:.4f})"
+
+
+class SearchResults(Sequence):
+    """Ranked search results, stored column-wise (see module docstring)."""
+
+    __slots__ = _ROW_LISTS + _ROW_ARRAYS + _ENTRY_ARRAYS + ("skill_offsets", "_skills")
+
+    def __init__(self, columns: Dict[str, Any], skills: _SkillTable):
+        for name in _ROW_LISTS + _ROW_ARRAYS + _ENTRY_ARRAYS + ("skill_offsets",):
+            setattr(self, name, columns[name])
+        self._skills = skills
+
+    @classmethod
+    def empty(cls) -> "SearchResults":
+        return SearchResultsBuilder().build()
+
+    @classmethod
+    def of(cls, results: Iterable[SearchResult]) -> "SearchResults":
+        """`results` as a SearchResults (as-is if it already is one)."""
+        if isinstance(results, SearchResults):
+            return results
+        builder = SearchResultsBuilder()
+        for result in results:
+            builder.add_row(result._results, result._row)
+        return builder.build()
+
+    @classmethod
+    def from_legs(
+        cls,
+        legs: List["SearchResults"],
+        positions: np.ndarray,
+        scores: np.ndarray,
+        methods: List[Any],
+        found_by: List[Optional[str]]
+    ) -> "SearchResults":
+        """
+        Fused rows of several result sets, gathered column-wise.
+
+        `positions` is (legs, n): row of each leg for output row j, or -1.
+        Row fields come from the last leg that has the row; skills are the
+        union by skill id over the legs in order: a skill keeps its first
+        position and the values of the last leg that has it, like
+        successive dict updates. Deduplicated with one np.unique over all
+        rows instead of a dict per row.
+        """
+        n = positions.shape[1]
+        if n == 0:
+            return cls.empty()
+
+        present = positions >= 0
+        base = len(legs) - 1 - np.argmax(present[::-1], axis=0)
+        base_rows = positions[base, np.arange(n)]
+
+        columns: Dict[str, Any] = {"methods": list(methods), "found_by": list(found_by)}
+        picks = list(zip(base.tolist(), base_rows.tolist()))
+        for name in ("ids", "names", "types", "biomes"):
+            leg_columns = [getattr(leg, name) for leg in legs]
+            columns[name] = [leg_columns[leg][row] for leg, row in picks]
+        columns["scores"] = np.asarray(scores, dtype=np.float64)
+        for name in ("relevance", "best_similarity", "match_count"):
+            column = np.empty(n, dtype=getattr(legs[0], name).dtype)
+            for leg_no, leg in enumerate(legs):
+                mask = base == leg_no
+                column[mask] = getattr(leg, name)[base_rows[mask]]
+            columns[name] = column
+
+        # One skill table for the output; each leg's refs remapped into it
+        skills, skill_row = _SkillTable(), {}
+        remaps = []
+        for leg in legs:
+            table = leg._skills
+            remap = np.empty(len(table.ids), dtype=np.int64)
+            for ref, skill_id in enumerate(table.ids):
+                target = skill_row.get(skill_id)
+                if target is None:
+                    target = skill_row[skill_id] = len(skills.ids)
+                    skills.ids.append(skill_id)
+                    skills.names.append(table.names[ref])
+                    skills.categories.append(table.categories[ref])
+                remap[ref] = target
+            remaps.append(remap)
+
+        # Every leg's entries, back to back, with the global skill ref
+        entry_base = np.cumsum([0] + [len(leg.skill_refs) for leg in legs])
+        all_refs = np.concatenate([remap[leg.skill_refs] for remap, leg in zip(remaps, legs)])
+        all_relevance = np.concatenate([leg.skill_relevance for leg in legs])
+        all_similarity = np.concatenate([leg.skill_similarity for leg in legs])
+
+        # (output row, leg) pairs in row-major order -> their entry ranges
+        rows, leg_nos = np.nonzero(present.T)
+        leg_rows = positions[leg_nos, rows]
+        starts = np.empty(len(rows), dtype=np.int64)
+        lengths = np.empty(len(rows), dtype=np.int64)
+        for leg_no, leg in enumerate(legs):
+            mask = leg_nos == leg_no
+            offsets = leg.skill_offsets
+            starts[mask] = offsets[leg_rows[mask]] + entry_base[leg_no]
+            lengths[mask] = offsets[leg_rows[mask] + 1] - offsets[leg_rows[mask]]
+        ends = np.cumsum(lengths)
+        entries = np.repeat(starts - (ends - lengths), lengths) + np.arange(ends[-1] if len(ends) else 0)
+        entry_rows = np.repeat(rows, lengths)
+
+        # Union by (row, skill): first occurrence keeps the slot, last one the values
+        refs = all_refs[entries]
+        keys = entry_rows * len(skills.ids) + refs
+        _, first = np.unique(keys, return_index=True)
+        _, last_reversed = np.unique(keys[::-1], return_index=True)
+        order = np.argsort(first, kind="stable")
+        first, last = first[order], (len(keys) - 1 - last_reversed)[order]
+
+        columns["skill_refs"] = refs[first].astype(np.int32)
+        columns["skill_relevance"] = all_relevance[entries[last]]
+        columns["skill_similarity"] = all_similarity[entries[last]]
+        skill_offsets = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(entry_rows[first], minlength=n), out=skill_offsets[1:])
+        columns["skill_offsets"] = skill_offsets
+        return cls(columns, skills)
+
+    # =========================================================================
+    # SEQUENCE
+    # =========================================================================
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[SearchResult, "SearchResults"]:
+        if isinstance(key, slice):
+            return self.take(range(len(self))[key])
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("search result index out of range")
+        return SearchResult(self, key)
+
+    def __iter__(self) -> Iterator[SearchResult]:
+        for row in range(len(self)):
+            yield SearchResult(self, row)
+
+    def __add__(self, other: Iterable[SearchResult]) -> "SearchResults":
+        """Concatenation; `other` may be a SearchResults or SearchResult views."""
+        builder = SearchResultsBuilder()
+        for row in range(len(self)):
+            builder.add_row(self, row)
+        if isinstance(other, SearchResults):
+            for row in range(len(other)):
+                builder.add_row(other, row)
+        else:
+            for result in other:
+                builder.add_row(result._results, result._row)
+        return builder.build()
+
+    def __repr__(self):
+        return f"SearchResults({len(self)} results)"
+
+    # =========================================================================
+    # RE-ORDERING
+    # =========================================================================
+
+    def take(self, positions: Iterable[int]) -> "SearchResults":
+        """The results at `positions`, in that order (columns are gathered)."""
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1)
+        starts = self.skill_offsets[positions].astype(np.int64)
+        lengths = self.skill_offsets[positions + 1] - starts
+        offsets = np.zeros(len(positions) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=offsets[1:])
+        entries = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+
+        picked = positions.tolist()
+        columns: Dict[str, Any] = {"skill_offsets": offsets}
+        for name in _ROW_LISTS:
+            column = getattr(self, name)
+            columns[name] = [column[i] for i in picked]
+        for name in _ROW_ARRAYS:
+            columns[name] = getattr(self, name)[positions]
+        for name in _ENTRY_ARRAYS:
+            columns[name] = getattr(self, name)[entries]
+        return SearchResults(columns, self._skills)
+
+    def sorted_by_score(self) -> "SearchResults":
+        """Best score first; ties keep their current order."""
+        return self.take(np.argsort(-self.scores, kind="stable"))
+
+    def _skill_span(self, row: int) -> Tuple[int, int]:
+        return int(self.skill_offsets[row]), int(self.skill_offsets[row + 1])
+
+
+class SearchResultsBuilder:
+    """Appends results row by row, then builds the columns once."""
+
+    def __init__(self):
+        self._rows: Dict[str, list] = {name: [] for name in _ROW_LISTS + _ROW_ARRAYS}
+        self._entries: Dict[str, list] = {name: [] for name in _ENTRY_ARRAYS}
+        self._offsets = [0]
+        self._skills = _SkillTable()
+        self._skill_row: Dict[str, int] = {}
+
+    def add(
+        self,
+        id: str,
+        name: str,
+        score: float,
+        method: Any,
+        *,
+        type: str = "survivor",
+        biome: Optional[str] = None,
+        skills: Iterable[SkillMatch] = (),
+        match_count: Optional[int] = None,
+        relevance: Optional[float] = None,
+        best_similarity: Optional[float] = None,
+        found_by: Optional[str] = None
+    ) -> None:
+        """Append one result; `skills` are (id, name, category, relevance, similarity)."""
+        # _add_skill inlined: this is the per-skill loop of every search leg
+        skill_row, table = self._skill_row, self._skills
+        refs = self._entries["skill_refs"]
+        relevances = self._entries["skill_relevance"]
+        similarities = self._entries["skill_similarity"]
+        for skill_id, skill_name, category, skill_relevance, similarity in skills:
+            ref = skill_row.get(skill_id)
+            if ref is None:
+                ref = skill_row[skill_id] = len(table.ids)
+                table.ids.append(sys.intern(skill_id))
+                table.names.append(skill_name)
+                table.categories.append(category)
+            refs.append(ref)
+            relevances.append(_NAN if skill_relevance is None else skill_relevance)
+            similarities.append(_NAN if similarity is None else similarity)
+        self._add_row(
+            sys.intern(id), name, type, biome, method, found_by,
+            score, relevance, best_similarity, match_count
+        )
+
+    def add_row(
+        self,
+        source: SearchResults,
+        row: int
+    ) -> None:
+        """Copy result `row` of `source` (skills re-keyed into this builder's table)."""
+        table = source._skills
+        start, end = source._skill_span(row)
+        for entry, ref in enumerate(source.skill_refs[start:end].tolist(), start):
+            self._add_skill(
+                table.ids[ref], table.names[ref], table.categories[ref],
+                _optional(float(source.skill_relevance[entry])),
+                _optional(float(source.skill_similarity[entry]))
+            )
+
+        match_count = int(source.match_count[row])
+        self._add_row(
+            source.ids[row], source.names[row], source.types[row], source.biomes[row],
+            source.methods[row], source.found_by[row], float(source.scores[row]),
+            _optional(float(source.relevance[row])),
+            _optional(float(source.best_similarity[row])),
+            match_count if match_count >= 0 else None
+        )
+
+    def build(self) -> SearchResults:
+        rows, entries = self._rows, self._entries
+        columns: Dict[str, Any] = {name: rows[name] for name in _ROW_LISTS}
+        columns["scores"] = np.array(rows["scores"], dtype=np.float64)
+        columns["relevance"] = np.array(rows["relevance"], dtype=np.float64)
+        columns["best_similarity"] = np.array(rows["best_similarity"], dtype=np.float64)
+        columns["match_count"] = np.array(rows["match_count"], dtype=np.int32)
+        columns["skill_offsets"] = np.array(self._offsets, dtype=np.int32)
+        columns["skill_refs"] = np.array(entries["skill_refs"], dtype=np.int32)
+        columns["skill_relevance"] = np.array(entries["skill_relevance"], dtype=np.float64)
+        columns["skill_similarity"] = np.array(entries["skill_similarity"], dtype=np.float64)
+        return SearchResults(columns, self._skills)
+
+    def _add_skill(
+        self,
+        skill_id: str,
+        name: str,
+        category: Optional[str],
+        relevance: Optional[float],
+        similarity: Optional[float]
+    ) -> None:
+        ref = self._skill_row.get(skill_id)
+        if ref is None:
+            ref = self._skill_row[skill_id] = len(self._skills.ids)
+            self._skills.ids.append(sys.intern(skill_id))
+            self._skills.names.append(name)
+            self._skills.categories.append(category)
+        self._entries["skill_refs"].append(ref)
+        self._entries["skill_relevance"].append(_NAN if relevance is None else relevance)
+        self._entries["skill_similarity"].append(_NAN if similarity is None else similarity)
+
+    def _add_row(
+        self, id, name, type, biome, method, found_by,
+        score, relevance, best_similarity, match_count
+    ) -> None:
+        rows = self._rows
+        rows["ids"].append(id)
+        rows["names"].append(name)
+        rows["types"].append(type)
+        rows["biomes"].append(biome)
+        rows["methods"].append(method)
+        rows["found_by"].append(found_by)
+        rows["scores"].append(score)
+        rows["relevance"].append(_NAN if relevance is None else relevance)
+        rows["best_similarity"].append(_NAN if best_similarity is None else best_similarity)
+        rows["match_count"].append(-1 if match_count is None else match_count)
+        self._offsets.append(len(self._entries["skill_refs"]))
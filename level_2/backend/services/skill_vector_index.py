@@ -0,0 +1,270 @@
+# services/skill_vector_index.py
+"""
+In-process vector index over Skills.skill_embedding.
+
+The skill catalog is small and changes rarely, so instead of ranking with
+COSINE_DISTANCE across Survivors ⋈ SurvivorHasSkill ⋈ Skills on every
+query, the embeddings are held in a NumPy matrix:
+
+    ┌───────────────────────────────────────────────────────────┐
+    │  load()     SELECT skill_id, ..., skill_embedding         │
+    │             → L2-normalized float32 matrix (n_skills × d) │
+    │  refresh()  per-row checksums → fetch new/changed rows,   │
+    │             drop deleted ones                             │
+    │  invalidate()  graph write → refresh on next use          │
+    │  search()   Q (m × d) @ Mᵀ → top-k per query (batched)    │
+    └───────────────────────────────────────────────────────────┘
+
+Survivors for the top skills are then resolved by the caller in a single
+keyed lookup on SurvivorHasSkill.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from google.cloud.spanner_v1 import param_types
+
+
+@dataclass(frozen=True)
+class SkillHit:
+    """A skill matched by the index."""
+    skill_id: str
+    name: str
+    category: Optional[str]
+    distance: float                    # cosine distance, 0 = identical
+
+
+@dataclass(frozen=True)
+class _IndexData:
+    """Immutable index contents, swapped atomically on refresh."""
+    ids: Tuple[str, ...]
+    names: Tuple[str, ...]
+    categories: Tuple[Optional[str], ...]
+    checksums: Tuple[int, ...]         # _ROW_CHECKSUM per row
+    matrix: np.ndarray                 # (n, d) float32, rows L2-normalized
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+# Changes whenever a skill is renamed, recategorized or re-embedded; the
+# tables carry no commit timestamps to compare instead
+_ROW_CHECKSUM = """FARM_FINGERPRINT(CONCAT(
+    name, '|', IFNULL(category, ''), '|', TO_JSON_STRING(skill_embedding)))"""
+
+
+class SkillVectorIndex:
+    """NumPy-backed cosine index of skill embeddings."""
+
+    def __init__(self, database, refresh_interval: float = 300.0):
+        self.database = database
+        self.refresh_interval = refresh_interval
+
+        self._data: Optional[_IndexData] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._generation = 0               # bumped by invalidate()
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._data is not None
+
+    def __len__(self) -> int:
+        data = self._data
+        return len(data.ids) if data else 0
+
+    # =========================================================================
+    # LOADING
+    # =========================================================================
+
+    def load(self) -> None:
+        """Load every embedded skill (full rebuild)."""
+        generation = self._generation
+        rows = self._fetch_rows()
+        self._swap(self._build(rows), generation)
+
+    def refresh(self) -> None:
+        """
+        Incrementally refresh the index.
+
+        Only skills that are new or whose row checksum changed are fetched
+        with their embeddings; skills no longer present are dropped.
+        """
+        data = self._data
+        if data is None:
+            self.load()
+            return
+
+        generation = self._generation
+        with self.database.snapshot() as snapshot:
+            current = {
+                row[0]: row[1] for row in snapshot.execute_sql(
+                    f"SELECT skill_id, {_ROW_CHECKSUM} FROM Skills "
+                    "WHERE skill_embedding IS NOT NULL"
+                )
+            }
+
+        known = dict(zip(data.ids, data.checksums))
+        stale_ids = [
+            skill_id for skill_id, checksum in current.items()
+            if known.get(skill_id) != checksum
+        ]
+        removed = known.keys() - current.keys()
+
+        if not stale_ids and not removed:
+            self._swap(data, generation)
+            return
+
+        stale = set(stale_ids)
+        keep = [
+            i for i, skill_id in enumerate(data.ids)
+            if skill_id not in removed and skill_id not in stale
+        ]
+        rows = [
+            (data.ids[i], data.names[i], data.categories[i], data.checksums[i], data.matrix[i])
+            for i in keep
+        ]
+        if stale_ids:
+            rows.extend(self._fetch_rows(stale_ids))
+
+        self._swap(self._build(rows), generation)
+
+    def invalidate(self) -> None:
+        """Mark the index stale (e.g. after a graph write); the next ensure_fresh() refreshes it."""
+        self._generation += 1
+        self.loaded_at = None
+
+    def ensure_fresh(self, executor=None) -> None:
+        """
+        Kick off a refresh if the index is older than refresh_interval.
+
+        Runs on `executor` when given so searches never wait on it.
+        """
+        if self.loaded_at is not None and \
+                time.monotonic() - self.loaded_at < self.refresh_interval:
+            return
+
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Skill vector index refresh failed: {e}")
+            finally:
+                self._refreshing = False
+
+        if executor is not None:
+            executor.submit(run)
+        else:
+            run()
+
+    def _fetch_rows(self, skill_ids: Optional[List[str]] = None) -> list:
+        sql = f"""
+            SELECT skill_id, name, category, {_ROW_CHECKSUM}, skill_embedding
+            FROM Skills
+            WHERE skill_embedding IS NOT NULL
+        """
+        params, types = None, None
+        if skill_ids is not None:
+            sql += " AND skill_id IN UNNEST(@skill_ids)"
+            params = {"skill_ids": skill_ids}
+            types = {"skill_ids": param_types.Array(param_types.STRING)}
+
+        with self.database.snapshot() as snapshot:
+            return [
+                (row[0], row[1], row[2], row[3], row[4])
+                for row in snapshot.execute_sql(sql, params=params, param_types=types)
+            ]
+
+    @staticmethod
+    def _build(rows: Sequence[tuple]) -> _IndexData:
+        if not rows:
+            return _IndexData((), (), (), (), np.zeros((0, 0), dtype=np.float32))
+
+        matrix = np.asarray([row[4] for row in rows], dtype=np.float32)
+        return _IndexData(
+            ids=tuple(row[0] for row in rows),
+            names=tuple(row[1] for row in rows),
+            categories=tuple(row[2] for row in rows),
+            checksums=tuple(row[3] for row in rows),
+            matrix=_normalize_rows(matrix)
+        )
+
+    def _swap(self, data: _IndexData, generation: int) -> None:
+        self._data = data
+        # Invalidated while reading: serve this data but stay stale
+        self.loaded_at = time.monotonic() if generation == self._generation else None
+
+    # =========================================================================
+    # SEARCH
+    # =========================================================================
+
+    def search(
+        self,
+        query_vectors: Sequence[Sequence[float]],
+        k: int = 10,
+        exclude_names: Optional[Sequence[Optional[str]]] = None
+    ) -> List[List[SkillHit]]:
+        """
+        Batched top-k cosine search.
+
+        Args:
+            query_vectors: One embedding per query (m × d)
+            k: Hits to return per query
+            exclude_names: Optional per-query skill name to skip
+                (case-insensitive), e.g. the skill being compared against
+
+        Returns:
+            One list of SkillHit per query, nearest first
+        """
+        data = self._data
+        if data is None or not data.ids or not len(query_vectors):
+            return [[] for _ in query_vectors]
+
+        queries = _normalize_rows(np.asarray(query_vectors, dtype=np.float32))
+        if queries.shape[1] != data.matrix.shape[1]:
+            raise ValueError(
+                f"Query dimension {queries.shape[1]} does not match "
+                f"index dimension {data.matrix.shape[1]}"
+            )
+
+        sims = queries @ data.matrix.T                       # (m, n)
+        n = sims.shape[1]
+        # Over-fetch by one so an excluded name can be skipped
+        take = min(k + (1 if exclude_names else 0), n)
+
+        if take < n:
+            top = np.argpartition(-sims, take - 1, axis=1)[:, :take]
+        else:
+            top = np.tile(np.arange(n), (sims.shape[0], 1))
+
+        results: List[List[SkillHit]] = []
+        for qi in range(sims.shape[0]):
+            order = top[qi][np.argsort(-sims[qi, top[qi]])]
+            exclude = (exclude_names[qi] or "").lower() if exclude_names else ""
+            hits = []
+            for idx in order:
+                if exclude and (data.names[idx] or "").lower() == exclude:
+                    continue
+                hits.append(SkillHit(
+                    skill_id=data.ids[idx],
+                    name=data.names[idx],
+                    category=data.categories[idx],
+                    distance=float(1.0 - sims[qi, idx])
+                ))
+                if len(hits) >= k:
+                    break
+            results.append(hits)
+
+        return results
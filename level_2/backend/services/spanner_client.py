@@ -0,0 +1,136 @@
+# services/spanner_client.py
+"""
+Process-wide Spanner client, database handles and session pool.
+
+Every service (SpannerService, SpannerGraphService, HybridSearchService,
+the agent tools and the API routes) reads through the same handle, so
+auth, gRPC channels and sessions are set up once per process:
+
+    ┌────────────────────────────────────────────────────────────────┐
+    │  get_client(project)          one spanner.Client per project   │
+    │  get_database(project,        one Database + session pool per  │
+    │               instance, db)   (project, instance, database)    │
+    │  warm_up()                    app startup: bind the pool and   │
+    │                               run SELECT 1 before traffic      │
+    └────────────────────────────────────────────────────────────────┘
+
+Pool configuration (config.settings, from the environment / .env):
+    SPANNER_POOL_TYPE            fixed (FixedSizePool) | pinging (PingingPool)
+    SPANNER_POOL_SIZE            sessions per database (default 40)
+    SPANNER_POOL_TIMEOUT         seconds to wait for a free session (default 10)
+    SPANNER_POOL_PING_INTERVAL   PingingPool: idle seconds before a session
+                                 is pinged (default 300)
+
+Every read holds its session only for the snapshot's lifetime, so
+long-running readers (the NDJSON graph stream) take a short snapshot per
+page instead of pinning a session for the whole response.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from google.cloud import spanner
+
+from config import settings
+
+_lock = threading.Lock()
+_clients: Dict[Optional[str], spanner.Client] = {}
+_databases: Dict[Tuple[Optional[str], Optional[str], Optional[str]], object] = {}
+
+
+def _make_pool(size: Optional[int] = None):
+    """Session pool from settings.SPANNER_POOL_* (an explicit `size` wins)."""
+    pool_type = settings.SPANNER_POOL_TYPE
+    size = size or settings.SPANNER_POOL_SIZE
+    timeout = settings.SPANNER_POOL_TIMEOUT
+
+    if pool_type == "pinging":
+        return spanner.PingingPool(
+            size=size,
+            default_timeout=timeout,
+            ping_interval=settings.SPANNER_POOL_PING_INTERVAL
+        )
+    if pool_type != "fixed":
+        print(f"Unknown SPANNER_POOL_TYPE '{pool_type}', using fixed")
+    return spanner.FixedSizePool(size=size, default_timeout=timeout)
+
+
+def _start_pinger(pool) -> None:
+    """Keep idle PingingPool sessions alive from a daemon thread."""
+    # ping() only touches sessions idle past the interval, so poll often
+    interval = min(30, settings.SPANNER_POOL_PING_INTERVAL)
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                pool.ping()
+            except Exception as e:
+                print(f"Spanner session ping failed: {e}")
+
+    threading.Thread(target=run, name="spanner-pool-ping", daemon=True).start()
+
+
+def get_client(project_id: Optional[str] = None) -> spanner.Client:
+    """Shared client for `project_id` (default PROJECT_ID)."""
+    project_id = project_id or os.getenv("PROJECT_ID")
+    with _lock:
+        client = _clients.get(project_id)
+        if client is None:
+            client = spanner.Client(project=project_id)
+            _clients[project_id] = client
+        return client
+
+
+def get_database(
+    project_id: Optional[str] = None,
+    instance_id: Optional[str] = None,
+    database_id: Optional[str] = None,
+    pool_size: Optional[int] = None
+):
+    """
+    Shared database handle (defaults PROJECT_ID / INSTANCE_ID / DATABASE_ID).
+
+    The session pool is created with the first handle; `pool_size` only
+    applies then.
+    """
+    project_id = project_id or os.getenv("PROJECT_ID")
+    instance_id = instance_id or os.getenv("INSTANCE_ID")
+    database_id = database_id or os.getenv("DATABASE_ID")
+    key = (project_id, instance_id, database_id)
+
+    database = _databases.get(key)
+    if database is not None:
+        return database
+
+    client = get_client(project_id)
+    with _lock:
+        database = _databases.get(key)
+        if database is None:
+            pool = _make_pool(pool_size)
+            # Binding the pool creates its sessions up front
+            database = client.instance(instance_id).database(database_id, pool=pool)
+            if isinstance(pool, spanner.PingingPool):
+                _start_pinger(pool)
+            _databases[key] = database
+        return database
+
+
+def warm_up() -> bool:
+    """
+    Create the default client, database handle and session pool and run
+    one query through them. Called at application startup; failures are
+    reported, not raised, so the API still starts without Spanner.
+    """
+    start = time.perf_counter()
+    try:
+        database = get_database()
+        with database.snapshot() as snapshot:
+            list(snapshot.execute_sql("SELECT 1"))
+    except Exception as e:
+        print(f"Spanner warm-up failed: {e}")
+        return False
+    print(f"Spanner pool warmed up in {(time.perf_counter() - start) * 1000:.0f}ms")
+    return True
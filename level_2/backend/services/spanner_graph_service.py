@@ -2,12 +2,14 @@ import uuid
 import logging
 from datetime import datetime
 from typing import Dict, Any, List, Optional
-from google.cloud import spanner
 from google.cloud.spanner_v1 import param_types
 from extractors.base_extractor import (
     ExtractionResult, ExtractedEntity, ExtractedRelationship,
     EntityType, RelationshipType
 )
+from services.graph_cache import graph_cache
+from services.graph_events import notify_graph_changed
+from services.spanner_client import get_client, get_database
 import os
 
 logger = logging.getLogger(__name__)
@@ -15,10 +17,11 @@ logger = logging.getLogger(__name__)
 class SpannerGraphService:
     """Service to sync extracted data to Spanner Graph DB"""
     
-    def __init__(self):
-        self.client = spanner.Client(project=os.getenv('PROJECT_ID'))
+    def __init__(self, database: Optional[Any] = None):
+        # Process-wide client and session pool (services/spanner_client.py)
+        self.client = get_client()
         self.instance = self.client.instance(os.getenv('INSTANCE_ID'))
-        self.database = self.instance.database(os.getenv('DATABASE_ID'))
+        self.database = database if database is not None else get_database()
         
         # Map EntityType to table info
         self.node_table_config = {
@@ -279,11 +282,13 @@ class SpannerGraphService:
         
         stats = {
             'entities_created': 0, 'entities_found_existing': 0,
-            'relationships_created': 0, 'broadcast_id': None, 'errors': []
+            'relationships_created': 0, 'broadcast_id': None, 'errors': [],
+            'survivor_ids': []
         }
         
         def transaction_work(transaction):
             entity_id_map = {}
+            touched_survivors = set()
             
             # 1. Process entities
             for entity in extraction_result.entities:
@@ -343,14 +348,26 @@ class SpannerGraphService:
 
                 bid = self._create_broadcast(transaction, extraction_result.media_uri, extraction_result, b_survivor_id)
                 stats['broadcast_id'] = bid
+                touched_survivors.add(b_survivor_id)
             except Exception as e:
                 logger.error(f"Broadcast error: {e}")
+            
+            # Survivors whose nodes/edges were written (for cache refresh)
+            for entity in extraction_result.entities:
+                if entity.entity_type == EntityType.SURVIVOR and entity.name in entity_id_map:
+                    touched_survivors.add(entity_id_map[entity.name])
+            stats['survivor_ids'] = sorted(s for s in touched_survivors if s)
 
         try:
             self.database.run_in_transaction(transaction_work)
         except Exception as e:
              stats['errors'].append(str(e))
              logger.error(f"Transaction failed: {e}")
+        else:
+            # The cached full graph is now out of date
+            graph_cache.invalidate()
+            # Let in-process caches/indexes refresh
+            notify_graph_changed(stats)
         
         return stats
 
@@ -1,18 +1,19 @@
 import os
+import threading
 from typing import List, Dict, Any, Optional
-from google.cloud import spanner
+from services.spanner_client import get_client, get_database
 
 class SpannerService:
-    def __init__(self):
+    def __init__(self, database: Optional[Any] = None):
         # Set credentials if provided
         creds = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
         if creds:
             os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = creds
         
-        # Initialize Spanner client
-        self.client = spanner.Client(project=os.getenv('PROJECT_ID'))
+        # Process-wide client and session pool (services/spanner_client.py)
+        self.client = get_client()
         self.instance = self.client.instance(os.getenv('INSTANCE_ID'))
-        self.database = self.instance.database(os.getenv('DATABASE_ID'))
+        self.database = database if database is not None else get_database()
         self.graph_name = os.getenv('GRAPH_NAME')
 
     def execute_gql(self, query: str) -> List[Dict[str, Any]]:
@@ -45,6 +46,27 @@ class SpannerService:
             print(f"Error executing GQL query: {e}")
             raise
 
+    def execute_sql(
+        self,
+        sql: str,
+        params: Optional[Dict[str, Any]] = None,
+        param_types: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a parameterized SQL read in a single-use snapshot.
+        Returns a list of result dictionaries keyed by column name.
+        """
+        try:
+            with self.database.snapshot() as snapshot:
+                results = snapshot.execute_sql(sql, params=params, param_types=param_types)
+                rows = list(results)
+                names = [field.name for field in results.fields]
+                return [dict(zip(names, row)) for row in rows]
+                
+        except Exception as e:
+            print(f"Error executing SQL query: {e}")
+            raise
+
     def execute_update(self, query: str) -> None:
         """
         Execute a DML (Data Manipulation Language) query against Spanner Graph.
@@ -94,3 +116,17 @@ class SpannerService:
             print(f"Error getting edge: {e}")
             return None
 
+
+# Shared instance for the API routes and agent tools
+_shared: Optional[SpannerService] = None
+_shared_lock = threading.Lock()
+
+
+def get_spanner_service() -> SpannerService:
+    """Process-wide SpannerService (FastAPI dependency)."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = SpannerService()
+    return _shared
@@ -5,6 +5,7 @@ Or:  python setup_database.py --project=your-project-id
 """
 
 from google.cloud import spanner
+from google.cloud.spanner_v1 import param_types
 from google.cloud.spanner_admin_instance_v1 import (
     Instance as InstancePB,
     CreateInstanceRequest,
@@ -25,6 +26,11 @@ GRAPH_NAME = os.getenv("GRAPH_NAME", "SurvivorGraph")
 PROJECT_ID = os.getenv("PROJECT_ID", None)
 REGION = os.getenv("REGION", "us-central1")
 
+# Skill embeddings (TextEmbeddings / text-embedding-004 → 768 dimensions)
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "768"))
+# Vector index partitions; roughly sqrt(number of embedded skills)
+VECTOR_INDEX_LEAVES = int(os.getenv("VECTOR_INDEX_LEAVES", "100"))
+
 # DDL Statements
 DDL_STATEMENTS = [
     # Node Tables
@@ -43,8 +49,9 @@ DDL_STATEMENTS = [
         category STRING(50),
         icon STRING(50),
         color STRING(7),
-        description STRING(MAX)
-    ) PRIMARY KEY (skill_id)""",
+        description STRING(MAX),
+        skill_embedding ARRAY<FLOAT64>(vector_length=>%d)
+    ) PRIMARY KEY (skill_id)""" % EMBEDDING_DIM,
     
     """CREATE TABLE Needs (
         need_id STRING(36) NOT NULL,
@@ -131,6 +138,47 @@ DDL_STATEMENTS = [
         need_id STRING(36) NOT NULL,
         effectiveness STRING(20)
     ) PRIMARY KEY (skill_id, need_id)""",
+    
+    # Secondary indexes
+    # Skill -> survivors lookup (used when ranking skills in-process)
+    """CREATE INDEX SurvivorHasSkillBySkill ON SurvivorHasSkill (skill_id)""",
+    # Need -> survivors and biome -> survivors (biome-filtered graph pages)
+    """CREATE INDEX SurvivorHasNeedByNeed ON SurvivorHasNeed (need_id)""",
+    """CREATE INDEX SurvivorsByBiome ON Survivors (biome) STORING (name, role)""",
+]
+
+# Full-text search (keyword_search FULLTEXT engine)
+# Also applicable to an existing database with --search-indexes
+SEARCH_DDL_STATEMENTS = [
+    """ALTER TABLE Skills ADD COLUMN name_tokens TOKENLIST
+        AS (TOKENIZE_FULLTEXT(name)) HIDDEN""",
+    """ALTER TABLE Skills ADD COLUMN category_tokens TOKENLIST
+        AS (TOKENIZE_FULLTEXT(category)) HIDDEN""",
+    """ALTER TABLE Skills ADD COLUMN description_tokens TOKENLIST
+        AS (TOKENIZE_FULLTEXT(description)) HIDDEN""",
+    """ALTER TABLE Survivors ADD COLUMN biome_tokens TOKENLIST
+        AS (TOKENIZE_FULLTEXT(biome)) HIDDEN""",
+    """CREATE SEARCH INDEX SkillsSearchIndex
+        ON Skills (name_tokens, category_tokens, description_tokens)""",
+    """CREATE SEARCH INDEX SurvivorsBiomeSearchIndex
+        ON Survivors (biome_tokens)""",
+]
+
+
+# Approximate nearest neighbour search (rag_search / find_similar_skills
+# with VectorSearchMode.ANN, via APPROX_COSINE_DISTANCE)
+VECTOR_INDEX_NAME = "SkillsEmbeddingIndex"
+VECTOR_INDEX_DDL = """CREATE VECTOR INDEX IF NOT EXISTS SkillsEmbeddingIndex
+    ON Skills (skill_embedding)
+    WHERE skill_embedding IS NOT NULL
+    OPTIONS (distance_type = 'COSINE', tree_depth = 2, num_leaves = %d)""" % VECTOR_INDEX_LEAVES
+
+# For an existing database (--vector-index) whose skill_embedding column
+# was added without a vector length
+VECTOR_INDEX_DDL_STATEMENTS = [
+    """ALTER TABLE Skills ALTER COLUMN skill_embedding
+        ARRAY<FLOAT64>(vector_length=>%d)""" % EMBEDDING_DIM,
+    VECTOR_INDEX_DDL,
 ]
 
 
@@ -360,6 +408,48 @@ def create_graphs(database, graph_name):
     print("Graphs created!")
 
 
+def create_search_indexes(database):
+    """Add token columns and search indexes for full-text keyword search."""
+    print("Creating search indexes...")
+    operation = database.update_ddl(SEARCH_DDL_STATEMENTS)
+    operation.result()
+    print("Search indexes created!")
+
+
+def create_vector_index(database, existing: bool = False):
+    """
+    Add the skill-embedding vector index (ANN search).
+    
+    Skipped if the index already exists, or if no skill embeddings have
+    been written yet (a vector index is trained on the rows present when
+    it's built). Run again with --vector-index once they're populated.
+    """
+    with database.snapshot(multi_use=True) as snapshot:
+        index_rows = list(snapshot.execute_sql(
+            "SELECT 1 FROM INFORMATION_SCHEMA.INDEXES "
+            "WHERE TABLE_NAME = 'Skills' AND INDEX_NAME = @name",
+            params={"name": VECTOR_INDEX_NAME},
+            param_types={"name": param_types.STRING}
+        ))
+        embedded = list(snapshot.execute_sql(
+            "SELECT COUNT(*) FROM Skills WHERE skill_embedding IS NOT NULL"
+        ))[0][0]
+    
+    if index_rows:
+        print(f"Vector index {VECTOR_INDEX_NAME} already exists.")
+        return
+    if not embedded:
+        print("Skipping vector index: no skill embeddings yet.")
+        print("Populate Skills.skill_embedding, then run with --vector-index.")
+        return
+    
+    print(f"Creating vector index over {embedded} skill embeddings...")
+    statements = VECTOR_INDEX_DDL_STATEMENTS if existing else [VECTOR_INDEX_DDL]
+    operation = database.update_ddl(statements)
+    operation.result()
+    print("Vector index created!")
+
+
 def create_instance_with_enterprise(client, project_id, instance_id, region):
     """Create a Spanner instance with ENTERPRISE edition using the admin API."""
     config_name = f"projects/{project_id}/instanceConfigs/regional-{region}"
@@ -408,6 +498,8 @@ def main():
     parser.add_argument('--skip-instance', action='store_true', help='Skip instance creation (if exists)')
     parser.add_argument('--force', action='store_true', help='Delete and recreate database if exists')
     parser.add_argument('--show-config', action='store_true', help='Show current configuration and exit')
+    parser.add_argument('--search-indexes', action='store_true', help='Only add full-text search indexes to an existing database')
+    parser.add_argument('--vector-index', action='store_true', help='Only add the skill-embedding vector index to an existing database (run after embeddings are populated)')
     args = parser.parse_args()
     
     # Use command line args or fall back to environment variables
@@ -465,6 +557,20 @@ def main():
     database = instance.database(database_id)
     database_exists = database.exists()
     
+    if args.search_indexes:
+        if not database_exists:
+            print(f"ERROR: Database {database_id} does not exist.")
+            return
+        create_search_indexes(database)
+        return
+    
+    if args.vector_index:
+        if not database_exists:
+            print(f"ERROR: Database {database_id} does not exist.")
+            return
+        create_vector_index(database, existing=True)
+        return
+    
     if database_exists:
         if args.force:
             print(f"Database {database_id} exists. Deleting (--force specified)...")
@@ -492,6 +598,12 @@ def main():
     # Create graphs
     create_graphs(database, graph_name)
     
+    # Full-text search indexes
+    create_search_indexes(database)
+    
+    # Vector index for ANN skill search (skipped until embeddings exist)
+    create_vector_index(database)
+    
     print("\n" + "=" * 60)
     print("SUCCESS! Database setup complete.")
     print("=" * 60)
@@ -0,0 +1,17 @@
+"""Shared fixtures for the backend tests."""
+
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def clock(request, monkeypatch):
+    """Controllable time.monotonic for the module given as the fixture param.
+
+    Use with indirect parametrization:
+        @pytest.mark.parametrize("clock", [query_cache], indirect=True)
+    """
+    now = [1000.0]
+    monkeypatch.setattr(request.param, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
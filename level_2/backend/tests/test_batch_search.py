@@ -0,0 +1,167 @@
+"""Behavior tests for batch_smart_search and its batched analysis / RAG legs."""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from services.fusion import FusionStrategy
+from services.hybrid_search_service import HybridSearchService, QueryAnalysis, SearchMethod
+from services.search_results import SearchResultsBuilder
+
+
+@pytest.fixture
+def service():
+    service = HybridSearchService.__new__(HybridSearchService)
+    service.fusion, service.fusion_weights, service.rrf_k = FusionStrategy.RRF, None, 60
+    service._executor = ThreadPoolExecutor(max_workers=4)
+    yield service
+    service._executor.shutdown(wait=False)
+
+
+def analysis(query, method=SearchMethod.HYBRID):
+    return QueryAnalysis(
+        original_query=query, recommended_method=method, keywords=[query],
+        categories=[], biome_filter=None, needs_similarity_ranking=False,
+        has_specific_filters=False, confidence=1.0, reasoning=""
+    )
+
+
+def one_result(survivor_id, method):
+    builder = SearchResultsBuilder()
+    builder.add(survivor_id, survivor_id.upper(), 1.0, method)
+    return builder.build()
+
+
+# =============================================================================
+# Batched analysis: a bad item only costs its own query
+# =============================================================================
+
+def test_bad_items_fall_back_one_by_one(service):
+    cached = {}
+    service._catalog = SimpleNamespace(skill_sample=lambda query, tokens: [])
+    service._load_known_values = lambda: SimpleNamespace(categories=(), biomes=())
+    service._analysis_cache = SimpleNamespace(get=cached.get, put=cached.__setitem__)
+    service._router = None
+    service.prompt_skill_tokens = 100
+    service._call_gemini = lambda prompt: json.dumps([
+        {"index": 0, "recommended_method": "keyword", "keywords": ["fire"]},
+        {"index": 1, "recommended_method": "rag", "keywords": "not a list"},
+        {"index": "two", "recommended_method": "rag"},
+        {"index": 3, "recommended_method": "rag", "keywords": ["water"], "confidence": 0.9},
+    ])
+
+    analyses = service.analyze_queries(["q0", "q1", "q2", "q3"])
+
+    assert analyses[0].recommended_method == SearchMethod.KEYWORD
+    assert analyses[3].recommended_method == SearchMethod.RAG
+    assert analyses[3].keywords == ["water"]
+    assert "keywords must be a list of strings" in analyses[1].reasoning
+    assert analyses[2].reasoning == "Fallback to hybrid: query missing from batch analysis"
+    assert set(cached) == {"q0", "q3"}
+
+
+def test_unparseable_answer_falls_back_for_every_query(service):
+    service._catalog = SimpleNamespace(skill_sample=lambda query, tokens: [])
+    service._load_known_values = lambda: SimpleNamespace(categories=(), biomes=())
+    service._analysis_cache = SimpleNamespace(get=lambda q: None, put=lambda q, a: None)
+    service._router = None
+    service.prompt_skill_tokens = 100
+    service._call_gemini = lambda prompt: '{"index": 0}'
+
+    analyses = service.analyze_queries(["q0", "q1"])
+
+    assert all(a.recommended_method == SearchMethod.HYBRID for a in analyses)
+    assert "expected a JSON array" in analyses[0].reasoning
+
+
+# =============================================================================
+# Batched RAG SQL fallback: LIMIT counts survivors
+# =============================================================================
+
+class FakeSnapshot:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def execute_sql(self, sql, params=None, param_types=None):
+        self.calls.append((sql, params))
+        return self.rows
+
+
+def test_sql_fallback_limits_survivors_not_skill_rows(service):
+    # What Spanner returns for limit=2: both survivors' skills, by distance
+    matches = [
+        ("s1", "Mira", "CRYO", "k1", "First Aid", "Medical", 0.1),
+        ("s2", "Ada", None, "k2", "Triage", "Medical", 0.2),
+        ("s1", "Mira", "CRYO", "k3", "Surgery", "Medical", 0.15),
+        ("s2", "Ada", None, "k4", "Archery", "Combat", 0.9),
+    ]
+    snapshot = FakeSnapshot([(0, matches)])
+    service._embeddings = SimpleNamespace(get_many=lambda queries: [[0.1, 0.2]])
+    service._vector_index = None
+    service._run_read = lambda fn: fn(snapshot)
+
+    [results] = service._batch_rag_search(["medic"], limit=2)
+
+    sql, params = snapshot.calls[0]
+    survivors = sql.index("GROUP BY shs.survivor_id")
+    assert survivors < sql.index("LIMIT @limit") < sql.index("JOIN Survivors s")
+    assert params["limit"] == 2
+    assert results.ids == ["s1", "s2"]
+    # Rows past the last admitted survivor's best distance (0.2) are dropped
+    assert results[0].skill_names() == ["First Aid", "Surgery"]
+    assert results[1].skill_names() == ["Triage"]
+
+
+# =============================================================================
+# One deadline for every leg
+# =============================================================================
+
+def slow(seconds, result):
+    def leg(*args):
+        time.sleep(seconds)
+        return result
+    return leg
+
+
+def test_legs_share_one_deadline(service):
+    service.leg_timeout = 0.3
+    service.analyze_queries = lambda queries: [analysis(q) for q in queries]
+    service.keyword_search = slow(0.2, one_result("kw", SearchMethod.KEYWORD))
+    service._batch_rag_search = slow(0.2, [one_result("rag", SearchMethod.RAG)])
+
+    start = time.monotonic()
+    [response] = service._batch_smart_search(["q"], None, 10)
+
+    # Both legs fit in the deadline because they overlap
+    assert time.monotonic() - start < 0.3
+    assert {r.id for r in response["results"]} == {"kw", "rag"}
+
+
+def test_slow_rag_leg_leaves_the_keyword_results(service):
+    service.leg_timeout = 0.2
+    service.analyze_queries = lambda queries: [analysis(q) for q in queries]
+    service.keyword_search = slow(0.05, one_result("kw", SearchMethod.KEYWORD))
+    service._batch_rag_search = slow(1.0, [one_result("rag", SearchMethod.RAG)])
+
+    [response] = service._batch_smart_search(["q"], None, 10)
+
+    assert [r.id for r in response["results"]] == ["kw"]
+    assert response["timings"]["rag_ms"] is None
+
+
+def test_keyword_wait_is_not_restarted_after_rag(service):
+    service.leg_timeout = 0.2
+    service.analyze_queries = lambda queries: [analysis(q) for q in queries]
+    service.keyword_search = slow(0.25, one_result("kw", SearchMethod.KEYWORD))
+    service._batch_rag_search = slow(1.0, [one_result("rag", SearchMethod.RAG)])
+
+    start = time.monotonic()
+    [response] = service._batch_smart_search(["q"], None, 10)
+
+    # Both legs miss the one deadline; nothing waits past it
+    assert time.monotonic() - start < 0.35
+    assert response["result_count"] == 0
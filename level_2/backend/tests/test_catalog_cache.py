@@ -0,0 +1,83 @@
+"""Behavior tests for services/catalog_cache.py change detection."""
+
+import zlib
+
+from services.catalog_cache import CatalogCache
+
+
+def checksum(values):
+    """Stand-in for BIT_XOR(FARM_FINGERPRINT(...)) over the rows."""
+    result = 0
+    for value in values:
+        result ^= zlib.crc32(value.encode("utf-8"))
+    return result
+
+
+class FakeDatabase:
+    """Answers the signature and load queries from in-memory tables."""
+
+    def __init__(self, skills, survivors):
+        self.skills = skills          # skill_id -> (name, category)
+        self.survivors = survivors    # survivor_id -> biome
+        self.queries = []
+
+    def signature(self):
+        return (
+            len(self.skills),
+            checksum(f"{k}|{n}|{c or ''}" for k, (n, c) in self.skills.items()),
+            checksum(f"{s}|{b or ''}" for s, b in self.survivors.items()),
+        )
+
+    def execute_sql(self, sql):
+        if "ARRAY(" in sql:
+            self.queries.append("load")
+            return [(
+                sorted(n for n, _ in self.skills.values()),
+                list({c for _, c in self.skills.values() if c}),
+                list({b for b in self.survivors.values() if b}),
+            ) + self.signature()]
+        self.queries.append("check")
+        return [self.signature()]
+
+
+def cache_for(database):
+    return CatalogCache(run_read=lambda fn: fn(database), ttl_seconds=0)
+
+
+def test_signature_query_matches_the_loaded_one():
+    assert CatalogCache._SIGNATURE_COLUMNS in CatalogCache._SIGNATURE_SQL
+
+
+def test_unchanged_catalog_is_not_reloaded():
+    database = FakeDatabase({"k1": ("First Aid", "Medical")}, {"s1": "CRYO"})
+    cache = cache_for(database)
+    cache.get()
+
+    assert cache.refresh() is False
+    assert database.queries == ["load", "check"]
+
+
+def test_rename_with_the_same_row_counts_reloads():
+    database = FakeDatabase(
+        {"k1": ("First Aid", "Medical"), "k2": ("Archery", "Combat")}, {"s1": "CRYO"}
+    )
+    changes = []
+    cache = CatalogCache(run_read=lambda fn: fn(database), on_change=changes.append)
+    cache.get()
+
+    database.skills["k2"] = ("Longbow", "Combat")
+
+    assert cache.refresh() is True
+    assert cache.get().skills == ("First Aid", "Longbow")
+    assert len(changes) == 2
+
+
+def test_survivor_moving_biome_reloads():
+    database = FakeDatabase({"k1": ("First Aid", "Medical")}, {"s1": "CRYO", "s2": "FOSSIL"})
+    cache = cache_for(database)
+    cache.get()
+
+    database.survivors["s2"] = "CRYO"
+
+    assert cache.refresh() is True
+    assert cache.get().biomes == ("CRYO",)
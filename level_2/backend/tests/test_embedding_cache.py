@@ -0,0 +1,102 @@
+"""Behavior tests for services/embedding_cache.py."""
+
+from services.embedding_cache import EmbeddingCache, normalize_text
+
+
+class FakeEmbedder:
+    """Records each batch; a text's vector is [len(text), 1.0]."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def test_normalize_text_folds_case_and_whitespace():
+    assert normalize_text("  First   AID ") == "first aid"
+    assert normalize_text(None) == ""
+
+
+def test_misses_are_embedded_in_one_batch():
+    embed = FakeEmbedder()
+    cache = EmbeddingCache(embed)
+
+    vectors = cache.get_many(["first aid", "archery", "First  Aid"])
+
+    assert embed.batches == [["first aid", "archery"]]
+    assert vectors == [[9.0, 1.0], [7.0, 1.0], [9.0, 1.0]]
+
+
+def test_hits_skip_the_model():
+    embed = FakeEmbedder()
+    cache = EmbeddingCache(embed)
+    cache.get("first aid")
+
+    cache.get_many(["FIRST AID", "archery"])
+
+    assert embed.batches == [["first aid"], ["archery"]]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_least_recently_used_vector_is_evicted():
+    embed = FakeEmbedder()
+    cache = EmbeddingCache(embed, max_entries=2)
+    cache.get_many(["a", "b"])
+    cache.get("a")
+
+    cache.get("c")
+    cache.get("b")
+
+    assert embed.batches[-1] == ["b"]
+    assert cache.stats()["size"] == 2
+
+
+def test_empty_vectors_are_not_cached():
+    calls = []
+
+    def embed(texts):
+        calls.append(texts)
+        return [[] for _ in texts]
+
+    cache = EmbeddingCache(embed)
+
+    assert cache.get("x") == []
+    assert cache.get("x") == []
+    assert len(calls) == 2
+
+
+def test_disk_store_survives_a_new_cache(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    EmbeddingCache(FakeEmbedder(), disk_path=path).get("first aid")
+
+    embed = FakeEmbedder()
+    cache = EmbeddingCache(embed, disk_path=path)
+
+    assert cache.get("First Aid") == [9.0, 1.0]
+    assert embed.batches == []
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_disk_entries_are_per_model(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    EmbeddingCache(FakeEmbedder(), disk_path=path, model_name="old").get("first aid")
+
+    embed = FakeEmbedder()
+    EmbeddingCache(embed, disk_path=path, model_name="new").get("first aid")
+
+    assert embed.batches == [["first aid"]]
+
+
+def test_clear_keeps_the_disk_store(tmp_path):
+    embed = FakeEmbedder()
+    cache = EmbeddingCache(embed, disk_path=str(tmp_path / "embeddings.sqlite"))
+    cache.get("first aid")
+
+    cache.clear()
+
+    assert cache.get("first aid") == [9.0, 1.0]
+    assert len(embed.batches) == 1
+    assert cache.stats()["disk_hits"] == 1
@@ -0,0 +1,58 @@
+"""Behavior tests for GraphService's single-statement full graph read."""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from models.graph import EdgeType, NodeType
+from services.graph_service import FULL_GRAPH_SQL, GraphService
+
+
+class FakeDatabase:
+    def __init__(self, row):
+        self.row = row
+        self.snapshots = 0
+        self.queries = []
+
+    @contextmanager
+    def snapshot(self, **kwargs):
+        self.snapshots += 1
+        yield self
+
+    def execute_sql(self, sql, params=None, param_types=None):
+        self.queries.append(sql)
+        return iter([self.row])
+
+
+def read(row):
+    database = FakeDatabase(row)
+    service = GraphService.__new__(GraphService)
+    service.spanner = SimpleNamespace(database=database)
+    return service._read_full_graph(), database
+
+
+def test_whole_graph_comes_from_one_statement():
+    graph, database = read((
+        [("s1", "Mira", "medic", "CRYO")],
+        [("k1", "First Aid")],
+        [("n1", "Burns", "high")],
+        [("s1", "k1", "expert")],
+        [("s1", "n1", "critical")],
+        [("k1", "n1", "high")],
+    ))
+
+    assert database.snapshots == 1 and database.queries == [FULL_GRAPH_SQL]
+    assert [(n.id, n.type) for n in graph.nodes] == [
+        ("s1", NodeType.SURVIVOR), ("k1", NodeType.SKILL), ("n1", NodeType.NEED)
+    ]
+    assert [(e.id, e.type) for e in graph.edges] == [
+        ("s1-k1", EdgeType.HAS_SKILL), ("s1-n1", EdgeType.HAS_NEED), ("k1-n1", EdgeType.TREATS)
+    ]
+    assert graph.nodes[0].biome == "CRYO"
+    assert graph.edges[1].properties == {"status": "critical"}
+
+
+def test_empty_tables_read_as_null_arrays():
+    graph, _ = read((None, [("k1", None)], None, None, None, []))
+
+    assert [n.label for n in graph.nodes] == [""]
+    assert graph.edges == []
@@ -0,0 +1,92 @@
+"""Behavior tests for services/fusion.py."""
+
+import numpy as np
+import pytest
+
+from services.fusion import DEFAULT_RRF_K, FusionStrategy, fuse
+
+
+def test_rrf_prefers_ids_found_by_both_legs():
+    result = fuse([["a", "b", "c"], ["c", "d"]])
+
+    # c: 1/(k+3) + 1/(k+1) beats a: 1/(k+1); b and d tie at rank 2
+    assert result.ids == ["c", "a", "b", "d"]
+    assert result.scores[0] == pytest.approx(1 / (DEFAULT_RRF_K + 3) + 1 / (DEFAULT_RRF_K + 1))
+
+
+def test_rrf_ties_keep_first_seen_order():
+    result = fuse([["a", "b"], ["x", "y"]])
+
+    assert result.ids == ["a", "x", "b", "y"]
+
+
+def test_weights_scale_each_leg():
+    result = fuse([["a"], ["b"]], weights=[1.0, 3.0])
+
+    assert result.ids == ["b", "a"]
+
+
+def test_weights_must_match_leg_count():
+    with pytest.raises(ValueError):
+        fuse([["a"], ["b"]], weights=[1.0])
+
+
+def test_weighted_uses_normalized_scores():
+    result = fuse(
+        [["a", "b", "c"], ["c", "b"]],
+        leg_scores=[[10.0, 9.0, 0.0], [0.9, 0.1]],
+        strategy=FusionStrategy.WEIGHTED
+    )
+
+    # a: 1.0 + 0; b: 0.9 + 0.0; c: 0.0 + 1.0 -> a and c tie, a seen first
+    assert result.ids == ["a", "c", "b"]
+    assert result.scores == pytest.approx([1.0, 1.0, 0.9])
+
+
+def test_combmnz_rewards_agreement():
+    result = fuse(
+        [["a", "b"], ["b", "c"]],
+        leg_scores=[[1.0, 0.5], [1.0, 0.0]],
+        strategy=FusionStrategy.COMBMNZ
+    )
+
+    # b: (0 + 1) * 2 = 2 beats a: 1 * 1
+    assert result.ids[0] == "b"
+    assert result.scores[0] == pytest.approx(2.0)
+
+
+def test_duplicates_within_a_leg_keep_the_first_rank():
+    result = fuse([["a", "b", "a"]])
+
+    assert result.ids == ["a", "b"]
+    assert result.leg_positions[0].tolist() == [0, 1]
+
+
+def test_presence_and_positions_follow_the_fused_order():
+    result = fuse([["a", "b"], ["b"]])
+
+    assert result.ids == ["b", "a"]
+    assert result.presence.tolist() == [[True, True], [True, False]]
+    assert result.leg_positions.tolist() == [[1, 0], [0, -1]]
+
+
+def test_limit_keeps_the_best_ids():
+    result = fuse([["a", "b", "c"], ["c"]], limit=2)
+
+    assert result.ids == ["c", "a"]
+    assert result.presence.shape == (2, 2)
+
+
+def test_empty_legs():
+    result = fuse([[], []])
+
+    assert result.ids == []
+    assert result.scores.size == 0
+    assert result.presence.shape == (2, 0)
+
+
+def test_missing_scores_fall_back_to_reciprocal_rank():
+    result = fuse([["a", "b"]], leg_scores=[None], strategy=FusionStrategy.WEIGHTED)
+
+    assert result.ids == ["a", "b"]
+    np.testing.assert_allclose(result.scores, [1.0, 0.0])
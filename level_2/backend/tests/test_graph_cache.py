@@ -0,0 +1,143 @@
+"""Behavior tests for services/graph_cache.py."""
+
+import threading
+import time
+
+import pytest
+
+from models.graph import GraphData, Node, NodeType
+from services import graph_cache as graph_cache_module
+from services.graph_cache import GraphCache, make_snapshot
+
+
+def graph(*labels):
+    return GraphData(
+        nodes=[Node(id=label, type=NodeType.SURVIVOR, label=label, properties={}) for label in labels],
+        edges=[]
+    )
+
+
+class Loader:
+    """Returns the next graph on each call and counts the calls."""
+
+    def __init__(self, *graphs):
+        self.graphs = list(graphs)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        data = self.graphs[min(self.calls, len(self.graphs)) - 1]
+        if isinstance(data, Exception):
+            raise data
+        return data
+
+
+def wait_for(condition, timeout=2.0):
+    """Poll until the background reload settles."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_snapshot_etag_follows_the_content():
+    first, same, other = make_snapshot(graph("a")), make_snapshot(graph("a")), make_snapshot(graph("b"))
+
+    assert first.etag == same.etag != other.etag
+    assert first.etag.startswith('"') and first.etag.endswith('"')
+    assert GraphData.model_validate_json(first.body) == graph("a")
+
+
+@pytest.mark.parametrize("clock", [graph_cache_module], indirect=True)
+def test_fresh_snapshot_is_served_without_loading(clock):
+    cache = GraphCache(ttl_seconds=30)
+    loader = Loader(graph("a"))
+
+    first = cache.get(loader)
+    clock[0] += 29
+    second = cache.get(loader)
+
+    assert first is second
+    assert loader.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("clock", [graph_cache_module], indirect=True)
+def test_stale_snapshot_is_served_while_it_reloads(clock):
+    cache = GraphCache(ttl_seconds=30)
+    loader = Loader(graph("a"), graph("b"))
+    cache.get(loader)
+
+    clock[0] += 31
+    stale = cache.get(loader)
+
+    assert stale.data == graph("a")
+    assert wait_for(lambda: cache.get(loader).data == graph("b"))
+    assert loader.calls == 2
+    assert cache.stats()["stale_hits"] >= 1
+
+
+@pytest.mark.parametrize("clock", [graph_cache_module], indirect=True)
+def test_failed_background_reload_keeps_the_stale_snapshot(clock):
+    cache = GraphCache(ttl_seconds=30)
+    loader = Loader(graph("a"), RuntimeError("spanner down"))
+    cache.get(loader)
+
+    clock[0] += 31
+    cache.get(loader)
+
+    assert wait_for(lambda: loader.calls == 2 and not cache._refreshing)
+    assert cache.get(loader).data == graph("a")
+
+
+def test_invalidate_forces_a_synchronous_reload():
+    cache = GraphCache()
+    loader = Loader(graph("a"), graph("b"))
+    cache.get(loader)
+
+    cache.invalidate()
+
+    assert cache.get(loader).data == graph("b")
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_load_racing_a_write_is_not_cached():
+    cache = GraphCache()
+
+    def loader():
+        # A write commits while the graph is being read
+        cache.invalidate()
+        return graph("pre-write")
+
+    assert cache.get(loader).data == graph("pre-write")
+    assert cache.stats()["cached"] is False
+
+
+def test_loader_errors_propagate_and_nothing_is_cached():
+    cache = GraphCache()
+
+    with pytest.raises(RuntimeError):
+        cache.get(Loader(RuntimeError("spanner down")))
+    assert cache.stats()["cached"] is False
+
+
+def test_concurrent_misses_load_once():
+    cache = GraphCache()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(2)
+        return graph("a")
+
+    threads = [threading.Thread(target=cache.get, args=(loader,)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
@@ -0,0 +1,280 @@
+"""Behavior tests for services/graph_index.py and the index-backed lookups."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from google.cloud.spanner_v1 import param_types
+
+from agent.tools import survivor_tools
+from api.routes import graph as graph_routes
+from models.graph import Edge, EdgeType, GraphData, Node, NodeType
+from services import graph_service as graph_service_module
+from services.graph_cache import GraphCache
+from services.graph_index import GraphIndex
+from services.graph_service import FULL_GRAPH_TABLE_LIMIT, GraphService
+
+
+def survivor(node_id, name, biome="CRYO"):
+    return Node(id=node_id, type=NodeType.SURVIVOR, label=name, properties={}, biome=biome)
+
+
+def skill(node_id, name):
+    return Node(id=node_id, type=NodeType.SKILL, label=name, properties={})
+
+
+def need(node_id, description, urgency=""):
+    return Node(id=node_id, type=NodeType.NEED, label=description, properties={"urgency": urgency})
+
+
+def edge(source, target, edge_type, **properties):
+    return Edge(id=f"{source}-{target}", source=source, target=target, type=edge_type, properties=properties)
+
+
+GRAPH = GraphData(
+    nodes=[
+        survivor("s1", "Mira"), survivor("s2", "Ada", biome=None), survivor("s3", "Cy"),
+        skill("k1", "First Aid"), skill("k2", "Field Medicine"), skill("k3", "Archery"),
+        need("n1", "Burns", urgency="High"), need("n2", "Hunger"), need("n3", "Fever"),
+    ],
+    edges=[
+        edge("s1", "k1", EdgeType.HAS_SKILL),
+        edge("s2", "k1", EdgeType.HAS_SKILL),
+        edge("s3", "k3", EdgeType.HAS_SKILL),
+        edge("s3", "n1", EdgeType.HAS_NEED, status="stable"),
+        edge("s1", "n2", EdgeType.HAS_NEED, status="Critical"),
+        edge("s2", "n3", EdgeType.HAS_NEED, status="stable"),
+        edge("k1", "n1", EdgeType.TREATS),
+    ]
+)
+
+
+@pytest.fixture
+def index():
+    return GraphIndex(GRAPH)
+
+
+def test_skills_match_by_case_insensitive_substring(index):
+    assert [n.id for n in index.skills_matching("AID")] == ["k1"]
+    assert [n.id for n in index.skills_matching("i")] == ["k1", "k2"]
+    assert index.skills_matching("xyz") == []
+
+
+def test_adjacency_by_edge_type(index):
+    assert [e.source for e in index.edges_to("k1", EdgeType.HAS_SKILL)] == ["s1", "s2"]
+    assert [e.target for e in index.edges_from("s3", EdgeType.HAS_NEED)] == ["n1"]
+    assert index.edges_from("s3", EdgeType.TREATS) == []
+
+
+def test_urgent_need_edges_by_status_or_urgency(index):
+    urgent = index.urgent_need_edges(["critical"], ["high"])
+
+    assert [(e.source, e.target) for e in urgent] == [("s3", "n1"), ("s1", "n2")]
+
+
+def test_counts_per_type(index):
+    assert index.counts[NodeType.SURVIVOR] == 3
+    assert index.counts[EdgeType.HAS_NEED] == 3
+    assert index.largest_table() == 3
+    assert GraphIndex(GraphData(nodes=[], edges=[])).largest_table() == 0
+
+
+def test_neighbors_cover_both_directions(index):
+    around = index.neighbors("k1")
+
+    assert {n.id for n in around.nodes} == {"k1", "s1", "s2", "n1"}
+    assert len(around.edges) == 3
+    assert index.neighbors("missing") is None
+
+
+def test_shortest_path_ignores_direction(index):
+    path = index.shortest_path("s2", "s3")
+
+    # s2 -HAS_SKILL-> k1 -TREATS-> n1 <-HAS_NEED- s3
+    assert [n.id for n in path.nodes] == ["s2", "k1", "n1", "s3"]
+    assert [e.id for e in path.edges] == ["s2-k1", "k1-n1", "s3-n1"]
+    assert index.shortest_path("s1", "s1").nodes[0].id == "s1"
+    assert index.shortest_path("s1", "missing") is None
+
+
+def test_unconnected_nodes_have_no_path():
+    index = GraphIndex(GraphData(nodes=[survivor("a", "A"), survivor("b", "B")], edges=[]))
+
+    assert index.shortest_path("a", "b") is None
+
+
+def test_index_is_reused_for_the_same_snapshot():
+    assert GraphIndex.for_graph(GRAPH) is GraphIndex.for_graph(GRAPH)
+
+
+# =============================================================================
+# GraphService.get_complete_graph_index
+# =============================================================================
+
+def complete_index(monkeypatch, data=None, error=None):
+    monkeypatch.setattr(graph_service_module, "graph_cache", GraphCache())
+    service = GraphService.__new__(GraphService)
+
+    def read():
+        if error:
+            raise error
+        return data
+
+    service._read_full_graph = read
+    return asyncio.run(service.get_complete_graph_index())
+
+
+def test_complete_graph_is_indexed(monkeypatch):
+    assert complete_index(monkeypatch, GRAPH).node("s1").label == "Mira"
+
+
+def test_truncated_graph_is_not_indexed(monkeypatch):
+    full_table = GraphData(
+        nodes=[survivor(f"s{i}", f"S{i}") for i in range(FULL_GRAPH_TABLE_LIMIT)],
+        edges=[]
+    )
+
+    assert complete_index(monkeypatch, full_table) is None
+
+
+def test_failed_read_is_not_indexed(monkeypatch):
+    assert complete_index(monkeypatch, error=RuntimeError("spanner down")) is None
+
+
+# =============================================================================
+# Survivor tools: the index and SQL paths give the same answers
+# =============================================================================
+
+class FakeSpanner:
+    """execute_sql returns the rows Spanner would return for GRAPH."""
+
+    ROWS = {
+        survivor_tools.SURVIVORS_WITH_SKILL_SQL: [
+            {"skill_name": "Field Medicine", "survivor_id": None, "survivor_name": None},
+            {"skill_name": "First Aid", "survivor_id": "s2", "survivor_name": "Ada"},
+            {"skill_name": "First Aid", "survivor_id": "s1", "survivor_name": "Mira"},
+        ],
+        survivor_tools.ALL_SURVIVORS_SQL: [
+            {"name": "Ada", "biome": None},
+            {"name": "Cy", "biome": "CRYO"},
+            {"name": "Mira", "biome": "CRYO"},
+        ],
+        survivor_tools.URGENT_NEEDS_SQL: [
+            {"description": "Burns", "survivor_name": "Cy"},
+            {"description": "Hunger", "survivor_name": "Mira"},
+        ],
+    }
+
+    def __init__(self):
+        self.queries = []
+        self.params = []
+
+    def execute_sql(self, sql, params=None, param_types=None):
+        self.queries.append(sql)
+        self.params.append((params, param_types))
+        return self.ROWS[sql]
+
+
+@pytest.fixture
+def tools(monkeypatch):
+    """Run a tool once from the index and once from SQL."""
+    spanner = FakeSpanner()
+    monkeypatch.setattr(survivor_tools, "_get_spanner", lambda: spanner)
+
+    def run(tool, *args):
+        async def index_path():
+            return GraphIndex(GRAPH)
+
+        async def sql_path():
+            return None
+
+        monkeypatch.setattr(survivor_tools, "_graph_index", index_path)
+        from_index = asyncio.run(tool(*args))
+        assert spanner.queries == []
+
+        monkeypatch.setattr(survivor_tools, "_graph_index", sql_path)
+        from_sql = asyncio.run(tool(*args))
+        assert len(spanner.queries) == 1
+        spanner.queries.clear()
+        return from_index, from_sql
+
+    run.spanner = spanner
+    return run
+
+
+def test_survivors_with_skill_agree(tools):
+    from_index, from_sql = tools(survivor_tools.get_survivors_with_skill, "i")
+
+    assert from_index == from_sql
+    assert from_index.endswith("(Field Medicine, First Aid): Ada, Mira")
+
+
+def test_all_survivors_agree(tools):
+    from_index, from_sql = tools(survivor_tools.get_all_survivors)
+
+    assert from_index == from_sql
+    assert "- Ada (Location: Unknown Location)" in from_index
+
+
+def test_urgent_needs_agree(tools):
+    from_index, from_sql = tools(survivor_tools.get_urgent_needs)
+
+    assert from_index == from_sql
+    assert from_index == "Urgent Needs:\n- Burns (Affecting: Cy)\n- Hunger (Affecting: Mira)"
+
+
+def test_skill_filter_is_pushed_down_as_a_parameter(tools):
+    tools(survivor_tools.get_survivors_with_skill, "First AID")
+
+    [(params, types)] = tools.spanner.params
+    assert params == {"needle": "first aid"}
+    assert types == {"needle": param_types.STRING}
+    assert "@needle" in survivor_tools.SURVIVORS_WITH_SKILL_SQL
+
+
+def test_urgency_filters_are_pushed_down_as_array_parameters(tools):
+    tools(survivor_tools.get_urgent_needs)
+
+    [(params, types)] = tools.spanner.params
+    assert params == {
+        "statuses": list(survivor_tools.URGENT_STATUSES),
+        "urgencies": list(survivor_tools.URGENT_LEVELS)
+    }
+    assert types["statuses"] == param_types.Array(param_types.STRING)
+    assert types["urgencies"] == param_types.Array(param_types.STRING)
+    assert "IN UNNEST(@statuses)" in survivor_tools.URGENT_NEEDS_SQL
+
+
+# =============================================================================
+# Lookup routes
+# =============================================================================
+
+@pytest.fixture
+def client():
+    class FakeGraphService:
+        async def get_graph_index(self):
+            return GraphIndex(GRAPH)
+
+    app = FastAPI()
+    app.include_router(graph_routes.router)
+    app.dependency_overrides[graph_routes.get_graph_service] = FakeGraphService
+    return TestClient(app)
+
+
+def test_node_route(client):
+    assert client.get("/api/graph/nodes/s1").json()["label"] == "Mira"
+    assert client.get("/api/graph/nodes/missing").status_code == 404
+
+
+def test_neighbors_route(client):
+    body = client.get("/api/graph/neighbors/s3").json()
+
+    assert {n["id"] for n in body["nodes"]} == {"s3", "k3", "n1"}
+
+
+def test_path_route(client):
+    body = client.get("/api/graph/path/s1/s3").json()
+
+    assert [n["id"] for n in body["nodes"]] == ["s1", "k1", "n1", "s3"]
+    assert client.get("/api/graph/path/s1/missing").status_code == 404
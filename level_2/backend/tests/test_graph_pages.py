@@ -0,0 +1,164 @@
+"""Behavior tests for the keyset-paginated graph listings in services/graph_service.py."""
+
+import base64
+import re
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from models.graph import EdgeType, NodeType
+from services.graph_service import (
+    EDGE_TABLES,
+    NODE_TABLES,
+    GraphService,
+    decode_page_cursor,
+    encode_page_cursor,
+)
+
+
+TABLES = {
+    "Survivors": [
+        ("s1", "Mira", "medic", "CRYO"), ("s2", "Ada", "scout", "FOSSIL"), ("s3", "Cy", "cook", "CRYO"),
+    ],
+    "Skills": [("k1", "First Aid"), ("k2", "Archery")],
+    "Needs": [("n1", "Burns", "high")],
+    "SurvivorHasSkill": [("s1", "k1", "expert"), ("s1", "k2", "novice"), ("s2", "k1", "novice")],
+    "SurvivorHasNeed": [("s3", "n1", "critical")],
+    "SkillTreatsNeed": [("k1", "n1", "high")],
+}
+
+
+class FakeSnapshot:
+    """Keyset reads over TABLES: rows after @after / @after_to, up to @limit."""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_sql(self, sql, params=None, param_types=None):
+        self.calls.append((sql, params, param_types))
+        table = TABLES[re.search(r"FROM (\w+)", sql).group(1)]
+        if "after_to" in params:
+            after = (params["after"], params["after_to"])
+            rows = [row for row in table if row[:2] > after]
+        else:
+            rows = [row for row in table if row[0] > params["after"]]
+        if "biome" in params and "FROM Survivors" in sql:
+            rows = [row for row in rows if row[3] == params["biome"]]
+        return rows[:params["limit"]]
+
+
+@pytest.fixture
+def service():
+    snapshot = FakeSnapshot()
+
+    @contextmanager
+    def open_snapshot(**kwargs):
+        yield snapshot
+
+    service = GraphService.__new__(GraphService)
+    service.spanner = SimpleNamespace(database=SimpleNamespace(snapshot=open_snapshot))
+    service.snapshot = snapshot
+    return service
+
+
+def all_pages(read_page, **kwargs):
+    pages, cursor = [], None
+    while True:
+        page = read_page(cursor=cursor, **kwargs)
+        pages.append(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+# =============================================================================
+# Cursors
+# =============================================================================
+
+@pytest.mark.parametrize("table_type, key", [
+    (NodeType.SURVIVOR, ("s1",)),
+    (EdgeType.HAS_SKILL, ("s1", "k/2+é")),
+])
+def test_cursor_round_trips(table_type, key):
+    cursor = encode_page_cursor(table_type, key)
+
+    assert "=" not in cursor
+    assert decode_page_cursor(cursor) == (table_type.value, key)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    base64.urlsafe_b64encode(b'["Survivor"]').decode(),
+    base64.urlsafe_b64encode(b'["Survivor", 7]').decode(),
+    base64.urlsafe_b64encode(b'{"after": "s1"}').decode(),
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError, match="Malformed graph cursor"):
+        decode_page_cursor(cursor)
+
+
+def test_cursor_from_another_listing_is_rejected(service):
+    node_cursor = service.get_nodes_page(limit=1).next_cursor
+
+    with pytest.raises(ValueError, match="not for this listing"):
+        service.get_edges_page(cursor=node_cursor)
+
+
+# =============================================================================
+# Pages
+# =============================================================================
+
+def test_node_pages_walk_every_table_in_key_order(service):
+    pages = all_pages(service.get_nodes_page, limit=2)
+
+    assert [[n.id for n in page.nodes] for page in pages] == [
+        ["s1", "s2"], ["s3", "k1"], ["k2", "n1"]
+    ]
+    # Each query asks for one row more than it needs to spot the page end
+    assert service.snapshot.calls[0][1] == {"after": "", "limit": 3}
+
+
+def test_edge_pages_resume_inside_a_composite_key(service):
+    pages = all_pages(service.get_edges_page, limit=2)
+
+    assert [[e.id for e in page.edges] for page in pages] == [
+        ["s1-k1", "s1-k2"], ["s2-k1", "s3-n1"], ["k1-n1"]
+    ]
+    resumed = service.snapshot.calls[1][1]
+    assert (resumed["after"], resumed["after_to"]) == ("s1", "k2")
+
+
+def test_type_filter_skips_other_tables(service):
+    [page] = all_pages(service.get_nodes_page, limit=10, node_types=[NodeType.SKILL])
+
+    assert [n.id for n in page.nodes] == ["k1", "k2"]
+    assert len(service.snapshot.calls) == 1
+
+
+def test_biome_filter_is_a_query_parameter(service):
+    page = service.get_nodes_page(limit=2, biome="CRYO")
+
+    assert [n.id for n in page.nodes] == ["s1", "s3"]
+    sql, params, types = service.snapshot.calls[0]
+    assert "AND biome = @biome" in sql and "CRYO" not in sql
+    assert params["biome"] == "CRYO" and "biome" in types
+
+    service.snapshot.calls.clear()
+    service.get_nodes_page(limit=2)
+    assert "@biome" not in service.snapshot.calls[0][0]
+
+
+def test_stream_sends_nodes_then_edges_between_them(service):
+    lines = b"".join(service.stream_graph(
+        node_types=[NodeType.SURVIVOR, NodeType.SKILL], page_size=2
+    )).splitlines()
+
+    assert lines[-1] == b'{"done": true, "nodes": 5, "edges": 3}'
+    kinds = [line.split(b'"')[1] for line in lines[:-1]]
+    assert kinds == [b"node"] * 5 + [b"edge"] * 3
+
+
+def test_page_tables_cover_their_types():
+    assert [t.type for t in NODE_TABLES] == [NodeType.SURVIVOR, NodeType.SKILL, NodeType.NEED]
+    assert [t.key_columns for t in EDGE_TABLES] == [2, 2, 2]
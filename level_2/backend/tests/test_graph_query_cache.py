@@ -0,0 +1,160 @@
+"""Behavior tests for services/graph_query_cache.py and query_graph caching."""
+
+import asyncio
+
+import pytest
+
+from models.graph import GraphData
+from services import graph_query_cache as graph_query_cache_module
+from services.graph_events import notify_graph_changed
+from services.graph_query_cache import GraphQueryCache, graph_query_cache, normalize_gql
+from services.graph_service import GraphService
+
+
+EMPTY = GraphData(nodes=[], edges=[])
+
+
+# =============================================================================
+# normalize_gql
+# =============================================================================
+
+@pytest.mark.parametrize("query, expected", [
+    ("MATCH (s:Survivors)\n\tRETURN   s ;", "MATCH (s:Survivors) RETURN s"),
+    ("MATCH (s) -- all survivors\nRETURN s", "MATCH (s) RETURN s"),
+    ("MATCH (s)\n// every one\nRETURN s", "MATCH (s) RETURN s"),
+    ("MATCH (s) # note\nRETURN s", "MATCH (s) RETURN s"),
+    ("MATCH /* block\n comment */ (s) RETURN s", "MATCH (s) RETURN s"),
+    ("MATCH (s)--x\nRETURN s", "MATCH (s) RETURN s"),
+])
+def test_normalize_collapses_whitespace_and_drops_comments(query, expected):
+    assert normalize_gql(query) == expected
+
+
+def test_comment_markers_inside_literals_are_kept():
+    query = "MATCH (s) WHERE s.name = 'a -- b  # c' AND s.note = \"x // y\" RETURN s"
+
+    assert normalize_gql(query) == query
+
+
+def test_whitespace_inside_literals_is_kept():
+    assert normalize_gql("WHERE s.name =   'Ada   Lovelace'") == "WHERE s.name = 'Ada   Lovelace'"
+    assert normalize_gql("WHERE s.name = 'it\\'s  here'") == "WHERE s.name = 'it\\'s  here'"
+
+
+def test_case_is_significant():
+    assert normalize_gql("WHERE s.biome = 'Frost'") != normalize_gql("WHERE s.biome = 'frost'")
+
+
+# =============================================================================
+# GraphQueryCache
+# =============================================================================
+
+def test_hit_after_put():
+    cache = GraphQueryCache()
+    cache.put("q", EMPTY)
+
+    assert cache.get("q") is EMPTY
+    assert cache.get("other") is None
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+@pytest.mark.parametrize("clock", [graph_query_cache_module], indirect=True)
+def test_entries_expire_after_the_ttl(clock):
+    cache = GraphQueryCache(ttl_seconds=60)
+    cache.put("q", EMPTY)
+
+    clock[0] += 59
+    assert cache.get("q") is EMPTY
+
+    clock[0] += 2
+    assert cache.get("q") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = GraphQueryCache(max_entries=2)
+    cache.put("a", EMPTY)
+    cache.put("b", EMPTY)
+    cache.get("a")
+
+    cache.put("c", EMPTY)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is EMPTY
+    assert cache.stats()["evictions"] == 1
+
+
+def test_graph_writes_clear_the_shared_cache():
+    graph_query_cache.put("q", EMPTY)
+
+    notify_graph_changed({"survivor_ids": ["s1"]})
+
+    assert graph_query_cache.get("q") is None
+
+
+def test_put_from_before_a_write_is_dropped():
+    cache = GraphQueryCache()
+    generation = cache.generation
+
+    cache.invalidate()
+    cache.put("q", EMPTY, generation)
+
+    assert cache.get("q") is None
+    cache.put("q", EMPTY, cache.generation)
+    assert cache.get("q") is EMPTY
+
+
+# =============================================================================
+# GraphService.query_graph
+# =============================================================================
+
+class FakeSpanner:
+    def __init__(self):
+        self.executed = []
+
+    def execute_gql(self, query):
+        self.executed.append(query)
+        return []
+
+
+@pytest.fixture
+def service():
+    graph_query_cache.invalidate()
+    service = GraphService.__new__(GraphService)
+    service.spanner = FakeSpanner()
+    yield service
+    graph_query_cache.invalidate()
+
+
+def test_query_graph_runs_the_original_text(service):
+    query = "MATCH (s:Survivors) -- every survivor\nRETURN TO_JSON(s) AS s"
+
+    response = asyncio.run(service.query_graph(query))
+
+    assert service.spanner.executed == [query]
+    assert response.query_executed == query
+    assert response.cached is False
+
+
+def test_reformatted_query_is_served_from_the_cache(service):
+    asyncio.run(service.query_graph("MATCH (s)\nRETURN TO_JSON(s) AS s -- all"))
+
+    response = asyncio.run(service.query_graph("MATCH (s)   RETURN TO_JSON(s) AS s;"))
+
+    assert response.cached is True
+    assert len(service.spanner.executed) == 1
+
+
+def test_result_of_a_query_overlapping_a_write_is_not_cached(service):
+    class WriteDuringQuery(FakeSpanner):
+        def execute_gql(self, query):
+            notify_graph_changed({"survivor_ids": ["s1"]})
+            return super().execute_gql(query)
+
+    service.spanner = WriteDuringQuery()
+    asyncio.run(service.query_graph("MATCH (s) RETURN TO_JSON(s) AS s"))
+
+    response = asyncio.run(service.query_graph("MATCH (s) RETURN TO_JSON(s) AS s"))
+
+    assert response.cached is False
+    assert len(service.spanner.executed) == 2
@@ -0,0 +1,82 @@
+"""Behavior tests for hybrid_search's concurrent keyword and RAG legs."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.fusion import FusionStrategy
+from services.hybrid_search_service import HybridSearchService, SearchMethod
+from services.search_results import SearchResultsBuilder
+
+
+def one_result(survivor_id, method):
+    builder = SearchResultsBuilder()
+    builder.add(survivor_id, survivor_id.upper(), 1.0, method)
+    return builder.build()
+
+
+def leg(result=None, seconds=0.0, error=None):
+    def run(*args):
+        time.sleep(seconds)
+        if error:
+            raise error
+        return result
+    return run
+
+
+@pytest.fixture
+def service():
+    service = HybridSearchService.__new__(HybridSearchService)
+    service.fusion, service.fusion_weights, service.rrf_k = FusionStrategy.RRF, None, 60
+    service._executor = ThreadPoolExecutor(max_workers=4)
+    service.leg_timeout = 1.0
+    yield service
+    service._executor.shutdown(wait=False)
+
+
+def test_legs_run_concurrently(service):
+    service.keyword_search = leg(one_result("kw", SearchMethod.KEYWORD), seconds=0.2)
+    service.rag_search = leg(one_result("rag", SearchMethod.RAG), seconds=0.2)
+    timings = {}
+
+    start = time.monotonic()
+    results = service.hybrid_search("medics", analysis=None, timings=timings)
+
+    assert time.monotonic() - start < 0.35
+    assert set(results.ids) == {"kw", "rag"}
+    assert timings["keyword_ms"] >= 200 and timings["rag_ms"] >= 200
+    assert timings["dropped_legs"] == []
+
+
+def test_failed_leg_is_dropped(service):
+    service.keyword_search = leg(error=RuntimeError("index offline"))
+    service.rag_search = leg(one_result("rag", SearchMethod.RAG))
+    timings = {}
+
+    results = service.hybrid_search("medics", analysis=None, timings=timings)
+
+    assert results.ids == ["rag"]
+    assert timings["keyword_ms"] is None
+    assert timings["dropped_legs"] == ["keyword"]
+
+
+def test_late_leg_is_dropped_at_the_deadline(service):
+    service.keyword_search = leg(one_result("kw", SearchMethod.KEYWORD))
+    service.rag_search = leg(one_result("rag", SearchMethod.RAG), seconds=0.5)
+    timings = {}
+
+    start = time.monotonic()
+    results = service.hybrid_search("medics", analysis=None, leg_timeout=0.1, timings=timings)
+
+    assert time.monotonic() - start < 0.3
+    assert results.ids == ["kw"]
+    assert timings["dropped_legs"] == ["rag"]
+
+
+def test_every_leg_failing_raises(service):
+    service.keyword_search = leg(error=RuntimeError("index offline"))
+    service.rag_search = leg(error=ValueError("no embedding"))
+
+    with pytest.raises(RuntimeError, match="index offline"):
+        service.hybrid_search("medics", analysis=None)
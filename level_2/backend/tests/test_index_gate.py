@@ -0,0 +1,85 @@
+"""Behavior tests for services/index_gate.py and the full-text fallback."""
+
+import pytest
+from google.api_core.exceptions import DeadlineExceeded, InvalidArgument, NotFound
+
+from services import index_gate
+from services.hybrid_search_service import (
+    ANN_INDEX_OBJECTS,
+    FULLTEXT_INDEX_OBJECTS,
+    HybridSearchService,
+    KeywordEngine,
+    QueryAnalysis,
+)
+from services.index_gate import IndexGate
+from services.search_results import SearchResults
+
+
+@pytest.fixture
+def gate():
+    return IndexGate("Full-text keyword search", FULLTEXT_INDEX_OBJECTS, retry_seconds=30)
+
+
+def test_missing_token_column_latches(gate):
+    gate.failed(InvalidArgument("Unrecognized name: name_tokens [at 4:21]"))
+
+    assert gate.missing and not gate.available
+
+
+def test_missing_vector_index_latches():
+    gate = IndexGate("ANN vector search", ANN_INDEX_OBJECTS)
+
+    gate.failed(InvalidArgument("Table Skills does not have a secondary index called SkillsEmbeddingIndex"))
+
+    assert gate.missing
+
+
+def test_not_found_latches(gate):
+    gate.failed(NotFound("Search index not found"))
+
+    assert gate.missing
+
+
+@pytest.mark.parametrize("clock", [index_gate], indirect=True)
+@pytest.mark.parametrize("error", [
+    InvalidArgument("Invalid search query: unbalanced quotes"),
+    NotFound("Session not found: projects/p/instances/i/databases/d/sessions/s"),
+    DeadlineExceeded("Deadline exceeded"),
+])
+def test_other_errors_retry_after_a_while(gate, clock, error):
+    gate.failed(error)
+
+    assert not gate.missing and not gate.available
+    clock[0] += 30
+    assert gate.available
+
+
+@pytest.mark.parametrize("keywords, expected", [
+    (["first aid", "medical"], '"first aid" OR medical'),
+    (['"fire" OR', "AND"], '"fire or" OR and'),
+    (["First-aid!", "  "], '"first aid"'),
+    (["***", ""], ""),
+    ([], ""),
+])
+def test_search_terms_keep_only_words(keywords, expected):
+    assert HybridSearchService._search_terms(keywords) == expected
+
+
+def test_keywords_without_words_skip_full_text():
+    service = HybridSearchService.__new__(HybridSearchService)
+    service.keyword_engine = KeywordEngine.FULLTEXT
+    service._keyword_index = None
+    service._fulltext = IndexGate("Full-text keyword search", FULLTEXT_INDEX_OBJECTS)
+    calls = []
+    service._fulltext_keyword_search = lambda *args: calls.append("fulltext")
+    service._like_keyword_search = lambda analysis, limit: calls.append("like") or SearchResults.empty()
+
+    analysis = QueryAnalysis(
+        original_query="?!", recommended_method=None, keywords=["?!", "**"],
+        categories=[], biome_filter=None, needs_similarity_ranking=False,
+        has_specific_filters=False, confidence=1.0, reasoning=""
+    )
+    service.keyword_search(analysis)
+
+    assert calls == ["like"]
+    assert not service._fulltext.missing
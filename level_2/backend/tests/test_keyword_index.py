@@ -0,0 +1,163 @@
+"""Behavior tests for services/keyword_index.py (BM25 ranking and filters)."""
+
+import math
+
+import pytest
+
+from services.keyword_index import KeywordIndex, tokenize
+
+
+class FakeDatabase:
+    """Answers KeywordIndex's survivor query from a dict of rows."""
+
+    def __init__(self, rows):
+        self.rows = {row[0]: row for row in rows}
+
+    def snapshot(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_sql(self, sql, params=None, param_types=None):
+        ids = (params or {}).get("survivor_ids")
+        if ids is None:
+            return list(self.rows.values())
+        return [self.rows[i] for i in ids if i in self.rows]
+
+
+def survivor(survivor_id, name, biome, skills=(), needs=(), role="scout", description=""):
+    return (survivor_id, name, role, biome, description, list(skills), list(needs))
+
+
+MEDIC = ("k1", "First Aid", "Medical", "Treat wounds and burns")
+SURGEON = ("k2", "Field Surgery", "Medical", "Operate under pressure")
+ARCHER = ("k3", "Archery", "Combat", "Long range bow")
+FORAGER = ("k4", "Foraging", "Survival", "Find food plants")
+
+ROWS = [
+    survivor("s1", "Ada", "Frozen Tundra", [MEDIC, SURGEON]),
+    survivor("s2", "Bo", "Volcanic Wastes", [ARCHER]),
+    survivor("s3", "Cy", "Frozen Peaks", [FORAGER, ARCHER], needs=["burns on both hands"]),
+    survivor("s4", "Di", "Fossil Forest", [MEDIC]),
+]
+
+
+@pytest.fixture
+def index():
+    index = KeywordIndex(FakeDatabase(ROWS))
+    index.load()
+    return index
+
+
+def ids(hits):
+    return [hit.survivor_id for hit in hits]
+
+
+def test_tokenize_lowercases_alphanumerics():
+    assert tokenize("First-Aid, 2nd kit!") == ["first", "aid", "2nd", "kit"]
+    assert tokenize(None) == []
+
+
+def test_load_indexes_every_survivor(index):
+    assert index.ready
+    assert len(index) == 4
+
+
+def test_bm25_ranks_rare_terms_and_short_documents_first(index):
+    hits = index.search(["surgery"])
+    assert ids(hits) == ["s1"]
+
+    # "burns" is in Ada's and Di's skill description and Cy's need; Di's
+    # document is the shortest, so the same tf scores highest there
+    assert ids(index.search(["burns"])) == ["s4", "s1", "s3"]
+
+
+def test_bm25_score_matches_the_formula():
+    index = KeywordIndex(FakeDatabase([
+        survivor("a", "A", "x", role="", needs=["water water"]),
+        survivor("b", "B", "x", role="", needs=["fire"]),
+    ]))
+    index.load()
+
+    hit, = index.search(["water"])
+    # Both documents: name + biome + need tokens
+    tf, length, avgdl, n, df = 2, 4, 3.5, 2, 1
+    idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+    norm = 1 - index.b + index.b * length / avgdl
+    assert hit.score == pytest.approx(idf * tf * (index.k1 + 1) / (tf + index.k1 * norm))
+
+
+def test_terms_add_up_across_the_query(index):
+    hits = index.search(["archery", "foraging"])
+
+    assert ids(hits) == ["s3", "s2"]
+    assert hits[0].score > hits[1].score
+
+
+def test_ties_are_broken_by_name():
+    index = KeywordIndex(FakeDatabase([
+        survivor("z", "Zed", "Tundra", [ARCHER]),
+        survivor("a", "Amy", "Tundra", [ARCHER]),
+    ]))
+    index.load()
+
+    hits = index.search(["archery"])
+
+    assert hits[0].score == hits[1].score
+    assert [hit.name for hit in hits] == ["Amy", "Zed"]
+
+
+def test_limit_keeps_the_best_hits(index):
+    assert ids(index.search(["burns"], limit=1)) == ["s4"]
+    assert index.search(["burns"], limit=0) == []
+
+
+def test_category_filter_is_case_insensitive(index):
+    hits = index.search(["burns"], categories=["medical"])
+
+    assert ids(hits) == ["s4", "s1"]
+
+
+def test_biome_filter_matches_substrings(index):
+    assert ids(index.search(["burns"], biome_filter="frozen")) == ["s1", "s3"]
+    assert index.search(["burns"], biome_filter="desert") == []
+
+
+def test_filters_combine(index):
+    hits = index.search(["archery"], categories=["Combat"], biome_filter="Frozen")
+
+    assert ids(hits) == ["s3"]
+
+
+def test_no_keywords_lists_filtered_survivors_by_name(index):
+    hits = index.search([], categories=["Combat"])
+
+    assert ids(hits) == ["s2", "s3"]
+    assert all(hit.score == 0 for hit in hits)
+
+
+def test_matching_skills_are_the_skills_that_matched(index):
+    hit, = index.search(["surgery"])
+    assert [s["id"] for s in hit.matching_skills] == ["k2"]
+
+    hit = index.search([], categories=["medical"], limit=1)[0]
+    assert [s["id"] for s in hit.matching_skills] == ["k1", "k2"]
+
+
+def test_refresh_updates_and_removes_survivors(index):
+    db = index.database
+    db.rows["s2"] = survivor("s2", "Bo", "Volcanic Wastes", [SURGEON])
+    del db.rows["s4"]
+
+    index.refresh(["s2", "s4"])
+
+    assert len(index) == 3
+    assert ids(index.search(["archery"])) == ["s3"]
+    # Bo's document is now shorter than Ada's
+    assert ids(index.search(["surgery"])) == ["s2", "s1"]
+    assert "s4" not in ids(index.search(["burns"]))
+    assert ids(index.search([], biome_filter="fossil")) == []
@@ -0,0 +1,114 @@
+"""Behavior tests for services/query_cache.py."""
+
+from dataclasses import dataclass
+
+import pytest
+
+from services import query_cache
+from services.query_cache import QueryAnalysisCache, normalize_query
+
+
+@dataclass
+class Analysis:
+    original_query: str
+    method: str = "keyword"
+
+
+def test_normalize_query_ignores_case_punctuation_and_spacing():
+    assert normalize_query("  Medical   skills, in FOREST? ") == "medical skills in forest"
+    assert normalize_query(None) == ""
+
+
+def test_hit_returns_the_analysis_for_the_callers_query():
+    cache = QueryAnalysisCache()
+    cache.put("Medical skills", Analysis("Medical skills", "rag"))
+
+    hit = cache.get("medical   SKILLS!")
+
+    assert hit.method == "rag"
+    assert hit.original_query == "medical   SKILLS!"
+    assert cache.stats()["hits"] == 1
+
+
+def test_miss_is_counted():
+    cache = QueryAnalysisCache()
+
+    assert cache.get("unknown") is None
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.parametrize("clock", [query_cache], indirect=True)
+def test_entries_expire_after_the_ttl(clock):
+    cache = QueryAnalysisCache(ttl_seconds=10)
+    cache.put("q", Analysis("q"))
+
+    clock[0] += 9.9
+    assert cache.get("q") is not None
+
+    clock[0] += 0.2
+    assert cache.get("q") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryAnalysisCache(max_entries=2)
+    cache.put("a", Analysis("a"))
+    cache.put("b", Analysis("b"))
+    cache.get("a")
+
+    cache.put("c", Analysis("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_blank_queries_are_not_stored():
+    cache = QueryAnalysisCache()
+    cache.put("?!", Analysis("?!"))
+
+    assert cache.stats()["size"] == 0
+
+
+def test_semantic_lookup_returns_a_near_duplicate():
+    cache = QueryAnalysisCache(similarity_threshold=0.95)
+    cache.put("who can heal wounds", Analysis("who can heal wounds", "rag"), embedding=[1.0, 0.0])
+
+    near = cache.get("who can treat injuries", embedding=[0.99, 0.05])
+    far = cache.get("who can build shelters", embedding=[0.0, 1.0])
+
+    assert near.method == "rag"
+    assert near.original_query == "who can treat injuries"
+    assert far is None
+    assert cache.stats()["semantic_hits"] == 1
+
+
+@pytest.mark.parametrize("clock", [query_cache], indirect=True)
+def test_semantic_lookup_skips_expired_entries(clock):
+    cache = QueryAnalysisCache(ttl_seconds=5)
+    cache.put("heal wounds", Analysis("heal wounds"), embedding=[1.0, 0.0])
+
+    clock[0] += 6
+    assert cache.get("treat injuries", embedding=[1.0, 0.0]) is None
+
+
+def test_invalidate_drops_everything():
+    cache = QueryAnalysisCache()
+    cache.put("a", Analysis("a"))
+
+    cache.invalidate()
+
+    assert cache.get("a") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_catalog_change_invalidates_only_when_the_fingerprint_changes():
+    cache = QueryAnalysisCache()
+    assert cache.check_fingerprint("v1") is False
+    cache.put("a", Analysis("a"))
+
+    assert cache.check_fingerprint("v1") is False
+    assert cache.get("a") is not None
+
+    assert cache.check_fingerprint("v2") is True
+    assert cache.get("a") is None
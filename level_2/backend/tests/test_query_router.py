@@ -0,0 +1,83 @@
+"""Behavior tests for services/query_router.py."""
+
+import pytest
+
+from services.query_router import QueryRouter
+
+
+@pytest.fixture
+def router():
+    router = QueryRouter()
+    router.update(
+        skills=["First Aid", "Sword Fighting", "Water Purification"],
+        categories=["Medical", "Combat"],
+        biomes=["CRYO", "Fossil Forest"]
+    )
+    return router
+
+
+def test_catalog_only_query_routes_to_keyword(router):
+    analysis = router.route("medical skills in the cryo zone")
+
+    assert analysis["recommended_method"] == "keyword"
+    assert analysis["categories"] == ["Medical"]
+    assert analysis["biome_filter"] == "CRYO"
+    assert analysis["has_specific_filters"]
+
+
+def test_multi_word_values_and_plurals_match(router):
+    analysis = router.route("find survivors with water purification in fossil forests")
+
+    assert analysis["recommended_method"] == "keyword"
+    assert analysis["keywords"] == ["water purification"]
+    assert analysis["biome_filter"] == "Fossil Forest"
+
+
+def test_similarity_phrase_routes_to_rag(router):
+    analysis = router.route("skills similar to first aid")
+
+    assert analysis["recommended_method"] == "rag"
+    assert analysis["needs_similarity_ranking"]
+
+
+def test_similarity_with_filters_routes_to_hybrid(router):
+    analysis = router.route("combat skills similar to archery in cryo")
+
+    assert analysis["recommended_method"] == "hybrid"
+    assert analysis["categories"] == ["Combat"]
+    assert analysis["biome_filter"] == "CRYO"
+    assert "archery" in analysis["keywords"]
+
+
+def test_unknown_words_fall_through(router):
+    assert router.route("someone good with people near the old dam") is None
+    assert router.route("skills similar to") is None
+
+
+@pytest.mark.parametrize("query", [
+    "medical skills without combat",
+    "survivors not in cryo",
+    "no combat skills",
+    "non-combat skills",
+    "medical except first aid",
+    "survivors lacking medical skills",
+    "medics who can't do sword fighting",
+    "combat skills other than sword fighting",
+    "skills similar to first aid but not medical",
+])
+def test_negation_falls_through_to_the_llm(router, query):
+    assert router.route(query) is None
+
+
+def test_stats_count_resolved_and_fallthrough(router):
+    router.route("medical skills")
+    router.route("medical skills without combat")
+
+    stats = router.stats()
+    assert stats["resolved"] == 1
+    assert stats["fallthrough"] == 1
+    assert stats["llm_free_fraction"] == 0.5
+
+
+def test_empty_catalog_routes_nothing():
+    assert QueryRouter().route("medical skills in cryo") is None
@@ -0,0 +1,66 @@
+"""Behavior tests for HybridSearchService's read-only snapshot reads."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pytest
+
+from services.hybrid_search_service import HybridSearchService
+
+
+class FakeDatabase:
+    """Records the options every snapshot is opened with."""
+
+    def __init__(self):
+        self.snapshots = []
+
+    @contextmanager
+    def snapshot(self, **kwargs):
+        self.snapshots.append(kwargs)
+        yield object()
+
+
+@pytest.fixture
+def service():
+    service = HybridSearchService.__new__(HybridSearchService)
+    service.database = FakeDatabase()
+    service.max_staleness = timedelta(seconds=10)
+    service._batch_read_timestamp = ContextVar("batch_read_timestamp", default=None)
+    return service
+
+
+def test_single_reads_use_bounded_staleness(service):
+    service._run_read(lambda snapshot: None)
+
+    assert service.database.snapshots == [{"max_staleness": timedelta(seconds=10)}]
+
+
+def test_zero_staleness_reads_strongly(service):
+    service.max_staleness = timedelta(0)
+
+    service._run_read(lambda snapshot: None)
+
+    assert service.database.snapshots == [{}]
+
+
+def test_batch_reads_share_one_timestamp_across_threads(service):
+    with ThreadPoolExecutor(max_workers=2) as pool, service.read_only_batch() as read_timestamp:
+        futures = [
+            pool.submit(copy_context().run, service._run_read, lambda snapshot: None)
+            for _ in range(3)
+        ]
+        for future in futures:
+            future.result()
+
+    assert service.database.snapshots == [{"read_timestamp": read_timestamp}] * 3
+
+
+def test_batch_timestamp_is_dropped_after_the_block(service):
+    with service.read_only_batch():
+        pass
+
+    service._run_read(lambda snapshot: None)
+
+    assert service.database.snapshots == [{"max_staleness": timedelta(seconds=10)}]
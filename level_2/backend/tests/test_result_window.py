@@ -0,0 +1,182 @@
+"""Behavior tests for services/result_window.py and search_page paging."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from services import result_window
+from services.hybrid_search_service import HybridSearchService, SearchMethod
+from services.result_window import (
+    CursorExpiredError,
+    ResultWindowCache,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def results(*ids):
+    return [SimpleNamespace(id=i) for i in ids]
+
+
+def page_ids(page):
+    return [r.id for r in page]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("w-1.x", 20)
+
+    assert decode_cursor(cursor) == ("w-1.x", 20)
+
+
+@pytest.mark.parametrize("cursor", ["", "abc", ".10", "w.", "w.-1", "w.ten"])
+def test_malformed_cursor_raises(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_pages_walk_the_window():
+    cache = ResultWindowCache()
+    window_id = cache.put("q", {}, results("a", "b", "c", "d", "e"))
+    window = cache.get(window_id)
+
+    first, cursor = cache.page(window_id, window, 0, 2)
+    second, cursor = cache.page(window_id, window, decode_cursor(cursor)[1], 2)
+    last, cursor = cache.page(window_id, window, decode_cursor(cursor)[1], 2)
+
+    assert [page_ids(first), page_ids(second), page_ids(last)] == [["a", "b"], ["c", "d"], ["e"]]
+    assert cursor is None
+
+
+def test_incomplete_window_offers_a_cursor_at_its_end():
+    cache = ResultWindowCache()
+    window_id = cache.put("q", {}, results("a", "b"), limit=2)
+    window = cache.get(window_id)
+
+    _, cursor = cache.page(window_id, window, 0, 2)
+
+    assert not window.complete
+    assert cursor == encode_cursor(window_id, 2)
+
+
+def test_extend_keeps_served_results_in_place():
+    cache = ResultWindowCache()
+    window_id = cache.put("q", {}, results("a", "b"), limit=2)
+    window = cache.get(window_id)
+
+    # The re-run ranks differently; "a" and "b" must not move or repeat
+    cache.extend(window, results("b", "c", "a", "d"), limit=4)
+
+    assert page_ids(window.results) == ["a", "b", "c", "d"]
+    assert window.complete is False
+
+    cache.extend(window, results("a", "b", "c", "d", "e"), limit=8)
+    assert page_ids(window.results) == ["a", "b", "c", "d", "e"]
+    assert window.complete is True
+
+
+def test_extend_ignores_a_smaller_limit():
+    cache = ResultWindowCache()
+    window = cache.get(cache.put("q", {}, results("a", "b"), limit=2))
+    cache.extend(window, results("a", "b", "c", "d"), limit=4)
+
+    cache.extend(window, results("x", "y", "z"), limit=3)
+
+    assert page_ids(window.results) == ["a", "b", "c", "d"]
+
+
+@pytest.mark.parametrize("clock", [result_window], indirect=True)
+def test_windows_expire_after_the_ttl(clock):
+    cache = ResultWindowCache(ttl_seconds=60)
+    window_id = cache.put("q", {}, results("a"))
+
+    clock[0] += 59
+    cache.get(window_id)
+
+    clock[0] += 2
+    with pytest.raises(CursorExpiredError):
+        cache.get(window_id)
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_window_is_evicted():
+    cache = ResultWindowCache(max_entries=2)
+    first = cache.put("a", {}, results("a"))
+    second = cache.put("b", {}, results("b"))
+    cache.get(first)
+
+    cache.put("c", {}, results("c"))
+
+    cache.get(first)
+    with pytest.raises(CursorExpiredError):
+        cache.get(second)
+    assert cache.stats()["evictions"] == 1
+
+
+# =============================================================================
+# search_page: window sizing and lazy growth
+# =============================================================================
+
+RANKING = [f"s{i:02}" for i in range(25)]
+
+
+@pytest.fixture
+def service():
+    """HybridSearchService with smart_search replaced by a fixed ranking."""
+    service = HybridSearchService.__new__(HybridSearchService)
+    service.page_window_factor = 3
+    service._result_windows = ResultWindowCache()
+    service.calls = []
+
+    def smart_search(query, force_method=None, limit=10):
+        service.calls.append((force_method, limit))
+        return {
+            "analysis": {"actual_method": "keyword"},
+            "results": results(*RANKING[:limit]),
+            "timings": {}
+        }
+
+    service.smart_search = smart_search
+    return service
+
+
+def test_first_page_fetches_one_page_only(service):
+    page = service.search_page("medics", page_size=4)
+
+    assert service.calls == [(None, 4)]
+    assert page_ids(page["results"]) == RANKING[:4]
+    assert page["total_results"] == 4
+    assert page["total_complete"] is False
+    assert page["next_cursor"] is not None
+
+
+def test_cursor_past_the_window_grows_it(service):
+    page = service.search_page("medics", page_size=4)
+    seen = page_ids(page["results"])
+    while page["next_cursor"]:
+        page = service.search_page(page_size=4, cursor=page["next_cursor"])
+        seen += page_ids(page["results"])
+
+    assert seen == RANKING
+    assert page["total_complete"] is True
+    # Growth re-runs with the window's method, page_window_factor pages
+    # ahead and at least double the limit
+    assert service.calls == [(None, 4), (SearchMethod.KEYWORD, 20), (SearchMethod.KEYWORD, 40)]
+
+
+def test_pages_inside_the_window_do_not_search_again(service):
+    page = service.search_page("medics", page_size=4)
+    page = service.search_page(page_size=4, cursor=page["next_cursor"])
+    assert page["timings"]["window_cache"] == "grown"
+
+    page = service.search_page(page_size=4, cursor=page["next_cursor"])
+
+    assert page_ids(page["results"]) == RANKING[8:12]
+    assert page["timings"] == {"window_cache": "hit"}
+    assert len(service.calls) == 2
+
+
+def test_single_page_reads_never_grow_the_window(service):
+    service.search_page("medics", page_size=4)
+    service.search_page("medics", page_size=4)
+
+    assert service.calls == [(None, 4), (None, 4)]
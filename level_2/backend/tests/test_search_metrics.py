@@ -0,0 +1,46 @@
+"""Behavior tests for services/search_metrics.py."""
+
+import pytest
+
+from services import search_metrics
+from services.search_metrics import render_prometheus, snapshot, stage_timer, traced_stage
+
+
+@pytest.fixture(autouse=True)
+def fresh_histograms(monkeypatch):
+    monkeypatch.setattr(search_metrics, "_histograms", {})
+
+
+def test_stage_timer_fills_the_histogram_and_timings():
+    timings = {}
+
+    with stage_timer("fusion", timings):
+        pass
+
+    assert timings["fusion_ms"] >= 0
+    assert snapshot()["fusion"]["count"] == 1
+
+
+def test_failed_stage_counts_as_an_error():
+    @traced_stage("keyword")
+    def keyword_search():
+        raise RuntimeError("index offline")
+
+    with pytest.raises(RuntimeError):
+        keyword_search()
+
+    assert snapshot()["keyword"]["errors"] == 1
+
+
+def test_prometheus_buckets_are_cumulative_and_in_stage_order():
+    search_metrics.observe("format", 3.0)
+    search_metrics.observe("analyze", 0.2)
+    search_metrics.observe("analyze", 700.0)
+
+    text = render_prometheus()
+
+    assert text.index('stage="analyze"') < text.index('stage="format"')
+    assert 'hybrid_search_stage_duration_ms_bucket{stage="analyze",le="0.5"} 1' in text
+    assert 'hybrid_search_stage_duration_ms_bucket{stage="analyze",le="1000"} 2' in text
+    assert 'hybrid_search_stage_duration_ms_bucket{stage="format",le="2.5"} 0' in text
+    assert 'hybrid_search_stage_duration_ms_count{stage="format"} 1' in text
@@ -0,0 +1,142 @@
+"""Behavior tests for services/search_results.py and the fused result path."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from agent.tools import hybrid_search_tools
+from agent.tools.hybrid_search_tools import _format_results
+from services.fusion import FusionStrategy
+from services.hybrid_search_service import HybridSearchService, SearchMethod
+from services.search_results import SearchResults, SearchResultsBuilder
+
+
+def keyword_leg():
+    builder = SearchResultsBuilder()
+    builder.add(
+        "s1", "Mira", 0.5, SearchMethod.KEYWORD, biome="CRYO",
+        skills=[("k1", "First Aid", "Medical", 2.0, None), ("k2", "Archery", "Combat", 1.0, None)],
+        match_count=2, relevance=3.0
+    )
+    builder.add(
+        "s2", "Ada", 1.0, SearchMethod.KEYWORD,
+        skills=[("k1", "First Aid", "Medical", 4.0, None)], match_count=1, relevance=4.0
+    )
+    return builder.build().sorted_by_score()
+
+
+def rag_leg():
+    builder = SearchResultsBuilder()
+    builder.add(
+        "s1", "Mira", 0.9, SearchMethod.RAG, biome="CRYO",
+        skills=[("k3", "Triage", "Medical", None, 0.9), ("k1", "First Aid", "Medical", None, 0.8)],
+        best_similarity=0.9
+    )
+    builder.add("s3", "Cy", 0.7, SearchMethod.RAG, skills=[("k3", "Triage", "Medical", None, 0.7)],
+                best_similarity=0.7)
+    return builder.build()
+
+
+def test_details_report_only_what_the_method_sets():
+    kw, rag = keyword_leg(), rag_leg()
+
+    assert kw[1].details == {
+        "biome": "CRYO",
+        "matching_skills": [
+            {"id": "k1", "name": "First Aid", "category": "Medical", "relevance": 2.0},
+            {"id": "k2", "name": "Archery", "category": "Combat", "relevance": 1.0},
+        ],
+        "match_count": 2,
+        "relevance": 3.0,
+    }
+    assert rag[1].details == {
+        "biome": None,
+        "matching_skills": [{"id": "k3", "name": "Triage", "category": "Medical", "similarity": 0.7}],
+        "best_similarity": 0.7,
+    }
+
+
+def test_sorting_slicing_and_views():
+    kw = keyword_leg()
+
+    assert kw.ids == ["s2", "s1"]
+    assert kw[-1].name == "Mira" and kw[-1].score == 0.5
+    assert kw[1].skill_names(1) == ["First Aid"]
+    assert [r.id for r in kw[1:]] == ["s1"]
+    assert kw[1:][0].details == kw[1].details
+    assert kw[0] == keyword_leg()[0]
+    with pytest.raises(IndexError):
+        kw[2]
+
+
+def test_skill_table_is_shared_not_copied():
+    kw = keyword_leg()
+
+    # k1 appears in two rows but once in the table
+    assert kw._skills.ids == ["k1", "k2"]
+    assert kw[:1]._skills is kw._skills
+
+
+def test_concatenation_with_views():
+    kw, rag = keyword_leg(), rag_leg()
+
+    combined = kw + [rag[1]]
+
+    assert combined.ids == ["s2", "s1", "s3"]
+    assert combined[2].details == rag[1].details
+    assert len(SearchResults.empty() + kw) == 2
+
+
+@pytest.fixture
+def service():
+    service = HybridSearchService.__new__(HybridSearchService)
+    service.fusion, service.fusion_weights, service.rrf_k = FusionStrategy.RRF, None, 60
+    return service
+
+
+def test_fusion_unions_skills_with_later_legs_winning(service):
+    merged = service._merge_results(keyword_leg(), rag_leg(), limit=10)
+
+    assert merged.ids == ["s1", "s2", "s3"]
+    mira = merged[0]
+    assert (mira.method, mira.found_by) == (SearchMethod.HYBRID, "both")
+    # Keyword order first, then new RAG skills; RAG values replace keyword ones
+    assert mira.details["matching_skills"] == [
+        {"id": "k1", "name": "First Aid", "category": "Medical", "similarity": 0.8},
+        {"id": "k2", "name": "Archery", "category": "Combat", "relevance": 1.0},
+        {"id": "k3", "name": "Triage", "category": "Medical", "similarity": 0.9},
+    ]
+    assert mira.details["best_similarity"] == 0.9
+    assert (merged[1].method, merged[1].found_by) == (SearchMethod.KEYWORD, "keyword")
+    assert merged[1].details == keyword_leg()[0].details
+    assert (merged[2].method, merged[2].found_by) == (SearchMethod.RAG, "rag")
+
+
+def test_fusion_of_empty_legs(service):
+    assert len(service._merge_results(SearchResults.empty(), SearchResults.empty(), 10)) == 0
+    assert service._merge_results(keyword_leg(), SearchResults.empty(), 1).ids == ["s2"]
+
+
+def test_formatting_reads_the_columns(service):
+    merged = service._merge_results(keyword_leg(), rag_leg(), limit=10)
+
+    lines = _format_results(merged[:1], {}, show_analysis=False).splitlines()
+
+    assert "   📍 Location: CRYO" in lines
+    assert "   🛠️ Skills: First Aid, Archery, Triage" in lines
+    assert "   _Found by: both_" in lines
+
+
+def test_page_formatting_time_lands_in_the_search_timings(monkeypatch):
+    timings = {"window_cache": "hit"}
+    page = {
+        "results": keyword_leg(), "analysis": {}, "offset": 0, "total_results": 2,
+        "next_cursor": None, "total_complete": True, "timings": timings
+    }
+    monkeypatch.setattr(hybrid_search_tools, "_service", SimpleNamespace(
+        search_page=lambda *args, **kwargs: page
+    ))
+
+    hybrid_search_tools._search_page("medics", None, 10, cursor="c")
+
+    assert timings["format_ms"] >= 0
@@ -0,0 +1,97 @@
+"""Behavior tests for smart_search_stream's stage order and speculative RAG."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.fusion import FusionStrategy
+from services.hybrid_search_service import HybridSearchService, QueryAnalysis, SearchMethod
+from services.search_results import SearchResultsBuilder
+
+
+def one_result(survivor_id, method):
+    builder = SearchResultsBuilder()
+    builder.add(survivor_id, survivor_id.upper(), 1.0, method)
+    return builder.build()
+
+
+def slow(seconds, result):
+    def run(*args):
+        time.sleep(seconds)
+        return result
+    return run
+
+
+@pytest.fixture
+def service():
+    service = HybridSearchService.__new__(HybridSearchService)
+    service.fusion, service.fusion_weights, service.rrf_k = FusionStrategy.RRF, None, 60
+    service._executor = ThreadPoolExecutor(max_workers=4)
+    service.leg_timeout = 1.0
+    service.speculative_rag = True
+    service.rag_search = slow(0.0, one_result("rag", SearchMethod.RAG))
+    service.keyword_search = slow(0.0, one_result("kw", SearchMethod.KEYWORD))
+    yield service
+    service._executor.shutdown(wait=False)
+
+
+def analyzed_as(method, seconds=0.1):
+    analysis = QueryAnalysis(
+        original_query="q", recommended_method=method, keywords=["medic"],
+        categories=[], biome_filter=None, needs_similarity_ranking=False,
+        has_specific_filters=False, confidence=1.0, reasoning=""
+    )
+    return slow(seconds, analysis)
+
+
+def stages(service, **kwargs):
+    async def collect():
+        return [stage async for stage in service.smart_search_stream("medics", **kwargs)]
+    return asyncio.run(collect())
+
+
+def test_rag_finishing_first_is_held_until_the_analysis(service):
+    service.analyze_query = analyzed_as(SearchMethod.HYBRID)
+
+    result = stages(service)
+
+    assert [s["stage"] for s in result] == ["analysis", "rag", "keyword", "fused", "done"]
+    assert {r.id for r in result[3]["results"]} == {"kw", "rag"}
+    assert result[-1]["timings"]["speculative_rag"] == "reused"
+
+
+def test_unwanted_speculative_rag_is_never_streamed(service):
+    service.analyze_query = analyzed_as(SearchMethod.KEYWORD)
+
+    result = stages(service)
+
+    assert [s["stage"] for s in result] == ["analysis", "keyword", "done"]
+    assert result[-1]["timings"]["speculative_rag"] == "discarded"
+    assert "rag_ms" not in result[-1]["timings"]
+
+
+def test_forced_keyword_skips_the_rag_leg(service):
+    service.analyze_query = analyzed_as(SearchMethod.HYBRID, seconds=0.0)
+    service.rag_search = None
+
+    result = stages(service, force_method=SearchMethod.KEYWORD)
+
+    assert [s["stage"] for s in result] == ["analysis", "keyword", "done"]
+    assert result[0]["analysis"]["actual_method"] == "keyword"
+
+
+def test_late_leg_is_dropped_at_its_deadline(service):
+    service.leg_timeout = 0.2
+    service.analyze_query = analyzed_as(SearchMethod.HYBRID, seconds=0.0)
+    service.keyword_search = slow(1.0, one_result("kw", SearchMethod.KEYWORD))
+
+    start = time.monotonic()
+    result = stages(service)
+
+    assert time.monotonic() - start < 0.6
+    assert [s["stage"] for s in result] == ["analysis", "rag", "fused", "done"]
+    timings = result[-1]["timings"]
+    assert timings["dropped_legs"] == ["keyword"]
+    assert timings["keyword_leg"] == "abandoned"
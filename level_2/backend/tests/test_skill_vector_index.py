@@ -0,0 +1,79 @@
+"""Behavior tests for services/skill_vector_index.py refreshes."""
+
+from contextlib import contextmanager
+
+from services.skill_vector_index import SkillVectorIndex
+
+
+class FakeDatabase:
+    """Skills table keyed by skill_id: (name, category, embedding)."""
+
+    def __init__(self, skills):
+        self.skills = skills
+        self.fetched = []
+
+    def checksum(self, skill_id):
+        return hash(repr(self.skills[skill_id]))
+
+    @contextmanager
+    def snapshot(self):
+        yield self
+
+    def execute_sql(self, sql, params=None, param_types=None):
+        if "SELECT skill_id, name" not in sql:
+            return [(skill_id, self.checksum(skill_id)) for skill_id in self.skills]
+        skill_ids = params["skill_ids"] if params else list(self.skills)
+        self.fetched.append(sorted(skill_ids))
+        return [
+            (skill_id, name, category, self.checksum(skill_id), embedding)
+            for skill_id, (name, category, embedding) in self.skills.items()
+            if skill_id in skill_ids
+        ]
+
+
+def nearest(index, vector):
+    [hits] = index.search([vector], k=1)
+    return hits[0].name
+
+
+def test_refresh_reloads_only_new_and_changed_rows():
+    database = FakeDatabase({
+        "k1": ("First Aid", "Medical", [1.0, 0.0]),
+        "k2": ("Archery", "Combat", [0.0, 1.0]),
+        "k3": ("Cooking", "Survival", [1.0, 1.0]),
+    })
+    index = SkillVectorIndex(database)
+    index.load()
+
+    database.skills["k2"] = ("Archery", "Combat", [-1.0, 0.0])   # re-embedded
+    database.skills["k4"] = ("Triage", "Medical", [0.0, -1.0])
+    del database.skills["k3"]
+    index.refresh()
+
+    assert database.fetched[-1] == ["k2", "k4"]
+    assert len(index) == 3
+    assert nearest(index, [-1.0, 0.1]) == "Archery"
+    assert nearest(index, [0.1, -1.0]) == "Triage"
+    assert nearest(index, [1.0, 0.1]) == "First Aid"
+
+
+def test_rename_is_picked_up():
+    database = FakeDatabase({"k1": ("First Aid", "Medical", [1.0, 0.0])})
+    index = SkillVectorIndex(database)
+    index.load()
+
+    database.skills["k1"] = ("Field Medicine", "Medical", [1.0, 0.0])
+    index.refresh()
+
+    assert nearest(index, [1.0, 0.0]) == "Field Medicine"
+
+
+def test_unchanged_rows_are_not_fetched():
+    database = FakeDatabase({"k1": ("First Aid", "Medical", [1.0, 0.0])})
+    index = SkillVectorIndex(database)
+    index.load()
+
+    index.refresh()
+
+    assert database.fetched == [["k1"]]
+    assert index.loaded_at is not None
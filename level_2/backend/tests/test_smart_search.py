@@ -0,0 +1,68 @@
+"""Behavior tests for smart_search's leg deadlines."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.hybrid_search_service import HybridSearchService, QueryAnalysis, SearchMethod
+from services.search_results import SearchResultsBuilder
+
+
+def one_result(survivor_id, method):
+    builder = SearchResultsBuilder()
+    builder.add(survivor_id, survivor_id.upper(), 1.0, method)
+    return builder.build()
+
+
+@pytest.fixture
+def service():
+    service = HybridSearchService.__new__(HybridSearchService)
+    service._executor = ThreadPoolExecutor(max_workers=4)
+    service.leg_timeout = 0.1
+    service.speculative_rag = False
+    service.keywords_seen = []
+    service.analyze_query = lambda query: QueryAnalysis(
+        original_query=query, recommended_method=SearchMethod.RAG, keywords=[],
+        categories=[], biome_filter=None, needs_similarity_ranking=True,
+        has_specific_filters=False, confidence=1.0, reasoning=""
+    )
+
+    def keyword_search(analysis, limit):
+        service.keywords_seen.append(analysis.keywords)
+        return one_result("kw", SearchMethod.KEYWORD)
+
+    service.keyword_search = keyword_search
+    yield service
+    service._executor.shutdown(wait=False)
+
+
+def slow_rag(query, limit):
+    time.sleep(0.5)
+    return one_result("rag", SearchMethod.RAG)
+
+
+@pytest.mark.parametrize("speculative", [True, False])
+def test_slow_rag_leg_falls_back_to_keyword(service, speculative):
+    service.rag_search = slow_rag
+
+    start = time.monotonic()
+    response = service.smart_search("burn medics", speculative=speculative)
+
+    assert time.monotonic() - start < 0.4
+    assert [r.id for r in response["results"]] == ["kw"]
+    assert response["timings"]["fallback"] == "keyword"
+    assert response["timings"]["dropped_legs"] == ["rag"]
+    # The RAG analysis has no keywords; the query's words stand in
+    assert service.keywords_seen == [["burn", "medics"]]
+
+
+@pytest.mark.parametrize("speculative", [True, False])
+def test_rag_leg_within_the_deadline_is_used(service, speculative):
+    service.rag_search = lambda query, limit: one_result("rag", SearchMethod.RAG)
+
+    response = service.smart_search("burn medics", speculative=speculative)
+
+    assert [r.id for r in response["results"]] == ["rag"]
+    assert "fallback" not in response["timings"]
+    assert service.keywords_seen == []
@@ -0,0 +1,102 @@
+"""Behavior tests for the process-wide Spanner handles in services/spanner_client.py."""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from models.graph import NodeType
+from services import spanner_client
+from services.graph_service import GraphService
+
+
+class FixedSizePool:
+    def __init__(self, size, default_timeout):
+        self.size, self.default_timeout = size, default_timeout
+
+
+class PingingPool(FixedSizePool):
+    def __init__(self, size, default_timeout, ping_interval):
+        super().__init__(size, default_timeout)
+        self.ping_interval = ping_interval
+
+
+class Client:
+    created = 0
+
+    def __init__(self, project):
+        Client.created += 1
+        self.project = project
+
+    def instance(self, instance_id):
+        return SimpleNamespace(database=lambda database_id, pool: SimpleNamespace(
+            name=f"{self.project}/{instance_id}/{database_id}", pool=pool
+        ))
+
+
+@pytest.fixture
+def fake_spanner(monkeypatch):
+    Client.created = 0
+    monkeypatch.setattr(spanner_client, "spanner", SimpleNamespace(
+        Client=Client, FixedSizePool=FixedSizePool, PingingPool=PingingPool
+    ))
+    monkeypatch.setattr(spanner_client, "_clients", {})
+    monkeypatch.setattr(spanner_client, "_databases", {})
+    monkeypatch.setattr(spanner_client, "_start_pinger", lambda pool: None)
+    monkeypatch.setattr(spanner_client, "settings", SimpleNamespace(
+        SPANNER_POOL_TYPE="fixed", SPANNER_POOL_SIZE=40,
+        SPANNER_POOL_TIMEOUT=10, SPANNER_POOL_PING_INTERVAL=300
+    ))
+    return spanner_client.settings
+
+
+def test_one_handle_and_pool_per_database(fake_spanner):
+    first = spanner_client.get_database("p", "i", "d")
+
+    assert spanner_client.get_database("p", "i", "d", pool_size=5) is first
+    assert spanner_client.get_database("p", "i", "other") is not first
+    assert Client.created == 1
+    # pool_size only applies when the handle is created
+    assert first.pool.size == 40 and first.pool.default_timeout == 10
+
+
+def test_pool_type_comes_from_settings(fake_spanner):
+    fake_spanner.SPANNER_POOL_TYPE = "pinging"
+
+    pool = spanner_client.get_database("p", "i", "d", pool_size=8).pool
+
+    assert isinstance(pool, PingingPool)
+    assert (pool.size, pool.ping_interval) == (8, 300)
+
+
+def test_unknown_pool_type_falls_back_to_fixed(fake_spanner):
+    fake_spanner.SPANNER_POOL_TYPE = "bursty"
+
+    assert type(spanner_client.get_database("p", "i", "d").pool) is FixedSizePool
+
+
+def test_graph_stream_reads_each_page_in_its_own_snapshot():
+    survivors = [("s1", "Mira", "medic", "CRYO"), ("s2", "Ada", "scout", "CRYO")]
+    snapshots = []
+
+    def execute_sql(sql, params, param_types):
+        return [row for row in survivors if row[0] > params["after"]][:params["limit"]]
+
+    @contextmanager
+    def snapshot(**kwargs):
+        snapshots.append(kwargs)
+        yield SimpleNamespace(execute_sql=execute_sql)
+
+    service = GraphService.__new__(GraphService)
+    service.spanner = SimpleNamespace(database=SimpleNamespace(snapshot=snapshot))
+
+    stream = service.stream_graph(node_types=[NodeType.SURVIVOR], page_size=1)
+    next(stream)
+    # The first page is sent before the next snapshot is opened
+    assert len(snapshots) == 1
+    lines = list(stream)
+
+    assert lines[-1] == b'{"done": true, "nodes": 2, "edges": 0}\n'
+    # Two node pages, then the (empty) edge walk, all at one timestamp
+    assert len(snapshots) == 3
+    assert len({kwargs["read_timestamp"] for kwargs in snapshots}) == 1
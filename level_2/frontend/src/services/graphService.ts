@@ -14,16 +14,16 @@ export const graphService = {
         return response.data;
     },
 
-    // Fetch nodes by type
+    // Fetch nodes by type (first page; pass next_cursor back as `cursor` for more)
     async getNodesByType(type: string): Promise<GraphNode[]> {
-        const response = await api.get(`/api/graph/nodes?type=${type}`);
-        return response.data;
+        const response = await api.get('/api/graph/nodes', { params: { type } });
+        return response.data.nodes;
     },
 
     // Execute custom GQL query
     async executeQuery(query: string): Promise<GraphData> {
         const response = await api.post('/api/graph/query', { query });
-        return response.data;
+        return response.data.data;
     },
 
     // Find path between nodes